@@ -4,7 +4,7 @@ import os
 import sys
 import time
 from argparse import ArgumentParser, ArgumentTypeError, Namespace, BooleanOptionalAction
-from typing import Any, Union, Dict
+from typing import Any, Union, Dict, Tuple
 
 from credsweeper import __version__
 from credsweeper.app import APP_PATH, CredSweeper
@@ -30,6 +30,25 @@ def positive_int(value: Any) -> int:
     return int_value
 
 
+def shard_index_count(arg: str) -> Tuple[int, int]:
+    """Return index and count of shards from the input string
+
+    Args:
+        arg: string INDEX/COUNT where 0 <= INDEX < COUNT
+
+    Returns:
+        tuple of index and count
+
+    Raises:
+        ArgumentTypeError: if arg cannot be interpreted as INDEX/COUNT
+
+    """
+    index, _, count = arg.partition('/')
+    if index.isdigit() and count.isdigit() and 0 <= int(index) < int(count):
+        return int(index), int(count)
+    raise ArgumentTypeError(f"{arg} must be INDEX/COUNT where 0 <= INDEX < COUNT")
+
+
 def threshold_or_float(arg: str) -> Union[float, ThresholdPreset]:
     """Return ThresholdPreset or a float from the input string
 
@@ -102,7 +121,11 @@ def get_arguments() -> Namespace:
     parser = ArgumentParser(prog="python -m credsweeper")
     single_banner_argument = 2 == len(sys.argv) and "--banner" == sys.argv[1]
     group = parser.add_mutually_exclusive_group(required=not single_banner_argument)
-    group.add_argument("--path", nargs="+", help="file or directory to scan", dest="path", metavar="PATH")
+    group.add_argument("--path",
+                       nargs="+",
+                       help="file, directory, FIFO or '-' for standard input to scan",
+                       dest="path",
+                       metavar="PATH")
     group.add_argument("--diff_path", nargs="+", help="git diff file to scan", dest="diff_path", metavar="PATH")
     group.add_argument("--export_config",
                        nargs="?",
@@ -116,6 +139,11 @@ def get_arguments() -> Namespace:
                        const="log.yaml",
                        dest="export_log_config",
                        metavar="PATH")
+    group.add_argument("--merge",
+                       nargs="+",
+                       help="merge json reports of shards with duplicates purging and ML validation",
+                       dest="merge",
+                       metavar="PATH")
     parser.add_argument("--rules",
                         help="path of rule config file (default: credsweeper/rules/config.yaml). "
                         f"severity:{[i.value for i in Severity]} "
@@ -123,6 +151,14 @@ def get_arguments() -> Namespace:
                         default=None,
                         dest="rule_path",
                         metavar="PATH")
+    parser.add_argument(
+        "--cache_dir",
+        help="directory to keep compiled rules between runs, the cache is loaded only when "
+        "the directory and its files belong to the current user and are not writable for group or others "
+        "(default: no cache)",
+        default=None,
+        dest="rules_cache",
+        metavar="PATH")
     parser.add_argument("--severity",
                         help=f"set minimum level for rules to apply {[i.value for i in Severity]}"
                         f"(default: '{Severity.INFO}', case insensitive)",
@@ -203,14 +239,45 @@ def get_arguments() -> Namespace:
                         dest="jobs",
                         default=1,
                         metavar="POSITIVE_INT")
+    parser.add_argument("--start-method",
+                        help="start method of processes for multiple jobs: fork shares compiled rules with processes, "
+                        "forkserver imports modules once, both are available on Unix only (default: spawn)",
+                        choices=["spawn", "fork", "forkserver"],
+                        default="spawn",
+                        dest="start_method")
     parser.add_argument("--thrifty",
                         help="clear objects after scan to reduce memory consumption",
                         action=BooleanOptionalAction,
                         default=True)
+    parser.add_argument("--whole-buffer",
+                        help="search pattern rules in whole text of a file before scan of lines (experimental)",
+                        dest="whole_buffer",
+                        action="store_true")
+    parser.add_argument("--adaptive-filters",
+                        help="reorder filters of rules by measured cost and rejection rate during the scan",
+                        dest="adaptive_filters",
+                        action="store_true")
+    parser.add_argument("--stream",
+                        help="validate and export results by portions during the scan to keep memory bounded",
+                        dest="stream",
+                        action="store_true")
+    parser.add_argument("--shard",
+                        help="scan only files of the shard with stable partition of paths relative to the scanned "
+                        "paths (default: all files)",
+                        type=shard_index_count,
+                        dest="shard",
+                        default=None,
+                        metavar="INDEX/COUNT")
     parser.add_argument("--skip_ignored",
                         help="parse .gitignore files and skip credentials from ignored objects",
                         dest="skip_ignored",
                         action="store_true")
+    parser.add_argument("--walk-threads",
+                        help="number of threads to list directories, helps on network file systems (default: 1)",
+                        type=positive_int,
+                        dest="walk_threads",
+                        default=1,
+                        metavar="POSITIVE_INT")
     parser.add_argument("--error",
                         help="produce error code if credentials are found",
                         action=BooleanOptionalAction,
@@ -227,6 +294,12 @@ def get_arguments() -> Namespace:
                         const="output.xlsx",
                         dest="xlsx_filename",
                         metavar="PATH")
+    parser.add_argument("--profile",
+                        nargs="?",
+                        help="save time and hits of rules and filters to json file (default: profile.json)",
+                        const="profile.json",
+                        dest="profile_filename",
+                        metavar="PATH")
     parser.add_argument("--stdout", help="print results to stdout", action=BooleanOptionalAction, default=True)
     parser.add_argument("--color", help="print results with colorization", action=BooleanOptionalAction, default=False)
     parser.add_argument("--hashed",
@@ -266,6 +339,54 @@ def get_arguments() -> Namespace:
     return parser.parse_args()
 
 
+def get_credsweeper(args: Namespace) -> CredSweeper:
+    """Creates CredSweeper instance with the arguments
+
+    Args:
+        args: arguments of the application
+
+    Returns:
+        CredSweeper instance
+
+    """
+    if args.denylist_path is not None:
+        denylist = [line for line in Util.read_file(args.denylist_path) if line]
+    else:
+        denylist = []
+
+    return CredSweeper(rule_path=args.rule_path,
+                       config_path=args.config_path,
+                       json_filename=args.json_filename,
+                       xlsx_filename=args.xlsx_filename,
+                       stdout=args.stdout,
+                       color=args.color,
+                       hashed=args.hashed,
+                       subtext=args.subtext,
+                       sort_output=args.sort_output,
+                       use_filters=args.no_filters,
+                       pool_count=args.jobs,
+                       ml_batch_size=args.ml_batch_size,
+                       ml_threshold=args.ml_threshold,
+                       ml_config=args.ml_config,
+                       ml_model=args.ml_model,
+                       ml_providers=args.ml_providers,
+                       find_by_ext=args.find_by_ext,
+                       depth=args.depth,
+                       doc=args.doc,
+                       severity=args.severity,
+                       size_limit=args.size_limit,
+                       exclude_lines=denylist,
+                       exclude_values=denylist,
+                       thrifty=args.thrifty,
+                       whole_buffer=args.whole_buffer,
+                       rules_cache=args.rules_cache,
+                       profile_filename=args.profile_filename,
+                       adaptive_filters=args.adaptive_filters,
+                       stream=args.stream,
+                       start_method=args.start_method,
+                       log_level=args.log)
+
+
 def scan(args: Namespace, content_provider: AbstractProvider) -> int:
     """Scan content_provider data, print results or save them to json_filename is not None
 
@@ -281,37 +402,29 @@ def scan(args: Namespace, content_provider: AbstractProvider) -> int:
 
     """
     try:
-        if args.denylist_path is not None:
-            denylist = [line for line in Util.read_file(args.denylist_path) if line]
-        else:
-            denylist = []
-
-        credsweeper = CredSweeper(rule_path=args.rule_path,
-                                  config_path=args.config_path,
-                                  json_filename=args.json_filename,
-                                  xlsx_filename=args.xlsx_filename,
-                                  stdout=args.stdout,
-                                  color=args.color,
-                                  hashed=args.hashed,
-                                  subtext=args.subtext,
-                                  sort_output=args.sort_output,
-                                  use_filters=args.no_filters,
-                                  pool_count=args.jobs,
-                                  ml_batch_size=args.ml_batch_size,
-                                  ml_threshold=args.ml_threshold,
-                                  ml_config=args.ml_config,
-                                  ml_model=args.ml_model,
-                                  ml_providers=args.ml_providers,
-                                  find_by_ext=args.find_by_ext,
-                                  depth=args.depth,
-                                  doc=args.doc,
-                                  severity=args.severity,
-                                  size_limit=args.size_limit,
-                                  exclude_lines=denylist,
-                                  exclude_values=denylist,
-                                  thrifty=args.thrifty,
-                                  log_level=args.log)
-        return credsweeper.run(content_provider=content_provider)
+        with get_credsweeper(args) as credsweeper:
+            if args.shard is not None and "file_type" not in credsweeper.config.line_data_output:
+                # ML features of a member of an archive depend on its type which cannot be obtained from the path
+                credsweeper.config.line_data_output.append("file_type")
+            return credsweeper.run(content_provider=content_provider)
+    except Exception as exc:
+        logger.critical(exc, exc_info=True)
+    return -1
+
+
+def merge(args: Namespace) -> int:
+    """Merge json reports of shards, print results or save them to json_filename is not None
+
+    Args:
+        args: arguments of the application
+
+    Returns:
+        Number of credentials after the merge
+
+    """
+    try:
+        with get_credsweeper(args) as credsweeper:
+            return credsweeper.merge(args.merge)
     except Exception as exc:
         logger.critical(exc, exc_info=True)
     return -1
@@ -330,7 +443,10 @@ def main() -> int:
     summary: Dict[str, int] = {}
     if args.path:
         logger.info(f"Run analyzer on path: {args.path}")
-        content_provider: AbstractProvider = FilesProvider(args.path, skip_ignored=args.skip_ignored)
+        content_provider: AbstractProvider = FilesProvider(args.path,
+                                                           skip_ignored=args.skip_ignored,
+                                                           shard=args.shard,
+                                                           walk_threads=args.walk_threads)
         credentials_number = scan(args, content_provider)
         summary["Detected Credentials"] = credentials_number
         if 0 <= credentials_number:
@@ -351,6 +467,12 @@ def main() -> int:
             result = EXIT_SUCCESS
             # collect number of all found credential to produce error code when necessary
             credentials_number = add_credentials_number + del_credentials_number
+    elif args.merge:
+        logger.info(f"Merge reports: {args.merge}")
+        credentials_number = merge(args)
+        summary["Merged Credentials"] = credentials_number
+        if 0 <= credentials_number:
+            result = EXIT_SUCCESS
     elif args.export_config:
         logging.info(f"Exporting default config to file: {args.export_config}")
         config_dict = Util.json_load(APP_PATH / "secret" / "config.json")
@@ -1,9 +1,18 @@
+import asyncio
+import contextlib
+import functools
+import gc
+import itertools
 import json
 import logging
 import multiprocessing
+import queue
 import signal
+import threading
+import weakref
+from multiprocessing.pool import Pool
 from pathlib import Path
-from typing import Any, List, Optional, Union, Dict, Sequence, Tuple
+from typing import Any, List, Optional, Union, Dict, Sequence, Tuple, Generator, Iterable, TextIO, Set
 
 import pandas as pd
 from colorama import Style
@@ -15,15 +24,25 @@ from credsweeper.common.constants import Severity, ThresholdPreset, DiffRowType
 from credsweeper.config import Config
 from credsweeper.credentials import Candidate, CredentialManager, CandidateKey
 from credsweeper.deep_scanner.deep_scanner import DeepScanner
+from credsweeper.file_handler.content_provider import ContentProvider
 from credsweeper.file_handler.diff_content_provider import DiffContentProvider
 from credsweeper.file_handler.file_path_extractor import FilePathExtractor
 from credsweeper.file_handler.abstract_provider import AbstractProvider
+from credsweeper.file_handler.streaming_text_content_provider import StreamingTextContentProvider
 from credsweeper.file_handler.text_content_provider import TextContentProvider
 from credsweeper.scanner import Scanner
+from credsweeper.scanner.adaptive_filters import AdaptiveFilters
+from credsweeper.scanner.rules_profiler import RulesProfiler
+from credsweeper.scanner.scan_type import MultiPattern
 from credsweeper.utils import Util
+from credsweeper.utils.pem_key_detector import PemKeyDetector
+from credsweeper.utils.pipeline import Pipeline
 
 logger = logging.getLogger(__name__)
 
+# instance of CredSweeper in a worker process of the pool - it is set once by the pool initializer
+_worker_cred_sweeper: Optional["CredSweeper"] = None
+
 
 class CredSweeper:
     """Advanced credential analyzer base class.
@@ -37,6 +56,27 @@ class CredSweeper:
 
     """
 
+    # amount of batches per job for dynamic scheduling: more batches balance the load better but cost more transfers
+    BATCHES_PER_JOB = 4
+    # smaller batches are used for streaming mode to get first results early and keep the memory bounded
+    STREAM_BATCHES_PER_JOB = 32
+    # amount of candidates which are collected for duplicates purging and ML validation in streaming mode
+    STREAM_CANDIDATES_LIMIT = 4096
+    # minimal size of shards of lines which a large text is split into for parallel scan
+    SHARD_SIZE = 1 << 20
+    # lines around a shard which are required for rules and filters which look at neighbouring lines
+    SHARD_LINES_BEFORE = MultiPattern.MAX_SEARCH_MARGIN
+    SHARD_LINES_AFTER = max(MultiPattern.MAX_SEARCH_MARGIN, PemKeyDetector.MAX_KEY_LINES)
+    # a larger text is scanned by shards in the process instead of loading whole text
+    WINDOW_THRESHOLD = 1 << 26
+    # threads which read next files while a file is scanned, amount of files read ahead is twice more
+    READ_THREADS = 4
+    # amount of found files which wait for the scan in streaming mode while walking of directories goes on
+    PIPELINE_QUEUE_SIZE = 1024
+    # limits of size and amount of providers in a batch which is formed from found files in streaming mode
+    PIPELINE_BATCH_SIZE = SHARD_SIZE
+    PIPELINE_BATCH_LEN = 64
+
     def __init__(self,
                  rule_path: Union[None, str, Path] = None,
                  config_path: Optional[str] = None,
@@ -62,6 +102,12 @@ class CredSweeper:
                  exclude_lines: Optional[List[str]] = None,
                  exclude_values: Optional[List[str]] = None,
                  thrifty: bool = False,
+                 whole_buffer: bool = False,
+                 rules_cache: Union[None, str, Path] = None,
+                 profile_filename: Union[None, str, Path] = None,
+                 adaptive_filters: bool = False,
+                 stream: bool = False,
+                 start_method: str = "spawn",
                  log_level: Optional[str] = None) -> None:
         """Initialize Advanced credential scanner.
 
@@ -91,10 +137,20 @@ class CredSweeper:
             exclude_lines: lines to omit in scan. Will be added to the lines already in config
             exclude_values: values to omit in scan. Will be added to the values already in config
             thrifty: free provider resources after scan to reduce memory consumption
+            whole_buffer: boolean - pattern rules are searched in whole text of a file before scan of lines
+            rules_cache: optional str or Path to directory where compiled rules are kept between runs
+            profile_filename: optional string variable, path to save statistics of rules and filters to json
+            adaptive_filters: boolean - reorder filters of rules by measured cost and rejection rate during the scan
+            stream: boolean - candidates are validated and exported by portions during the scan in run()
+            start_method: str - start method of worker processes: "spawn", "fork" or "forkserver"
             log_level: str - level for pool initializer according logging levels (UPPERCASE)
 
         """
         self.pool_count: int = int(pool_count) if int(pool_count) > 1 else 1
+        if start_method not in multiprocessing.get_all_start_methods():
+            raise RuntimeError(f"Start method provided: {start_method}"
+                               f" -- must be one of: {' | '.join(multiprocessing.get_all_start_methods())}")
+        self.start_method = start_method
         if not (_severity := Severity.get(severity)):
             raise RuntimeError(f"Severity level provided: {severity}"
                                f" -- must be one of: {' | '.join([i.value for i in Severity])}")
@@ -106,9 +162,16 @@ class CredSweeper:
                                             severity=_severity,
                                             size_limit=size_limit,
                                             exclude_lines=exclude_lines,
-                                            exclude_values=exclude_values)
+                                            exclude_values=exclude_values,
+                                            whole_buffer=whole_buffer,
+                                            rules_cache=rules_cache)
         self.config = Config(config_dict)
         self.scanner = Scanner(self.config, rule_path)
+        self.profile_filename: Union[None, str, Path] = profile_filename
+        if self.profile_filename:
+            self.scanner.profiler = RulesProfiler()
+        if adaptive_filters:
+            self.scanner.adaptive_filters = AdaptiveFilters()
         self.deep_scanner = DeepScanner(self.config, self.scanner)
         self.credential_manager = CredentialManager()
         self.json_filename: Union[None, str, Path] = json_filename
@@ -118,6 +181,9 @@ class CredSweeper:
         self.hashed = hashed
         self.subtext = subtext
         self.sort_output = sort_output
+        self.stream = stream
+        if self.stream and self.sort_output:
+            logger.warning("Sorting of output is not applicable for streaming mode")
         self.ml_batch_size = ml_batch_size if ml_batch_size and 0 < ml_batch_size else 16
         self.ml_threshold = ml_threshold
         self.ml_config = ml_config
@@ -126,6 +192,38 @@ class CredSweeper:
         self.ml_validator = None
         self.__thrifty = thrifty
         self.__log_level = log_level
+        self.__pool: Optional[Pool] = None
+        # semaphore to limit amount of scans for every event loop
+        self.__async_limits: Optional[weakref.WeakKeyDictionary] = None
+        # post-processing of async scans runs in executor threads which are not stopped on cancellation of a scan
+        self.__post_processing_lock = threading.Lock()
+
+    def __enter__(self) -> "CredSweeper":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.shutdown_pool()
+
+    def __del__(self) -> None:
+        # the workers are stopped when the instance is released without shutdown_pool()
+        if getattr(self, "_CredSweeper__pool", None) is not None:
+            self.shutdown_pool(terminate=True)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Workers receive the instance once without the pool, ML validator and found credentials"""
+        state = self.__dict__.copy()
+        state["_CredSweeper__pool"] = None
+        state["_CredSweeper__ml_validator"] = None
+        state["_CredSweeper__async_limits"] = None
+        del state["_CredSweeper__post_processing_lock"]
+        # results of previous scans are not required in workers
+        state["credential_manager"] = CredentialManager()
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Locks cannot be transferred, so the instance gets own lock"""
+        self.__dict__.update(state)
+        self.__post_processing_lock = threading.Lock()
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
@@ -148,7 +246,9 @@ class CredSweeper:
             severity: Severity,  #
             size_limit: Optional[str],  #
             exclude_lines: Optional[List[str]],  #
-            exclude_values: Optional[List[str]]) -> Dict[str, Any]:
+            exclude_values: Optional[List[str]],  #
+            whole_buffer: bool,  #
+            rules_cache: Union[None, str, Path]) -> Dict[str, Any]:
         config_dict = Util.json_load(self._get_config_path(config_path))
         config_dict["use_filters"] = use_filters
         config_dict["find_by_ext"] = find_by_ext
@@ -156,6 +256,8 @@ class CredSweeper:
         config_dict["depth"] = depth
         config_dict["doc"] = doc
         config_dict["severity"] = severity.value
+        config_dict["whole_buffer"] = whole_buffer
+        config_dict["rules_cache"] = str(rules_cache) if rules_cache else None
 
         if exclude_lines is not None:
             config_dict["exclude"]["lines"] = config_dict["exclude"].get("lines", []) + exclude_lines
@@ -212,10 +314,90 @@ class CredSweeper:
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
     @staticmethod
-    def pool_initializer(log_kwargs) -> None:
-        """Ignore SIGINT in child processes."""
+    def pool_initializer(log_kwargs, cred_sweeper: Optional["CredSweeper"] = None) -> None:
+        """Ignore SIGINT in child processes and keep the instance for all tasks of the worker."""
+        global _worker_cred_sweeper
         logging.basicConfig(**log_kwargs)
         signal.signal(signal.SIGINT, signal.SIG_IGN)
+        if cred_sweeper is not None:
+            # forked worker inherits the instance as is, so found credentials are dropped like in __getstate__
+            cred_sweeper.credential_manager.set_credentials([])
+        _worker_cred_sweeper = cred_sweeper
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    @staticmethod
+    def pool_files_scan(content_providers: Sequence[ContentProvider]) -> List[Tuple[Any, ...]]:
+        """Scans the sequence with the instance of the worker and returns compact records of candidates"""
+        assert _worker_cred_sweeper is not None, "worker was not initialized"
+        return [x.to_record() for x in _worker_cred_sweeper.files_scan(content_providers)]
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    @staticmethod
+    def pool_profiled_files_scan(
+            content_providers: Sequence[ContentProvider]) -> Tuple[List[Tuple[Any, ...]], List[Dict[str, Any]]]:
+        """Scans the sequence with the instance of the worker and returns records with statistics of rules"""
+        assert _worker_cred_sweeper is not None, "worker was not initialized"
+        candidates, stats = _worker_cred_sweeper.profiled_files_scan(content_providers)
+        return [x.to_record() for x in candidates], stats
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def start_pool(self) -> Pool:
+        """Starts the pool of workers if it is not running yet.
+
+        The workers are initialized once with a copy of current instance and are reused for next scans until
+        shutdown_pool() is called. The method may be called in advance to warm up the workers before first scan.
+        Forked workers get the instance without pickling and share its memory with the parent process until
+        the memory is changed.
+
+        Return:
+            the running pool
+
+        """
+        if self.__pool is not None:
+            return self.__pool
+        # use this separation to satisfy YAPF formatter
+        yapfix = "%(asctime)s | %(levelname)s | %(processName)s:%(threadName)s | %(filename)s:%(lineno)s | %(message)s"
+        log_kwargs = {"format": yapfix}
+        if isinstance(self.__log_level, str):
+            # is not None
+            if "SILENCE" == self.__log_level:
+                logging.addLevelName(60, "SILENCE")
+            log_kwargs["level"] = self.__log_level
+        context = multiprocessing.get_context(self.start_method)
+        if "forkserver" == self.start_method:
+            # modules are imported once in the server process, so workers are forked with them
+            context.set_forkserver_preload(["credsweeper.app"])
+        elif "fork" == self.start_method:
+            # compiled rules are shared with workers copy-on-write, so garbage collector must not touch the objects
+            gc.freeze()
+        try:
+            self.__pool = context.Pool(processes=self.pool_count,
+                                       initializer=self.pool_initializer,
+                                       initargs=(log_kwargs, self))
+        finally:
+            if "fork" == self.start_method:
+                gc.unfreeze()
+        return self.__pool
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def shutdown_pool(self, terminate: bool = False) -> None:
+        """Stops the pool of workers if it is running.
+
+        Args:
+            terminate: stop the workers immediately without waiting for running tasks
+
+        """
+        if self.__pool is not None:
+            if terminate:
+                self.__pool.terminate()
+            else:
+                self.__pool.close()
+            self.__pool.join()
+            self.__pool = None
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
@@ -240,19 +422,63 @@ class CredSweeper:
             content_provider: path objects to scan
 
         """
+        # PatchesProvider has the attribute. Circular import error appears with using the isinstance
+        change_type = content_provider.change_type if hasattr(content_provider, "change_type") else None
         _empty_list: Sequence[Union[DiffContentProvider, TextContentProvider]] = []
+        if 1 < self.pool_count:
+            # workers are forked before threads of the pipeline and of walking of directories are started
+            self.start_pool()
+        if self.stream:
+            # stages of search, read, scan, post-processing and export overlap with bounded queues between them
+            found_files = content_provider.yield_scannable_files(self.config) if content_provider else _empty_list
+            providers = Pipeline.yield_ahead(found_files, self.PIPELINE_QUEUE_SIZE)
+            candidates = self.yield_post_processing(self.yield_scan(providers))
+            return self.export_stream(candidates, change_type)
         file_extractors: Sequence[Union[DiffContentProvider, TextContentProvider]] = \
             content_provider.get_scannable_files(self.config) if content_provider else _empty_list
         logger.info(f"Start Scanner for {len(file_extractors)} providers")
         self.scan(file_extractors)
         self.post_processing()
-        # PatchesProvider has the attribute. Circular import error appears with using the isinstance
-        change_type = content_provider.change_type if hasattr(content_provider, "change_type") else None
         self.export_results(change_type)
         return self.credential_manager.len_credentials()
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
+    def merge(self, report_paths: Sequence[Union[str, Path]]) -> int:
+        """Merges json reports of scans of several shards into single result.
+
+        Duplicates are purged and ML validation is applied once for all candidates, so the shards may be scanned
+        without ML (ml_threshold=0). The reports must be produced without hashing and subtext to be validated.
+
+        Args:
+            report_paths: paths of json reports to merge
+
+        Return:
+            number of credentials after the merge or -1 if a report cannot be read
+
+        """
+        rules = {rule.rule_name: rule for rule, _ in self.scanner.rules_scanners}
+        candidates: List[Candidate] = []
+        for report_path in report_paths:
+            report = Util.json_load(report_path)
+            if not isinstance(report, list):
+                logger.error(f"Unexpected report format: {report_path}")
+                return -1
+            for candidate_dict in report:
+                candidate = Candidate.from_json(self.config, candidate_dict)
+                if rule := rules.get(candidate.rule_name):
+                    # the report may have no attributes of the rule which are required for ML validation
+                    candidate.use_ml = rule.use_ml
+                    candidate.patterns = rule.patterns
+                candidates.append(candidate)
+        logger.info(f"Merge {len(candidates)} candidates from {len(report_paths)} reports")
+        self.credential_manager.set_credentials(candidates)
+        self.post_processing()
+        self.export_results()
+        return self.credential_manager.len_credentials()
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
     def scan(self, content_providers: Sequence[Union[DiffContentProvider, TextContentProvider]]) -> None:
         """Run scanning of files from an argument "content_providers".
 
@@ -274,49 +500,311 @@ class CredSweeper:
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
+    def get_shards(self,
+                   content_providers: Sequence[ContentProvider],
+                   shard_size: Optional[int] = None) -> List[ContentProvider]:
+        """Splits large files into shards, so a huge file is scanned with all jobs.
+
+        Shards of a text keep lines around own range for multiline rules and filters. A candidate is found only in
+        the shard with the line of the candidate and line numbers are kept, so results do not differ from scan of
+        whole text. Deep scan requires whole data, so only members of zip or tar archives are split in the mode.
+
+        Args:
+            content_providers: file objects to scan
+            shard_size: size of shards, by default every job gets several shards of a file for balance
+
+        Return:
+            list of providers where the large providers are replaced with their shards
+
+        """
+        providers: List[ContentProvider] = []
+        for provider in content_providers:
+            if 2 * self.SHARD_SIZE <= provider.size \
+                    and not FilePathExtractor.is_find_by_ext_file(self.config, provider.file_type):
+                size = shard_size or max(self.SHARD_SIZE, provider.size // (self.pool_count * self.BATCHES_PER_JOB))
+                if self.config.depth or self.config.doc:
+                    providers.extend(self.deep_scanner.get_shards(provider, size))
+                elif provider.file_type not in self.config.exclude_containers:
+                    providers.extend(provider.get_shards(size, self.SHARD_LINES_BEFORE, self.SHARD_LINES_AFTER))
+                else:
+                    providers.append(provider)
+            else:
+                providers.append(provider)
+        return providers
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def get_batches(
+            self,  #
+            content_providers: Sequence[ContentProvider],
+            batches_per_job: Optional[int] = None) -> List[List[ContentProvider]]:
+        """Splits providers into batches for dynamic scheduling of jobs.
+
+        The providers are ordered largest-first, so the biggest files are started at the beginning and small files
+        fill idle workers at the end. A batch is closed when its size or amount of providers reaches the share of
+        all providers for BATCHES_PER_JOB batches per job.
+
+        Args:
+            content_providers: file objects to scan
+            batches_per_job: optional amount of batches per job instead of BATCHES_PER_JOB
+
+        Return:
+            list of batches of providers in order of processing
+
+        """
+        batches_count = self.pool_count * (batches_per_job or self.BATCHES_PER_JOB)
+        sized_providers = sorted(content_providers, key=lambda x: x.size, reverse=True)
+        size_limit = max(1, sum(x.size for x in sized_providers) // batches_count)
+        len_limit = max(1, -(-len(sized_providers) // batches_count))
+        return list(Pipeline.yield_grouped(sized_providers, lambda x: x.size, size_limit, len_limit))
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
     def __multi_jobs_scan(self, content_providers: Sequence[Union[DiffContentProvider, TextContentProvider]]) -> None:
-        """Performs scan with multiple jobs"""
-        # use this separation to satisfy YAPF formatter
-        yapfix = "%(asctime)s | %(levelname)s | %(processName)s:%(threadName)s | %(filename)s:%(lineno)s | %(message)s"
-        log_kwargs = {"format": yapfix}
-        if isinstance(self.__log_level, str):
-            # is not None
-            if "SILENCE" == self.__log_level:
-                logging.addLevelName(60, "SILENCE")
-            log_kwargs["level"] = self.__log_level
-        with multiprocessing.get_context("spawn").Pool(processes=self.pool_count,
-                                                       initializer=self.pool_initializer,
-                                                       initargs=(log_kwargs, )) as pool:
-            try:
-                for scan_results in pool.imap_unordered(self.files_scan, (content_providers[x::self.pool_count]
-                                                                          for x in range(self.pool_count))):
-                    for cred in scan_results:
-                        self.credential_manager.add_credential(cred)
-            except KeyboardInterrupt:
-                pool.terminate()
-                pool.join()
-                raise
-            pool.close()
-            pool.join()
+        """Performs scan with multiple jobs in the pool which is kept for next scans"""
+        pool = self.start_pool()
+        streams: List[ContentProvider] = []
+        # idle workers pull next batch from the pool queue
+        batches = self.get_batches(
+            self.get_shards(list(StreamingTextContentProvider.split_streams(content_providers, streams))))
+        all_cred: List[Candidate] = []
+        pool_files_scan = self.pool_files_scan if self.scanner.profiler is None else self.pool_profiled_files_scan
+        try:
+            results = pool.imap_unordered(pool_files_scan, batches)
+            # streams are read by blocks in the process while the workers scan files
+            for provider in streams:
+                all_cred.extend(self.__thrifty_file_scan(provider))
+            for result in results:
+                all_cred.extend(self.__from_pool_result(result))
+        except KeyboardInterrupt:
+            self.shutdown_pool(terminate=True)
+            raise
+        self.credential_manager.set_credentials(all_cred)
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def __from_pool_result(self, result: Any) -> List[Candidate]:
+        """Restores candidates of a batch which was scanned in the pool and updates statistics of the profiler"""
+        if self.scanner.profiler is None:
+            return [Candidate.from_record(self.config, x) for x in result]
+        records, stats = result
+        self.scanner.profiler.update(stats)
+        return [Candidate.from_record(self.config, x) for x in records]
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def yield_scan(self, content_providers: Iterable[ContentProvider]) -> Generator[List[Candidate], None, None]:
+        """Scans the providers and yields found candidates by portions.
+
+        Every portion contains all candidates of one or several providers, so duplicates and groups of candidates
+        may be processed for the portion independently. The providers may be a generator, so the scan starts
+        before all files are found.
+
+        Args:
+            content_providers: file objects to scan
+
+        Return:
+            generator of lists of candidates
+
+        """
+        if 1 < self.pool_count:
+            yield from self.__multi_jobs_yield_scan(content_providers)
+        else:
+            # next files are read ahead in threads while a file is scanned
+            windows = self.yield_windows(content_providers)
+            for provider in Pipeline.yield_mapped(self._prefetch, windows, self.READ_THREADS, 2 * self.READ_THREADS):
+                yield self.__thrifty_file_scan(provider)
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def yield_windows(self, content_providers: Iterable[ContentProvider]) -> Generator[ContentProvider, None, None]:
+        """Yields the providers where a text above WINDOW_THRESHOLD is replaced with its shards of SHARD_SIZE,
+        so the text is not loaded whole. A file which cannot be split, e.g. UTF-16 text, is read by blocks"""
+        for provider in content_providers:
+            if self.WINDOW_THRESHOLD <= provider.size:
+                windows = self.get_shards([provider], self.SHARD_SIZE)
+                if [provider] == windows and isinstance(provider, TextContentProvider) and provider.is_file \
+                        and not isinstance(provider, StreamingTextContentProvider):
+                    logger.warning(f"{provider.file_path} is not split into windows and is read by blocks")
+                    windows = [
+                        StreamingTextContentProvider(provider.file_path, None, provider.file_type, provider.info)
+                    ]
+                yield from windows
+            else:
+                yield provider
+
+    @staticmethod
+    def _prefetch(content_provider: ContentProvider) -> ContentProvider:
+        """Reads data of the provider in a thread"""
+        content_provider.prefetch()
+        return content_provider
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def yield_batches(self,
+                      content_providers: Iterable[ContentProvider]) -> Generator[List[ContentProvider], None, None]:
+        """Yields batches of providers for streaming mode.
+
+        A sequence is split with get_batches() in order of sizes. Providers of a generator are grouped in order of
+        appearance with PIPELINE_BATCH_SIZE and PIPELINE_BATCH_LEN limits, so first batches are scanned while
+        next files are being found.
+
+        Args:
+            content_providers: file objects to scan
+
+        Return:
+            generator of batches of providers
+
+        """
+        if isinstance(content_providers, Sequence):
+            yield from self.get_batches(self.get_shards(content_providers), self.STREAM_BATCHES_PER_JOB)
+        else:
+            shards = (x for provider in content_providers for x in self.get_shards([provider]))
+            yield from Pipeline.yield_grouped(shards, lambda x: x.size, self.PIPELINE_BATCH_SIZE,
+                                              self.PIPELINE_BATCH_LEN)
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def __multi_jobs_yield_scan(self,
+                                content_providers: Iterable[ContentProvider]) -> Generator[List[Candidate], None, None]:
+        """Yields candidates of batches as they are completed - amount of batches in flight is limited"""
+        pool = self.start_pool()
+        streams: List[ContentProvider] = []
+        batches = self.yield_batches(StreamingTextContentProvider.split_streams(content_providers, streams))
+        pool_files_scan = self.pool_files_scan if self.scanner.profiler is None else self.pool_profiled_files_scan
+        results: queue.SimpleQueue = queue.SimpleQueue()
+        in_flight = 0
+        try:
+            for batch in itertools.islice(batches, 2 * self.pool_count):
+                pool.apply_async(pool_files_scan, (batch, ), callback=results.put, error_callback=results.put)
+                in_flight += 1
+            while in_flight or streams:
+                if streams:
+                    # a stream is read by blocks in the process while the workers scan batches
+                    yield self.__thrifty_file_scan(streams.pop(0))
+                    continue
+                result = results.get()
+                in_flight -= 1
+                if isinstance(result, BaseException):
+                    raise result
+                if batch := next(batches, None):
+                    pool.apply_async(pool_files_scan, (batch, ), callback=results.put, error_callback=results.put)
+                    in_flight += 1
+                yield self.__from_pool_result(result)
+        except KeyboardInterrupt:
+            self.shutdown_pool(terminate=True)
+            raise
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    async def scan_async(self,
+                         content_providers: Sequence[ContentProvider],
+                         timeout: Optional[float] = None) -> List[Candidate]:
+        """Scans the providers without blocking of the event loop and returns validated candidates.
+
+        Files are read and scanned in the pool of workers when pool_count > 1 or in default executor of the loop
+        one by one. Amount of concurrent scans is limited with pool_count and other scans wait for their turn.
+        Duplicates purging and ML validation are performed in the executor for one scan at once in all event loops.
+        Cancellation stops the scan after current providers or batches, their results are dropped. A provider scan or
+        post-processing which already runs in the executor is completed in background.
+
+        Args:
+            content_providers: file objects to scan
+            timeout: optional time in seconds for whole scan including waiting for the turn
+
+        Return:
+            list of candidates after post-processing
+
+        Raises:
+            asyncio.TimeoutError: if the scan is not completed in time
+
+        """
+        return await asyncio.wait_for(self.__limited_scan_async(content_providers), timeout)
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    async def __limited_scan_async(self, content_providers: Sequence[ContentProvider]) -> List[Candidate]:
+        """Performs the scan and post-processing in turn of the event loop"""
+        loop = asyncio.get_running_loop()
+        if self.__async_limits is None:
+            self.__async_limits = weakref.WeakKeyDictionary()
+        if loop not in self.__async_limits:
+            self.__async_limits[loop] = asyncio.Semaphore(self.pool_count)
+        async with self.__async_limits[loop]:
+            if 1 < self.pool_count:
+                candidates = await self.__pool_scan_async(content_providers)
+            else:
+                candidates = []
+                for provider in content_providers:
+                    candidates.extend(await loop.run_in_executor(None, self.__thrifty_file_scan, provider))
+        return await loop.run_in_executor(None, self.__post_process_pending, candidates)
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    async def __pool_scan_async(self, content_providers: Sequence[ContentProvider]) -> List[Candidate]:
+        """Scans batches of the providers in the pool - amount of batches in flight is limited"""
+        loop = asyncio.get_running_loop()
+        pool = self.start_pool()
+        # sizes and headers of files are read to split large files
+        shards = await loop.run_in_executor(None, self.get_shards, content_providers)
+        batches = iter(self.get_batches(shards))
+        pool_files_scan = self.pool_files_scan if self.scanner.profiler is None else self.pool_profiled_files_scan
+        candidates: List[Candidate] = []
+        in_flight: Set[asyncio.Future] = set()
+        try:
+            while True:
+                for batch in itertools.islice(batches, 2 * self.pool_count - len(in_flight)):
+                    future = loop.create_future()
+                    callback = functools.partial(Pipeline.set_future_threadsafe, loop, future)
+                    pool.apply_async(pool_files_scan, (batch, ), callback=callback, error_callback=callback)
+                    in_flight.add(future)
+                if not in_flight:
+                    break
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    candidates.extend(self.__from_pool_result(future.result()))
+        finally:
+            # results of running batches are dropped on cancellation
+            for future in in_flight:
+                future.cancel()
+        return candidates
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def __thrifty_file_scan(self, content_provider: ContentProvider) -> List[Candidate]:
+        """Scans the provider and frees its resources in thrifty mode"""
+        candidates = self.file_scan(content_provider)
+        if self.__thrifty:
+            content_provider.free()
+        return candidates
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
     def files_scan(
             self,  #
-            content_providers: Sequence[Union[DiffContentProvider, TextContentProvider]]) -> List[Candidate]:
+            content_providers: Sequence[ContentProvider]) -> List[Candidate]:
         """Auxiliary method for scan one sequence"""
         all_cred: List[Candidate] = []
-        for provider in content_providers:
-            candidates = self.file_scan(provider)
-            if self.__thrifty:
-                provider.free()
-            all_cred.extend(candidates)
+        for provider in self.yield_windows(content_providers):
+            all_cred.extend(self.__thrifty_file_scan(provider))
         logger.info(f"Completed: processed {len(content_providers)} providers with {len(all_cred)} candidates")
         return all_cred
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
-    def file_scan(self, content_provider: Union[DiffContentProvider, TextContentProvider]) -> List[Candidate]:
+    def profiled_files_scan(
+            self,  #
+            content_providers: Sequence[ContentProvider]) -> Tuple[List[Candidate], List[Dict[str, Any]]]:
+        """Auxiliary method for scan one sequence in a worker with statistics of rules"""
+        assert self.scanner.profiler is not None, "profiler was not initialized"
+        # the worker has a copy of the profiler, so only own statistics are returned
+        self.scanner.profiler.clear()
+        candidates = self.files_scan(content_providers)
+        return candidates, self.scanner.profiler.get_stats()
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def file_scan(self, content_provider: ContentProvider) -> List[Candidate]:
         """Run scanning of file from 'file_provider'.
 
         Args:
@@ -388,6 +876,39 @@ class CredSweeper:
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
+    def yield_post_processing(self, portions: Iterable[List[Candidate]]) -> Generator[Candidate, None, None]:
+        """Purges duplicates and validates candidates with ML by micro-batches of STREAM_CANDIDATES_LIMIT.
+
+        Args:
+            portions: lists of candidates of whole providers from yield_scan()
+
+        Return:
+            generator of validated candidates
+
+        """
+        pending: List[Candidate] = []
+        for candidates in portions:
+            pending.extend(candidates)
+            if self.STREAM_CANDIDATES_LIMIT <= len(pending):
+                yield from self.__post_process_pending(pending)
+                pending = []
+        if pending:
+            yield from self.__post_process_pending(pending)
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def __post_process_pending(self, candidates: List[Candidate]) -> List[Candidate]:
+        """Applies post_processing() for the candidates only. The credential manager is shared, so the lock is held
+        by the thread for whole post-processing - even when the async scan was cancelled or used other event loop"""
+        with self.__post_processing_lock:
+            self.credential_manager.set_credentials(candidates)
+            self.post_processing()
+            validated = self.credential_manager.get_credentials()
+            self.credential_manager.set_credentials([])
+        return validated
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
     def export_results(self, change_type: Optional[DiffRowType] = None) -> None:
         """
         Save credential candidates to json file or print them to a console.
@@ -410,27 +931,75 @@ class CredSweeper:
                 x.line_data_list[0].value_end  #
             ))
 
-        if self.json_filename:
-            json_path = Path(self.json_filename)
-            if isinstance(change_type, DiffRowType):
-                # add suffix for appropriated reports to create two files for the patch scan
-                json_path = json_path.with_suffix(f".{change_type.value}{json_path.suffix}")
-            with open(json_path, 'w') as f:
+        self.export_stream(credentials, change_type)
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def export_stream(self, credentials: Iterable[Candidate], change_type: Optional[DiffRowType] = None) -> int:
+        """
+        Save credential candidates to json file or print them to a console during single pass over the credentials.
+        Colored and plain lines of a sequence are printed in separate blocks, but they alternate per credential when
+        the credentials come from a generator in streaming mode.
+
+        Args:
+            credentials: credential candidates to export - they are consumed once
+            change_type: flag to know which file should be created for a patch
+
+        Return:
+            number of exported credentials
+
+        """
+        with contextlib.ExitStack() as exit_stack:
+            json_file: Optional[TextIO] = None
+            if self.json_filename:
+                json_path = Path(self.json_filename)
+                if isinstance(change_type, DiffRowType):
+                    # add suffix for appropriated reports to create two files for the patch scan
+                    json_path = json_path.with_suffix(f".{change_type.value}{json_path.suffix}")
+                json_file = exit_stack.enter_context(open(json_path, 'w'))
                 # use the approach to reduce total memory usage in case of huge data
-                first_item = True
-                f.write('[\n')
-                for credential in credentials:
-                    if first_item:
-                        first_item = False
-                    else:
-                        f.write(",\n")
-                    f.write(json.dumps(credential.to_json(hashed=self.hashed, subtext=self.subtext), indent=4))
-                f.write("\n]")
+                json_file.write('[\n')
 
-        if self.xlsx_filename:
             data_list = []
+            count = 0
+            # the plain block follows the colored block when the credentials may be iterated again
+            separate_blocks = self.color and self.stdout and isinstance(credentials, Sequence)
             for credential in credentials:
-                data_list.extend(credential.to_dict_list(hashed=self.hashed, subtext=self.subtext))
+                if json_file is not None:
+                    if count:
+                        json_file.write(",\n")
+                    json_file.write(json.dumps(credential.to_json(hashed=self.hashed, subtext=self.subtext), indent=4))
+
+                if self.xlsx_filename:
+                    data_list.extend(credential.to_dict_list(hashed=self.hashed, subtext=self.subtext))
+
+                if self.color:
+                    for line_data in credential.line_data_list:
+                        # bright rule name and path or info
+                        print(Style.BRIGHT + credential.rule_name +
+                              f" {line_data.info or line_data.path}:{line_data.line_num} {credential.ml_probability}" +
+                              Style.RESET_ALL)
+                        print(line_data.get_colored_line(hashed=self.hashed, subtext=self.subtext))
+
+                if self.stdout and not separate_blocks:
+                    print(credential.to_str(hashed=self.hashed, subtext=self.subtext))
+
+                count += 1
+
+            if separate_blocks:
+                for credential in credentials:
+                    print(credential.to_str(hashed=self.hashed, subtext=self.subtext))
+
+            if json_file is not None:
+                json_file.write("\n]")
+
+        if self.profile_filename and self.scanner.profiler is not None:
+            profile_path = Path(self.profile_filename)
+            if isinstance(change_type, DiffRowType):
+                profile_path = profile_path.with_suffix(f".{change_type.value}{profile_path.suffix}")
+            Util.json_dump(self.scanner.profiler.get_stats(), profile_path)
+
+        if self.xlsx_filename:
             df = pd.DataFrame(data=data_list)
             if isinstance(change_type, DiffRowType):
                 if Path(self.xlsx_filename).exists():
@@ -442,15 +1011,4 @@ class CredSweeper:
             else:
                 df.to_excel(self.xlsx_filename, sheet_name="report", index=False)
 
-        if self.color:
-            for credential in credentials:
-                for line_data in credential.line_data_list:
-                    # bright rule name and path or info
-                    print(Style.BRIGHT + credential.rule_name +
-                          f" {line_data.info or line_data.path}:{line_data.line_num} {credential.ml_probability}" +
-                          Style.RESET_ALL)
-                    print(line_data.get_colored_line(hashed=self.hashed, subtext=self.subtext))
-
-        if self.stdout:
-            for credential in credentials:
-                print(credential.to_str(hashed=self.hashed, subtext=self.subtext))
+        return count
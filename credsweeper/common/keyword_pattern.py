@@ -1,4 +1,5 @@
 import re
+from typing import List, Optional
 
 
 class KeywordPattern:
@@ -49,11 +50,9 @@ class KeywordPattern:
                   r"(?(wrap)[\]\)\},;]))"
 
     @classmethod
-    def get_keyword_pattern(cls, keyword: str) -> re.Pattern:
-        """Returns compiled regex pattern"""
-        expression = ''.join([  #
-            cls.key_left,  #
-            keyword,  #
+    def _get_suffix(cls) -> str:
+        """Returns part of the template after a keyword"""
+        return ''.join([  #
             cls.key_right,  #
             cls.separator,  #
             cls.wrap,  #
@@ -63,4 +62,25 @@ class KeywordPattern:
             cls.value,  #
             cls.right_quote,  #
         ])
+
+    @classmethod
+    def get_keyword_pattern(cls, keyword: str) -> re.Pattern:
+        """Returns compiled regex pattern"""
+        expression = ''.join([cls.key_left, keyword, cls._get_suffix()])
         return re.compile(expression, flags=re.IGNORECASE | re.DOTALL)
+
+    @classmethod
+    def get_keywords_pattern(cls, keywords: List[str]) -> re.Pattern:
+        """Returns compiled regex pattern which matches a line when any of the keyword patterns matches"""
+        return cls.get_keyword_pattern('|'.join(f"(?:{keyword})" for keyword in keywords))
+
+    @classmethod
+    def get_keyword(cls, pattern: re.Pattern) -> Optional[str]:
+        """Returns the keyword of pattern which was made with the template or None"""
+        expression: str = pattern.pattern
+        suffix = cls._get_suffix()
+        if expression.startswith(cls.key_left) and expression.endswith(suffix) \
+                and len(cls.key_left) + len(suffix) < len(expression) \
+                and re.IGNORECASE | re.DOTALL == pattern.flags & ~re.UNICODE:
+            return expression[len(cls.key_left):-len(suffix)]
+        return None
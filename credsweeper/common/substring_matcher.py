@@ -0,0 +1,81 @@
+import re
+from typing import Dict, Iterable, Optional, Set
+
+
+class SubstringMatcher:
+    """Multi-pattern matcher to find all given substrings in a text with single pass.
+
+    The substrings are folded into a trie which is compiled into one regular expression, so the regex engine walks
+    the trie from every position of the text in C code instead of a Python loop over all the substrings.
+    A lookahead makes overlapped occurrences visible and the greedy trie branches report the longest substring
+    for a position. Shorter substrings which are prefixes of the found one are added from precomputed closure.
+
+    """
+
+    def __init__(self, substrings: Iterable[str]) -> None:
+        """
+        Args:
+            substrings: strings to be searched. Empty string is found in any text.
+
+        """
+        self.__substrings: Set[str] = set(substrings)
+        self.__has_empty = "" in self.__substrings
+        self.__substrings.discard("")
+        self.__prefixes: Dict[str, Set[str]] = {}
+        for substring in self.__substrings:
+            self.__prefixes[substring] = set(substring[:i] for i in range(1, 1 + len(substring))
+                                             if substring[:i] in self.__substrings)
+        self.__pattern: Optional[re.Pattern] = None
+        if self.__substrings:
+            trie: Dict[str, dict] = {}
+            for substring in self.__substrings:
+                node = trie
+                for char in substring:
+                    node = node.setdefault(char, {})
+                # empty key marks end of a substring
+                node[""] = {}
+            self.__pattern = re.compile(f"(?=({self._trie_to_regex(trie)}))", flags=re.DOTALL)
+
+    @staticmethod
+    def _trie_to_regex(node: Dict[str, dict]) -> str:
+        """Transforms trie node into regex. Greedy optional group is used when a substring ends in the node"""
+        branches = [
+            f"{re.escape(char)}{SubstringMatcher._trie_to_regex(child)}" for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ""
+        regex = branches[0] if 1 == len(branches) else f"(?:{'|'.join(branches)})"
+        if "" in node:
+            regex = f"(?:{regex})?"
+        return regex
+
+    @property
+    def substrings(self) -> Set[str]:
+        """substrings getter - without empty string"""
+        return self.__substrings
+
+    def find(self, text: str) -> Set[str]:
+        """Finds all the substrings which are present in the text.
+
+        Args:
+            text: text to search in
+
+        Return:
+            set of found substrings. Empty string is included when it was passed to the matcher
+
+        """
+        found: Set[str] = set()
+        if self.__has_empty:
+            found.add("")
+        if self.__pattern is not None:
+            for substring in set(self.__pattern.findall(text)):
+                found.update(self.__prefixes[substring])
+        return found
+
+    def search(self, text: str) -> bool:
+        """Checks whether any substring is present in the text"""
+        if self.__has_empty:
+            return True
+        if self.__pattern is not None:
+            return self.__pattern.search(text) is not None
+        return False
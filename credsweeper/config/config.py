@@ -4,6 +4,7 @@ from typing import Dict, List, Optional, Set, Any
 from humanfriendly import parse_size
 
 from credsweeper.common.constants import Severity, DEFAULT_PATTERN_LEN
+from credsweeper.config.path_matcher import PathMatcher
 from credsweeper.utils import Util
 
 
@@ -15,7 +16,14 @@ class Config:
         ".*package\\.json", ".*\\.css", ".*\\.scss"
     ]
 
+    # attributes which are compiled into path_matcher
+    PATH_MATCHER_ATTRIBUTES = {
+        "not_allowed_path_pattern", "exclude_patterns", "exclude_paths", "exclude_extensions", "exclude_containers",
+        "exclude_documents"
+    }
+
     def __init__(self, config: Dict[str, Any]) -> None:
+        self.__path_matcher: Optional[PathMatcher] = None
         self.exclude_patterns: List[re.Pattern] = [re.compile(pattern) for pattern in config["exclude"]["pattern"]]
         self.exclude_paths: List[str] = config["exclude"]["path"]
         self.exclude_containers: List[str] = config["exclude"]["containers"]
@@ -47,3 +55,22 @@ class Config:
         self.exclude_values = set(line.strip() for line in self.exclude_values)
 
         self.pattern_len = config.get("pattern_len", DEFAULT_PATTERN_LEN)
+        self.whole_buffer: bool = bool(config.get("whole_buffer", False))
+        self.rules_cache: Optional[str] = config.get("rules_cache")
+        # compile exclusion of paths in advance
+        _ = self.path_matcher
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in Config.PATH_MATCHER_ATTRIBUTES:
+            # the exclusion is compiled again on next use
+            super().__setattr__("_Config__path_matcher", None)
+
+    @property
+    def path_matcher(self) -> PathMatcher:
+        """Compiled exclusion of paths. Note: a change of the lists in place is not tracked, assign new lists"""
+        if self.__path_matcher is None:
+            self.__path_matcher = PathMatcher([self.not_allowed_path_pattern, *self.exclude_patterns],
+                                              self.exclude_paths, self.exclude_extensions, self.exclude_containers,
+                                              self.exclude_documents)
+        return self.__path_matcher
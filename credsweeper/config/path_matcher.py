@@ -0,0 +1,134 @@
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+from credsweeper.utils import Util
+
+
+class PathMatcher:
+    """Exclusion of paths compiled from config: one regex for all patterns, one regex for all excluded substrings
+    and sets of extensions.
+
+    Paths are expected with slash separators. Decisions for directories are cached, so files of one directory
+    share the work.
+
+    """
+
+    # flags which may be set for a part of a combined regex
+    SCOPED_FLAGS = {re.IGNORECASE: "i", re.MULTILINE: "m", re.DOTALL: "s"}
+    # backreference by number or by name refers to another group in a combined regex
+    BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+    # limit of cached decisions for directories
+    DIR_CACHE_SIZE = 1 << 16
+
+    def __init__(self, patterns: List[re.Pattern], paths: List[str], extensions: Iterable[str],
+                 containers: Iterable[str], documents: Iterable[str]) -> None:
+        """Compiles the exclusion.
+
+        Args:
+            patterns: patterns which are matched with lowercase path
+            paths: case-sensitive substrings of path
+            extensions: excluded extensions
+            containers: extensions which are excluded when depth is not set
+            documents: extensions which are excluded when neither depth nor doc is set
+
+        """
+        self.patterns = self.combine_patterns(patterns)
+        # patterns which match all paths in a directory when the directory path matches
+        self.dir_patterns = self.combine_patterns([x for x in patterns if self.is_prefix_pattern(x)])
+        self.paths: Optional[re.Pattern] = re.compile('|'.join(re.escape(x) for x in paths)) if paths else None
+        self.max_path_len = max((len(x) for x in paths), default=0)
+        self.extensions = set(extensions)
+        self.containers = set(containers)
+        self.documents = set(documents)
+        self.__dir_cache: Dict[str, bool] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # the cache is not transferred to a worker process
+        state = self.__dict__.copy()
+        state["_PathMatcher__dir_cache"] = {}
+        return state
+
+    @staticmethod
+    def is_prefix_pattern(pattern: re.Pattern) -> bool:
+        """Checks whether match of the pattern for a text means the match for any continuation of the text"""
+        return not any(x in pattern.pattern for x in ("$", "\\Z", "(?=", "(?!", "(?<=", "(?<!"))
+
+    @classmethod
+    def combine_patterns(cls, patterns: List[re.Pattern]) -> List[re.Pattern]:
+        """Combines the patterns into one regex. Patterns which cannot be a part of alternation are kept as is.
+
+        Args:
+            patterns: compiled patterns
+
+        Return:
+            list of patterns - a match of any of them is the same as a match of any original pattern
+
+        """
+        alternatives = []
+        separate = []
+        for pattern in patterns:
+            flags = pattern.flags & ~re.UNICODE
+            if isinstance(pattern.pattern, str) and not flags & ~sum(cls.SCOPED_FLAGS) \
+                    and not cls.BACKREFERENCE.search(pattern.pattern):
+                scoped_flags = ''.join(v for k, v in cls.SCOPED_FLAGS.items() if flags & k)
+                alternatives.append(f"(?{scoped_flags}:{pattern.pattern})")
+            else:
+                separate.append(pattern)
+        if 1 < len(alternatives):
+            try:
+                return [re.compile('|'.join(alternatives))] + separate
+            except re.error:
+                # e.g. global flags in middle of expression or same names of groups
+                pass
+        return list(patterns)
+
+    def is_excluded_dir(self, path: str) -> bool:
+        """Checks whether all files in the directory are excluded with paths or patterns.
+
+        Args:
+            path: path of the directory with trailing slash
+
+        Return:
+            True when any file of the directory is excluded
+
+        """
+        result = self.__dir_cache.get(path)
+        if result is None:
+            lower_path = path.lower()
+            result = bool(self.paths is not None and self.paths.search(path)) \
+                or any(x.match(lower_path) for x in self.dir_patterns)
+            if self.DIR_CACHE_SIZE <= len(self.__dir_cache):
+                self.__dir_cache.clear()
+            self.__dir_cache[path] = result
+        return result
+
+    def is_excluded_file(self, path: str, depth: int, doc: bool) -> bool:
+        """Checks whether the file is excluded.
+
+        Args:
+            path: path of the file
+            depth: depth of scan from config - containers are scanned when it is set
+            doc: doc mode from config - documents are scanned when it or depth is set
+
+        Return:
+            True when the file should be excluded
+
+        """
+        dir_len = path.rfind('/') + 1
+        if 0 < dir_len and self.is_excluded_dir(path[:dir_len]):
+            return True
+        # substrings located in the directory path were searched already
+        if self.paths is not None and self.paths.search(path, max(0, dir_len + 1 - self.max_path_len)):
+            return True
+        lower_path = path.lower()
+        if any(x.match(lower_path) for x in self.patterns):
+            return True
+        file_extension = Util.get_extension(lower_path, lower=False)
+        if file_extension in self.extensions:
+            return True
+        if not depth and file_extension in self.containers:
+            return True
+        # --depth or --doc enables scan for all documents extensions
+        if not (depth or doc) and file_extension in self.documents:
+            return True
+        return False
@@ -1,7 +1,7 @@
 import copy
 import re
 from json.encoder import py_encode_basestring_ascii
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from credsweeper.common.constants import Severity, Confidence
 from credsweeper.config import Config
@@ -111,6 +111,29 @@ class Candidate:
             reported_output = full_output
         return reported_output
 
+    @classmethod
+    def from_json(cls, config: Config, candidate_dict: Dict) -> "Candidate":
+        """Restores credential candidate from a json report e.g. to merge reports of several scans
+
+        Args:
+            config: user configs
+            candidate_dict: dictionary which was obtained with to_json() without hashing
+
+        Return:
+            restored credential candidate
+
+        """
+        candidate = cls(
+            line_data_list=[LineData.from_json(config, x) for x in candidate_dict.get("line_data_list", [])],
+            patterns=[re.compile(x) for x in candidate_dict.get("patterns", [])],
+            rule_name=candidate_dict.get("rule", ""),
+            severity=Severity.get(candidate_dict.get("severity", "")) or Severity.INFO,
+            config=config,
+            use_ml=bool(candidate_dict.get("use_ml")),
+            confidence=Confidence.get(candidate_dict.get("confidence", "")) or Confidence.MODERATE)
+        candidate.ml_probability = candidate_dict.get("ml_probability")
+        return candidate
+
     def to_dict_list(self, hashed: bool, subtext: bool) -> List[dict]:
         """Convert credential candidate object to List[dict].
 
@@ -129,6 +152,34 @@ class Candidate:
             reported_output.append(line_data)
         return reported_output
 
+    def to_record(self) -> Tuple[Any, ...]:
+        """Compact representation for transfer between processes - the config is not included
+
+        Return:
+            tuple of records of line data and attributes of the candidate
+
+        """
+        return (tuple(x.to_record() for x in self.line_data_list), self.patterns, self.rule_name, self.severity,
+                self.use_ml, self.confidence, self.ml_probability)
+
+    @classmethod
+    def from_record(cls, config: Optional[Config], record: Tuple[Any, ...]) -> "Candidate":
+        """Restores the candidate from the record with config of current process
+
+        Args:
+            config: user configs of the process
+            record: values which were obtained with to_record()
+
+        Return:
+            restored candidate
+
+        """
+        line_data_records, patterns, rule_name, severity, use_ml, confidence, ml_probability = record
+        candidate = cls([LineData.from_record(config, x) for x in line_data_records], patterns, rule_name, severity,
+                        config, use_ml, confidence)
+        candidate.ml_probability = ml_probability
+        return candidate
+
     @classmethod
     def get_dummy_candidate(cls, config: Config, file_path: str, file_type: str, info: str, rule_name: str):
         """Create dummy instance to use in searching file by extension"""
@@ -68,7 +68,7 @@ class CredentialManager:
 
         Returns: number of removed duplicates
         """
-        candidates_dict: Dict[Tuple[str, str, str, int, int, int, int, int, int, int], Candidate] = {}
+        candidates_dict: Dict[Tuple[str, str, str, int, int, int, int, int, int, int, int], Candidate] = {}
         before = len(self.candidates)
         for i in self.candidates:
             ld = i.line_data_list[0]
@@ -77,6 +77,7 @@ class CredentialManager:
                 ld.path,  #
                 ld.info,  #
                 ld.line_pos,  #
+                ld.line_num,  #
                 ld.variable_start,  #
                 ld.variable_end,  #
                 ld.separator_start,  #
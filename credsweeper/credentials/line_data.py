@@ -1,9 +1,7 @@
-import contextlib
 import hashlib
 import re
 import string
-from functools import cached_property
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Mapping, Optional, Tuple
 
 from colorama import Fore, Style
 
@@ -49,6 +47,13 @@ class LineData:
     INITIAL_WRONG_POSITION = -3
     EXCEPTION_POSITION = -2
 
+    # the object is created for every match of a rule, so the attributes are kept in slots instead of a dictionary
+    # config must be the first - it is not included into compact records
+    __slots__ = ("config", "line", "line_pos", "line_num", "path", "file_type", "info", "pattern", "value_start",
+                 "value_end", "key", "separator", "separator_start", "separator_end", "value", "variable",
+                 "variable_start", "variable_end", "value_leftquote", "value_rightquote", "url_part", "wrap",
+                 "_3d_escaped_separator", "_is_well_quoted_value", "_is_quoted")
+
     def __init__(
             self,  #
             config: Config,  #
@@ -87,6 +92,9 @@ class LineData:
         self.url_part = False
         self.wrap = None
         self._3d_escaped_separator = False
+        # values of lazy properties
+        self._is_well_quoted_value: Optional[bool] = None
+        self._is_quoted: Optional[bool] = None
 
         self.initialize(match_obj)
 
@@ -109,32 +117,37 @@ class LineData:
         if match_obj is None:
             return
 
-        def get_group_from_match_obj(_match_obj: re.Match, group: str) -> Any:
-            with contextlib.suppress(Exception):
-                return _match_obj.group(group)
-            return None
-
-        def get_span_from_match_obj(_match_obj: re.Match, group: str) -> Tuple[int, int]:
-            with contextlib.suppress(Exception):
-                span = _match_obj.span(group)
-                return span[0], span[1]
-            return LineData.EXCEPTION_POSITION, LineData.EXCEPTION_POSITION
-
-        self.key = get_group_from_match_obj(match_obj, "keyword")
-        self.separator = get_group_from_match_obj(match_obj, "separator")
-        self.separator_start, self.separator_end = get_span_from_match_obj(match_obj, "separator")
-        self.value = get_group_from_match_obj(match_obj, "value")
-        self.value_start, self.value_end = get_span_from_match_obj(match_obj, "value")
-        self.variable = get_group_from_match_obj(match_obj, "variable")
-        self.variable_start, self.variable_end = get_span_from_match_obj(match_obj, "variable")
-        self.value_leftquote = get_group_from_match_obj(match_obj, "value_leftquote")
-        self.value_rightquote = get_group_from_match_obj(match_obj, "value_rightquote")
-        self.wrap = get_group_from_match_obj(match_obj, "wrap")
+        # absent groups are checked with the index of the pattern instead of exception handling
+        group_index = match_obj.re.groupindex
+        self.key = self._get_group(match_obj, group_index, "keyword")
+        self.separator = self._get_group(match_obj, group_index, "separator")
+        self.separator_start, self.separator_end = self._get_span(match_obj, group_index, "separator")
+        self.value = self._get_group(match_obj, group_index, "value")
+        self.value_start, self.value_end = self._get_span(match_obj, group_index, "value")
+        self.variable = self._get_group(match_obj, group_index, "variable")
+        self.variable_start, self.variable_end = self._get_span(match_obj, group_index, "variable")
+        self.value_leftquote = self._get_group(match_obj, group_index, "value_leftquote")
+        self.value_rightquote = self._get_group(match_obj, group_index, "value_rightquote")
+        self.wrap = self._get_group(match_obj, group_index, "wrap")
         # percent encoded '=' in url
         self._3d_escaped_separator = bool(self.separator) and "%3D" == self.separator.upper()
         self.sanitize_value()
         self.sanitize_variable()
 
+    @staticmethod
+    def _get_group(match_obj: re.Match, group_index: Mapping[str, int], group: str) -> Any:
+        """Returns the group of the match or None if the pattern has no such group"""
+        if group in group_index:
+            return match_obj.group(group)
+        return None
+
+    @staticmethod
+    def _get_span(match_obj: re.Match, group_index: Mapping[str, int], group: str) -> Tuple[int, int]:
+        """Returns the span of the group or EXCEPTION_POSITION if the pattern has no such group"""
+        if group in group_index:
+            return match_obj.span(group)
+        return LineData.EXCEPTION_POSITION, LineData.EXCEPTION_POSITION
+
     def sanitize_value(self):
         """Clean found value from extra artifacts. Correct positions if changed."""
         if self.variable and self.value and not self.is_well_quoted_value:
@@ -242,9 +255,15 @@ class LineData:
                 return True
         return False
 
-    @cached_property
+    @property
     def is_well_quoted_value(self) -> bool:
-        """Well quoted value - means the value has been quoted or has line wrap"""
+        """Well quoted value - means the value has been quoted or has line wrap. Calculated once on demand"""
+        if self._is_well_quoted_value is None:
+            self._is_well_quoted_value = self._get_well_quoted_value()
+        return self._is_well_quoted_value
+
+    def _get_well_quoted_value(self) -> bool:
+        """Checks whether the value has been quoted or has line wrap"""
         result = False
         if self.value_leftquote and self.value_rightquote:
             if self.value_leftquote == self.value_rightquote:
@@ -284,14 +303,20 @@ class LineData:
 
         return result
 
-    @cached_property
+    @property
     def is_quoted(self) -> bool:
-        """Check if variable and value in a quoted string.
+        """Check if variable and value in a quoted string. Calculated once on demand.
 
         Return:
             True if candidate in a quoted string, False otherwise
 
         """
+        if self._is_quoted is None:
+            self._is_quoted = self._get_quoted()
+        return self._is_quoted
+
+    def _get_quoted(self) -> bool:
+        """Checks whether variable and value are in a quoted string"""
         left_quote = None
         if 0 < self.variable_start:
             for i in self.line[:self.variable_start]:
@@ -398,6 +423,8 @@ class LineData:
             "line": self.get_hash_or_subtext(self.line, hashed, cut_pos),
             "line_num": self.line_num,
             "path": self.path,
+            # type of a member of an archive differs from extension of the path
+            "file_type": self.file_type,
             # info may contain variable name - so let it be hashed if requested
             "info": self.get_hash_or_subtext(self.info, hashed),
             "pattern": self.pattern.pattern,
@@ -417,6 +444,66 @@ class LineData:
         reported_output = {k: v for k, v in full_output.items() if k in self.config.line_data_output}
         return reported_output
 
+    def to_record(self) -> Tuple[Any, ...]:
+        """Compact representation for transfer between processes - the config is not included
+
+        Return:
+            tuple of values of slots except config
+
+        """
+        return tuple(getattr(self, x) for x in self.__slots__[1:])
+
+    @classmethod
+    def from_record(cls, config: Config, record: Tuple[Any, ...]) -> "LineData":
+        """Restores line data from the record without repeated initialization
+
+        Args:
+            config: user configs of the process
+            record: values which were obtained with to_record()
+
+        Return:
+            restored line data
+
+        """
+        line_data = cls.__new__(cls)
+        line_data.config = config
+        for slot, value in zip(cls.__slots__[1:], record):
+            setattr(line_data, slot, value)
+        return line_data
+
+    @classmethod
+    def from_json(cls, config: Config, line_data_dict: Mapping[str, Any]) -> "LineData":
+        """Restores line data from a json report without repeated initialization
+
+        Args:
+            config: user configs
+            line_data_dict: dictionary which was obtained with to_json() without hashing
+
+        Return:
+            restored line data - fields which are absent in the report are set as in unmatched line data
+
+        """
+        line_data = cls.__new__(cls)
+        line_data.config = config
+        for slot in cls.__slots__[1:]:
+            setattr(line_data, slot, line_data_dict.get(slot))
+        for slot in ("value_start", "value_end", "separator_start", "separator_end", "variable_start", "variable_end"):
+            if getattr(line_data, slot) is None:
+                setattr(line_data, slot, LineData.INITIAL_WRONG_POSITION)
+        line_data.line = line_data_dict.get("line") or ""
+        line_data.line_pos = line_data_dict.get("line_pos", -1)
+        line_data.line_num = line_data_dict.get("line_num", -1)
+        line_data.path = line_data_dict.get("path") or ""
+        file_type = line_data_dict.get("file_type")
+        line_data.file_type = file_type if isinstance(file_type, str) else Util.get_extension(line_data.path)
+        line_data.info = line_data_dict.get("info") or ""
+        # the pattern is not used after the initialization, so a dummy pattern is applied for absent one
+        pattern = line_data_dict.get("pattern")
+        line_data.pattern = re.compile(pattern if isinstance(pattern, str) else "^")
+        line_data.url_part = False
+        line_data._3d_escaped_separator = False
+        return line_data
+
     def get_colored_line(self, hashed: bool, subtext: bool = False) -> str:
         """Represents the LineData with a value, separator, and variable color formatting"""
         if hashed:
@@ -1,11 +1,15 @@
 import datetime
 import logging
-from typing import List, Optional, Any, Tuple, Union
+import os
+from tarfile import TarFile
+from typing import List, Optional, Any, Tuple, Union, Sequence
+from zipfile import ZipFile
 
 from credsweeper.common.constants import RECURSIVE_SCAN_LIMITATION
 from credsweeper.config import Config
 from credsweeper.credentials import Candidate
 from credsweeper.credentials.augment_candidates import augment_candidates
+from credsweeper.file_handler.archive_content_provider import ArchiveContentProvider
 from credsweeper.file_handler.byte_content_provider import ByteContentProvider
 from credsweeper.file_handler.content_provider import ContentProvider
 from credsweeper.file_handler.data_content_provider import DataContentProvider
@@ -57,6 +61,9 @@ class DeepScanner(
 ):  # yapf: disable
     """Advanced scanner with recursive exploring of data"""
 
+    # size of data which is enough to recognize zip or tar archive
+    ARCHIVE_HEAD_SIZE = 512
+
     def __init__(self, config: Config, scanner: Scanner) -> None:
         """Initialize Advanced credential scanner.
 
@@ -146,6 +153,93 @@ class DeepScanner(
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
+    def get_shards(self, content_provider: ContentProvider, shard_size: int) -> Sequence[ContentProvider]:
+        """Splits members of a large zip or tar archive file into shards which are scanned independently.
+
+        Members of an archive are scanned with own limits and info, so results of the shards are the same as for
+        whole archive. Only an archive which is scanned with the single deep scanner is split.
+
+        Args:
+            content_provider: provider of a file
+            shard_size: minimal total size of members in a shard
+
+        Return:
+            list of providers to scan instead of the provider, the provider itself when it cannot be split
+
+        """
+        if not isinstance(content_provider, TextContentProvider) or not os.path.isfile(content_provider.file_path):
+            return [content_provider]
+        try:
+            with open(content_provider.file_path, "rb") as f:
+                deep_scanners, _ = self.get_deep_scanners(f.read(self.ARCHIVE_HEAD_SIZE), content_provider.file_type,
+                                                          self.config.depth)
+                f.seek(0)
+                if [ZipScanner] == deep_scanners:
+                    with ZipFile(f) as zf:
+                        sizes = [0 if x.is_dir() else x.file_size for x in zf.infolist()]
+                elif [TarScanner] == deep_scanners:
+                    with TarFile(fileobj=f) as tf:
+                        sizes = [x.size if x.isreg() else 0 for x in tf.getmembers()]
+                else:
+                    return [content_provider]
+        except Exception as exc:
+            logger.debug(f"{content_provider.file_path} is not split: {exc}")
+            return [content_provider]
+        shards: List[ContentProvider] = []
+        start = shard_total = 0
+        for n, size in enumerate(sizes, start=1):
+            shard_total += size
+            if shard_size <= shard_total or len(sizes) == n:
+                shards.append(
+                    ArchiveContentProvider(file_path=content_provider.file_path,
+                                           file_type=content_provider.file_type,
+                                           info=content_provider.info,
+                                           members=range(start, n),
+                                           size=shard_total))
+                start, shard_total = n, 0
+        if 1 < len(shards):
+            logger.debug(f"{content_provider.file_path} is split into {len(shards)} shards")
+            return shards
+        return [content_provider]
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def archive_scan(
+            self,  #
+            content_provider: ArchiveContentProvider,  #
+            depth: int,  #
+            recursive_limit_size: int) -> List[Candidate]:
+        """Scans the shard of an archive file like whole archive is scanned with `scan`
+
+            Args:
+                content_provider: ArchiveContentProvider with range of members
+                depth: maximal level of recursion
+                recursive_limit_size: maximal bytes of opened files to prevent recursive zip-bomb attack
+
+            Returns: list with candidates
+        """
+        info = content_provider.info or "FILE"
+        try:
+            # the limit is reduced with size of whole archive as the data is read
+            recursive_limit_size -= os.path.getsize(content_provider.file_path)
+            with open(content_provider.file_path, "rb") as f:
+                deep_scanners, _ = self.get_deep_scanners(f.read(self.ARCHIVE_HEAD_SIZE), content_provider.file_type,
+                                                          depth)
+                f.seek(0)
+                if ZipScanner in deep_scanners:
+                    with ZipFile(f) as zf:
+                        return self.zip_scan(zf, content_provider.file_path, info, depth, recursive_limit_size,
+                                             content_provider.members)
+                if TarScanner in deep_scanners:
+                    with TarFile(fileobj=f) as tf:
+                        return self.tar_scan(tf, content_provider.file_path, info, depth, recursive_limit_size,
+                                             content_provider.members)
+        except Exception as exc:
+            logger.error(f"{content_provider.file_path}:{exc}")
+        return []
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
     def deep_scan_with_fallback(self, data_provider: DataContentProvider, depth: int,
                                 recursive_limit_size: int) -> List[Candidate]:
         """Scans with deep scanners and fallback scanners if possible
@@ -196,6 +290,8 @@ class DeepScanner(
                                                                   int) else RECURSIVE_SCAN_LIMITATION
         candidates: List[Candidate] = []
         data: Optional[bytes] = None
+        if isinstance(content_provider, ArchiveContentProvider):
+            return self.archive_scan(content_provider, depth, recursive_limit_size)
         if isinstance(content_provider, TextContentProvider) or isinstance(content_provider, ByteContentProvider):
             # Feature to scan files which might be containers
             data = content_provider.data
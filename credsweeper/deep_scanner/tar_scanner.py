@@ -23,29 +23,55 @@ class TarScanner(AbstractScanner, ABC):
             recursive_limit_size: int) -> Optional[List[Candidate]]:
         """Extracts files one by one from tar archive and launches data_scan"""
         try:
-            candidates = []
             with TarFile(fileobj=io.BytesIO(data_provider.data)) as tf:
-                for tfi in tf.getmembers():
-                    # skip directory
-                    if not tfi.isreg():
-                        continue
-                    if FilePathExtractor.check_exclude_file(self.config, tfi.name):
-                        continue
-                    if 0 > recursive_limit_size - tfi.size:
-                        logger.error(f"{tfi.name}: size {tfi.size}"
-                                     f" is over limit {recursive_limit_size} depth:{depth}")
-                        continue
-                    with tf.extractfile(tfi) as f:
-                        tar_content_provider = DataContentProvider(data=f.read(),
-                                                                   file_path=data_provider.file_path,
-                                                                   file_type=Util.get_extension(tfi.name),
-                                                                   info=f"{data_provider.info}|TAR:{tfi.name}")
-                        # Nevertheless, use extracted data size
-                        new_limit = recursive_limit_size - len(tar_content_provider.data)
-                        tar_candidates = self.recursive_scan(tar_content_provider, depth, new_limit)
-                        candidates.extend(tar_candidates)
-            return candidates
+                return self.tar_scan(tf, data_provider.file_path, data_provider.info, depth, recursive_limit_size)
         except Exception as tar_exc:
             # too many exception types might be produced with broken tar
             logger.error(f"{data_provider.file_path}:{tar_exc}")
         return None
+
+    def tar_scan(
+            self,  #
+            tf: TarFile,  #
+            file_path: str,  #
+            info: str,  #
+            depth: int,  #
+            recursive_limit_size: int,  #
+            members: Optional[range] = None) -> List[Candidate]:
+        """Scans members of opened tar archive
+
+        Args:
+            tf: opened tar archive
+            file_path: path of the archive file
+            info: information about the archive which is extended with names of members
+            depth: maximal level of recursion
+            recursive_limit_size: maximal bytes of opened files to prevent recursive zip-bomb attack
+            members: optional positions of members to scan instead of all members
+
+        Return:
+            list of candidates from the members
+
+        """
+        candidates = []
+        for n, tfi in enumerate(tf.getmembers()):
+            if members is not None and n not in members:
+                continue
+            # skip directory
+            if not tfi.isreg():
+                continue
+            if FilePathExtractor.check_exclude_file(self.config, tfi.name):
+                continue
+            if 0 > recursive_limit_size - tfi.size:
+                logger.error(f"{tfi.name}: size {tfi.size}"
+                             f" is over limit {recursive_limit_size} depth:{depth}")
+                continue
+            with tf.extractfile(tfi) as f:
+                tar_content_provider = DataContentProvider(data=f.read(),
+                                                           file_path=file_path,
+                                                           file_type=Util.get_extension(tfi.name),
+                                                           info=f"{info}|TAR:{tfi.name}")
+                # Nevertheless, use extracted data size
+                new_limit = recursive_limit_size - len(tar_content_provider.data)
+                tar_candidates = self.recursive_scan(tar_content_provider, depth, new_limit)
+                candidates.extend(tar_candidates)
+        return candidates
@@ -1,8 +1,11 @@
+import collections
 import io
+import itertools
 import logging
 from abc import ABC
-from typing import List, Optional
-from zipfile import ZipFile
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import List, Optional, Generator, Tuple, Deque
+from zipfile import ZipFile, ZipInfo
 
 from credsweeper.credentials import Candidate
 from credsweeper.deep_scanner.abstract_scanner import AbstractScanner
@@ -16,6 +19,11 @@ logger = logging.getLogger(__name__)
 class ZipScanner(AbstractScanner, ABC):
     """Implements zip scanning"""
 
+    # members are inflated in threads ahead of the scan, because zlib, bz2 and lzma release GIL
+    INFLATE_THREADS = 4
+    # minimal compressed size of members when the threads are used
+    INFLATE_THREADS_SIZE = 1 << 20
+
     def data_scan(
             self,  #
             data_provider: DataContentProvider,  #
@@ -23,29 +31,81 @@ class ZipScanner(AbstractScanner, ABC):
             recursive_limit_size: int) -> Optional[List[Candidate]]:
         """Extracts files one by one from zip archives and launches data_scan"""
         try:
-            candidates = []
             with ZipFile(io.BytesIO(data_provider.data)) as zf:
-                for zfl in zf.infolist():
-                    # skip directory
-                    if zfl.is_dir():
-                        continue
-                    if FilePathExtractor.check_exclude_file(self.config, zfl.filename):
-                        continue
-                    if 0 > recursive_limit_size - zfl.file_size:
-                        logger.error(f"{zfl.filename}: size {zfl.file_size}"
-                                     f" is over limit {recursive_limit_size} depth:{depth}")
-                        continue
-                    with zf.open(zfl) as f:
-                        zip_content_provider = DataContentProvider(data=f.read(),
-                                                                   file_path=data_provider.file_path,
-                                                                   file_type=Util.get_extension(zfl.filename),
-                                                                   info=f"{data_provider.info}|ZIP:{zfl.filename}")
-                        # nevertheless use extracted data size
-                        new_limit = recursive_limit_size - len(zip_content_provider.data)
-                        zip_candidates = self.recursive_scan(zip_content_provider, depth, new_limit)
-                        candidates.extend(zip_candidates)
-            return candidates
+                return self.zip_scan(zf, data_provider.file_path, data_provider.info, depth, recursive_limit_size)
         except Exception as zip_exc:
             # too many exception types might be produced with broken zip
             logger.error(f"{data_provider.file_path}:{zip_exc}")
         return None
+
+    def zip_scan(
+            self,  #
+            zf: ZipFile,  #
+            file_path: str,  #
+            info: str,  #
+            depth: int,  #
+            recursive_limit_size: int,  #
+            members: Optional[range] = None) -> List[Candidate]:
+        """Scans members of opened zip archive
+
+        Args:
+            zf: opened zip archive
+            file_path: path of the archive file
+            info: information about the archive which is extended with names of members
+            depth: maximal level of recursion
+            recursive_limit_size: maximal bytes of opened files to prevent recursive zip-bomb attack
+            members: optional positions of members to scan instead of all members
+
+        Return:
+            list of candidates from the members
+
+        """
+        zip_infos: List[ZipInfo] = []
+        for n, zfl in enumerate(zf.infolist()):
+            if members is not None and n not in members:
+                continue
+            # skip directory
+            if zfl.is_dir():
+                continue
+            if FilePathExtractor.check_exclude_file(self.config, zfl.filename):
+                continue
+            if 0 > recursive_limit_size - zfl.file_size:
+                logger.error(f"{zfl.filename}: size {zfl.file_size}"
+                             f" is over limit {recursive_limit_size} depth:{depth}")
+                continue
+            zip_infos.append(zfl)
+        candidates = []
+        for zfl, data in self.yield_inflated(zf, zip_infos):
+            zip_content_provider = DataContentProvider(data=data,
+                                                       file_path=file_path,
+                                                       file_type=Util.get_extension(zfl.filename),
+                                                       info=f"{info}|ZIP:{zfl.filename}")
+            # nevertheless use extracted data size
+            new_limit = recursive_limit_size - len(data)
+            zip_candidates = self.recursive_scan(zip_content_provider, depth, new_limit)
+            candidates.extend(zip_candidates)
+        return candidates
+
+    @classmethod
+    def yield_inflated(cls, zf: ZipFile, zip_infos: List[ZipInfo]) -> Generator[Tuple[ZipInfo, bytes], None, None]:
+        """Yields members with data in order of the list.
+
+        Members of large archives are inflated in INFLATE_THREADS threads while previous members are scanned.
+        Amount of inflated members in advance is limited to keep the memory bounded.
+
+        """
+        if 1 >= cls.INFLATE_THREADS or 1 >= len(zip_infos) \
+                or cls.INFLATE_THREADS_SIZE > sum(x.compress_size for x in zip_infos):
+            for zfl in zip_infos:
+                yield zfl, zf.read(zfl)
+            return
+        zip_infos_iter = iter(zip_infos)
+        with ThreadPoolExecutor(max_workers=cls.INFLATE_THREADS, thread_name_prefix="inflate") as executor:
+            # opened zip file is shared between threads with a lock
+            pending: Deque[Tuple[ZipInfo, Future]] = collections.deque(
+                (x, executor.submit(zf.read, x)) for x in itertools.islice(zip_infos_iter, 2 * cls.INFLATE_THREADS))
+            while pending:
+                zfl, future = pending.popleft()
+                if next_zfl := next(zip_infos_iter, None):
+                    pending.append((next_zfl, executor.submit(zf.read, next_zfl)))
+                yield zfl, future.result()
@@ -1,15 +1,21 @@
+from credsweeper.file_handler.archive_content_provider import ArchiveContentProvider
 from credsweeper.file_handler.byte_content_provider import ByteContentProvider
 from credsweeper.file_handler.content_provider import ContentProvider
 from credsweeper.file_handler.data_content_provider import DataContentProvider
 from credsweeper.file_handler.diff_content_provider import DiffContentProvider
+from credsweeper.file_handler.shard_content_provider import ShardContentProvider
+from credsweeper.file_handler.streaming_text_content_provider import StreamingTextContentProvider
 from credsweeper.file_handler.string_content_provider import StringContentProvider
 from credsweeper.file_handler.text_content_provider import TextContentProvider
 
 __all__ = [
+    'ArchiveContentProvider',  #
     'ByteContentProvider',  #
     'ContentProvider',  #
     'DataContentProvider',  #
     'DiffContentProvider',  #
+    'ShardContentProvider',  #
+    'StreamingTextContentProvider',  #
     'StringContentProvider',  #
     'TextContentProvider',  #
 ]
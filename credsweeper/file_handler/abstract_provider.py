@@ -1,7 +1,7 @@
 import io
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Union, Tuple, Sequence
+from typing import Union, Tuple, Sequence, Generator
 
 from credsweeper.config import Config
 from credsweeper.file_handler.diff_content_provider import DiffContentProvider
@@ -42,3 +42,16 @@ class AbstractProvider(ABC):
 
         """
         raise NotImplementedError()
+
+    def yield_scannable_files(self,
+                              config: Config) -> Generator[Union[DiffContentProvider, TextContentProvider], None, None]:
+        """Yields file objects for analysis as soon as they are found, so the scan may start before the search ends.
+
+        Args:
+            config: dict of credsweeper configuration
+
+        Return:
+            generator of file objects to analyse
+
+        """
+        yield from self.get_scannable_files(config)
@@ -1,17 +1,25 @@
-from functools import cached_property
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
 from credsweeper.file_handler.descriptor import Descriptor
 
 
 class AnalysisTarget:
-    """AnalysisTarget"""
+    """AnalysisTarget
+
+    Compact object without instance dictionary - one target is created per each line of a file.
+    Derived values of the line are computed on first access and kept in slots.
+    Plain numeration of lines is implicit when line_nums is None.
+
+    """
+
+    __slots__ = ("__line_pos", "__lines", "__line_nums", "__descriptor", "__line", "__offset", "__line_strip",
+                 "__line_lower", "__line_lower_strip")
 
     def __init__(
         self,
         line_pos: int,
         lines: List[str],
-        line_nums: List[int],
+        line_nums: Optional[Sequence[int]],
         descriptor: Descriptor,
         line: Optional[str] = None,
         offset: Optional[int] = None,
@@ -20,91 +28,100 @@ class AnalysisTarget:
         self.__lines = lines
         self.__line_nums = line_nums
         self.__descriptor = descriptor
-        self.__line = line
+        # when the line is given - it is a chunk of original line
+        self.__line: str = lines[line_pos] if line is None else line
         self.__offset = offset
+        self.__line_strip: Optional[str] = None
+        self.__line_lower: Optional[str] = None
+        self.__line_lower_strip: Optional[str] = None
 
-    @cached_property
+    @property
     def offset(self) -> Optional[int]:
-        """cached value"""
+        """offset getter"""
         # when the offset is not None - it means that original line was split into chunks
         return self.__offset
 
-    @cached_property
+    @property
     def line(self) -> str:
-        """cached value"""
-        if self.__line is None:
-            # normal target
-            return self.__lines[self.__line_pos]
-        else:
-            # chunked target
-            return self.__line
-
-    @cached_property
+        """line getter"""
+        return self.__line
+
+    @property
     def line_len(self) -> int:
-        """cached value"""
-        return len(self.line)
+        """length of the line"""
+        return len(self.__line)
 
-    @cached_property
+    @property
     def line_strip(self) -> str:
         """cached value"""
-        return self.line.strip()
+        if self.__line_strip is None:
+            self.__line_strip = self.__line.strip()
+        return self.__line_strip
 
-    @cached_property
+    @property
     def line_strip_len(self) -> int:
-        """cached value"""
+        """length of the stripped line"""
         return len(self.line_strip)
 
-    @cached_property
+    @property
     def line_lower(self) -> str:
         """cached value"""
-        return self.line.lower()
+        if self.__line_lower is None:
+            self.__line_lower = self.__line.lower()
+        return self.__line_lower
 
-    @cached_property
+    @property
     def line_lower_strip(self) -> str:
         """cached value"""
-        return self.line_lower.strip()
+        if self.__line_lower_strip is None:
+            self.__line_lower_strip = self.line_lower.strip()
+        return self.__line_lower_strip
 
-    @cached_property
+    @property
     def lines(self) -> List[str]:
-        """cached value"""
+        """lines getter"""
         return self.__lines
 
-    @cached_property
+    @property
     def lines_len(self) -> int:
-        """cached value"""
+        """amount of the lines"""
         return len(self.__lines)
 
-    @cached_property
+    @property
     def line_pos(self) -> int:
-        """cached value"""
+        """line_pos getter"""
         return self.__line_pos
 
-    @cached_property
+    @property
     def line_num(self) -> int:
-        """cached value"""
+        """number of the line in original file"""
+        if self.__line_nums is None:
+            return 1 + self.__line_pos
         return self.__line_nums[self.__line_pos]
 
-    @cached_property
-    def line_nums(self) -> List[int]:
-        """cached value"""
+    @property
+    def line_nums(self) -> Sequence[int]:
+        """numbers of the lines - plain numeration is returned as range without allocation of a list"""
+        if self.__line_nums is None:
+            return range(1, 1 + len(self.__lines))
         return self.__line_nums
 
-    @cached_property
+    @property
     def file_path(self) -> Optional[str]:
-        """cached value"""
+        """file_path getter"""
         return self.__descriptor.path
 
-    @cached_property
+    @property
     def file_type(self) -> Optional[str]:
-        """cached value"""
+        """file_type getter"""
         return self.__descriptor.extension
 
-    @cached_property
+    @property
     def info(self) -> Optional[str]:
-        """cached value"""
+        """info getter"""
         return self.__descriptor.info
 
-    @cached_property
+    @property
     def descriptor(self) -> Descriptor:
-        """cached value"""
+        """descriptor getter"""
         return self.__descriptor
@@ -0,0 +1,67 @@
+import logging
+from functools import cached_property
+from typing import Optional, Generator
+
+from credsweeper.file_handler.analysis_target import AnalysisTarget
+from credsweeper.file_handler.content_provider import ContentProvider
+from credsweeper.utils import Util
+
+logger = logging.getLogger(__name__)
+
+
+class ArchiveContentProvider(ContentProvider):
+    """Provides a range of members of a large archive file, so members of the archive are deep scanned in parallel.
+
+    The members are selected by positions in the list of members of the archive. The archive has no text lines,
+    so the provider is used only for deep scan.
+
+    """
+
+    def __init__(
+            self,  #
+            file_path: str,  #
+            file_type: Optional[str],  #
+            info: Optional[str],  #
+            members: range,  #
+            size: int) -> None:
+        """
+        Parameters:
+            members: positions of members in the archive to scan
+            size: total size of the members
+
+        """
+        super().__init__(file_path=file_path, file_type=file_type, info=info)
+        self.__members = members
+        self.__size = size
+
+    @cached_property
+    def members(self) -> range:
+        """members getter"""
+        return self.__members
+
+    @cached_property
+    def size(self) -> int:
+        """total size of the members"""
+        return self.__size
+
+    @cached_property
+    def data(self) -> Optional[bytes]:
+        """data RO getter for ArchiveContentProvider - whole archive"""
+        return Util.read_data(self.file_path)
+
+    def free(self) -> None:
+        """free data after scan to reduce memory usage"""
+        if hasattr(self, "data"):
+            delattr(self, "data")
+
+    def yield_analysis_target(self, min_len: int) -> Generator[AnalysisTarget, None, None]:
+        """The archive has no lines to scan without deep scan.
+
+        Args:
+            min_len: minimal line length to scan
+
+        Return:
+            empty generator
+
+        """
+        return self.lines_to_targets(min_len, [])
@@ -1,8 +1,9 @@
 from functools import cached_property
-from typing import List, Optional, Generator
+from typing import List, Optional, Generator, Sequence
 
 from credsweeper.file_handler.analysis_target import AnalysisTarget
 from credsweeper.file_handler.content_provider import ContentProvider
+from credsweeper.file_handler.shard_content_provider import ShardContentProvider
 from credsweeper.utils import Util
 
 
@@ -45,6 +46,12 @@ class ByteContentProvider(ContentProvider):
             self.__lines = Util.decode_bytes(self.__data)
         return self.__lines if self.__lines is not None else []
 
+    def get_shards(self, shard_size: int, lines_before: int, lines_after: int) -> Sequence[ContentProvider]:
+        """Splits large content into shards of lines"""
+        if self.__data is None:
+            return [self]
+        return ShardContentProvider.split(self, self.__data, shard_size, lines_before, lines_after) or [self]
+
     def yield_analysis_target(self, min_len: int) -> Generator[AnalysisTarget, None, None]:
         """Return lines to scan.
 
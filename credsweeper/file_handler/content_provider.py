@@ -1,7 +1,7 @@
 import logging
 from abc import ABC, abstractmethod
 from functools import cached_property
-from typing import List, Optional, Generator
+from typing import List, Optional, Generator, Sequence
 
 from credsweeper.common.constants import MAX_LINE_LENGTH
 from credsweeper.file_handler.analysis_target import AnalysisTarget
@@ -64,6 +64,28 @@ class ContentProvider(ABC):
         """info getter"""
         return self.__descriptor.info
 
+    @cached_property
+    def size(self) -> int:
+        """estimated size of the content in bytes, 0 when unknown"""
+        return 0
+
+    def get_shards(self, shard_size: int, lines_before: int, lines_after: int) -> Sequence["ContentProvider"]:
+        """Splits the content into shards of lines which may be scanned independently.
+
+        Args:
+            shard_size: minimal size of a shard in bytes
+            lines_before: amount of lines before a shard which are required for multiline scan
+            lines_after: amount of lines after a shard which are required for multiline scan
+
+        Return:
+            list of providers to scan instead of the provider, the provider itself when the content cannot be split
+
+        """
+        return [self]
+
+    def prefetch(self) -> None:
+        """Reads the data in advance, e.g. in a thread while previous content is scanned. Does nothing by default"""
+
     @cached_property
     @abstractmethod
     def data(self) -> Optional[bytes]:
@@ -79,17 +101,15 @@ class ContentProvider(ABC):
             self,  #
             min_len: int,
             lines: List[str],  #
-            line_nums: Optional[List[int]] = None) -> Generator[AnalysisTarget, None, None]:
+            line_nums: Optional[Sequence[int]] = None) -> Generator[AnalysisTarget, None, None]:
         """Creates list of targets with multiline concatenation"""
-        lines_range = range(len(lines))
-        if line_nums is None or len(line_nums) != len(lines):
-            if line_nums is not None:
-                logger.warning(
-                    f"line numerations {len(line_nums)} does not match lines {len(lines)}. Plain numeration applied")
-            line_nums = [1 + x for x in lines_range]
-
-        for line_pos in lines_range:
-            line = lines[line_pos]
+        if line_nums is not None and len(line_nums) != len(lines):
+            logger.warning(
+                f"line numerations {len(line_nums)} does not match lines {len(lines)}. Plain numeration applied")
+            line_nums = None
+        # plain numeration is implicit in targets when line_nums is None
+        descriptor = self.descriptor
+        for line_pos, line in enumerate(lines):
             if min_len > len(line.strip()):
                 # Ignore target if stripped part is too short for all types
                 continue
@@ -99,10 +119,10 @@ class ContentProvider(ABC):
                         line_pos=line_pos,  #
                         lines=lines,  #
                         line_nums=line_nums,  #
-                        descriptor=self.descriptor,  #
+                        descriptor=descriptor,  #
                         line=line[chunk_start:chunk_end],  #
                         offset=chunk_start)
                     yield target
             else:
-                target = AnalysisTarget(line_pos, lines, line_nums, self.descriptor)
+                target = AnalysisTarget(line_pos, lines, line_nums, descriptor)
                 yield target
@@ -46,6 +46,11 @@ class DiffContentProvider(ContentProvider):
         """diff getter for DiffContentProvider"""
         return self.__diff
 
+    @cached_property
+    def size(self) -> int:
+        """size of the changed lines"""
+        return sum(len(x["line"]) for x in self.__diff) if self.__diff else 0
+
     def free(self) -> None:
         """free data after scan to reduce memory usage"""
         self.__diff = None
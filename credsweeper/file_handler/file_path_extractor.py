@@ -1,14 +1,16 @@
+import functools
 import io
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Union, Tuple
+from typing import List, Dict, Union, Tuple, Optional, Generator, Any, Sequence, Set, Callable
 
 from git import InvalidGitRepositoryError, NoSuchPathError, Repo
 
 from credsweeper.common.constants import MIN_DATA_LEN
 from credsweeper.config import Config
-from credsweeper.utils import Util
+from credsweeper.file_handler.git_ignore_checker import GitIgnoreChecker
 
 logger = logging.getLogger(__name__)
 
@@ -18,10 +20,28 @@ class FilePathExtractor:
 
     FIND_BY_EXT_RULE = "Suspicious File Extension"
     located_repos: Dict[Path, Repo] = {}
+    # nearest repository of visited directories, None for a directory outside of repositories
+    located_dirs: Dict[Path, Optional[Repo]] = {}
+    # one session of git check-ignore per working tree
+    ignore_checkers: Dict[Path, GitIgnoreChecker] = {}
+    # repositories of parent process may own git processes, so they are kept untouched in a forked process
+    inherited_repos: List[Dict[Path, Any]] = []
 
-    @staticmethod
-    def apply_gitignore(detected_files: List[str]) -> List[str]:
-        """Apply gitignore rules for each file.
+    @classmethod
+    def forget_located_repos(cls) -> None:
+        """Starts new cache of located repositories in a forked process.
+
+        Repositories of the parent process are not released to avoid termination of its git processes by finalizers.
+
+        """
+        cls.inherited_repos.extend([cls.located_repos, cls.located_dirs, cls.ignore_checkers])
+        cls.located_repos = {}
+        cls.located_dirs = {}
+        cls.ignore_checkers = {}
+
+    @classmethod
+    def apply_gitignore(cls, detected_files: List[str]) -> List[str]:
+        """Apply gitignore rules for each file. Files of one directory are checked at once.
 
         Args:
             detected_files: list of files to be checked
@@ -30,7 +50,14 @@ class FilePathExtractor:
             List of files with all files ignored by git removed
 
         """
-        filtered_files = [file_path for file_path in detected_files if FilePathExtractor.is_valid_path(file_path)]
+        dir_files: Dict[str, List[str]] = {}
+        for file_path in detected_files:
+            dir_files.setdefault(os.path.dirname(os.path.abspath(file_path)), []).append(file_path)
+        ignored_files: Set[str] = set()
+        for directory, file_paths in dir_files.items():
+            names = [os.path.basename(x) for x in file_paths]
+            ignored_files.update(x for x, y in zip(file_paths, cls.check_ignored(directory, names)) if y)
+        filtered_files = [file_path for file_path in detected_files if file_path not in ignored_files]
 
         return filtered_files
 
@@ -45,61 +72,199 @@ class FilePathExtractor:
         Return:
             List all non-excluded files in the directory
 
+        """
+        return list(FilePathExtractor.yield_file_paths(config, path))
+
+    @staticmethod
+    def yield_file_paths(config: Config,
+                         path: Union[str, Path],
+                         skip_ignored: bool = False,
+                         walk_threads: int = 1) -> Generator[str, None, None]:
+        """Yields files in the directory during walking, so the files may be scanned before the walking is done.
+
+        Args:
+            config: credsweeper configuration
+            path: path to the file or directory to be scanned
+            skip_ignored: skip files ignored by git - ignored directories are not walked
+            walk_threads: amount of threads to list directories
+
+        Return:
+            generator of all non-excluded files in the directory
+
         """
         path = os.path.expanduser(path)  # Replace ~ character with a full path to the home directory
         if not os.path.exists(path):
             logger.warning(f"'{path}' does not exist")
-        file_paths = []
+        if skip_ignored and not FilePathExtractor.is_valid_path(path):
+            return
         if os.path.isfile(path):
             # suppose, the file is located outside and should be scanned
             if not FilePathExtractor.check_exclude_file(config, path):
-                file_paths.append(path)
+                yield path
         elif os.path.isdir(path):
-            for dirpath, _, filenames in os.walk(path):
-                for filename in filenames:
-                    file_path = os.path.join(f"{dirpath}", f"{filename}")
-                    if FilePathExtractor.check_exclude_file(config, file_path) or os.path.islink(file_path):
-                        continue
-                    if os.path.isfile(file_path) and not FilePathExtractor.check_file_size(config, file_path):
-                        file_paths.append(file_path)
+            if FilePathExtractor.check_exclude_dir(config, path):
+                return
+            for dirpath, file_names in FilePathExtractor.walk(config, path, skip_ignored, walk_threads):
+                for filename in file_names:
+                    yield os.path.join(f"{dirpath}", f"{filename}")
         else:
             pass  # symbolic links and so on
-        return file_paths
 
-    @classmethod
-    def is_valid_path(cls, path: str) -> bool:
-        """Locate nearest .git directory to the path and check if path is ignored.
+    @staticmethod
+    def list_directory(config: Config, directory: str) -> Tuple[List[str], List[str]]:
+        """Lists the directory with os.scandir(). Types and sizes of files are taken from the directory entries.
 
         Args:
-            path: path to the file or directory to check
+            config: credsweeper configuration
+            directory: path to the directory
 
         Return:
-            False if file is ignored by git. True otherwise
+            names of files to be scanned and names of not excluded subdirectories
 
         """
-        parent_directory = Path(path).parent
+        file_names: List[str] = []
+        dir_names: List[str] = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    # symbolic links are not followed and not scanned
+                    if entry.is_symlink():
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        if not FilePathExtractor.check_exclude_dir(config, entry.path):
+                            dir_names.append(entry.name)
+                    elif entry.is_file(follow_symlinks=False) \
+                            and not FilePathExtractor.check_exclude_file(config, entry.path) \
+                            and not FilePathExtractor.check_file_size(config, entry.path,
+                                                                      entry.stat(follow_symlinks=False).st_size):
+                        file_names.append(entry.name)
+        except OSError as exc:
+            logger.warning(f"Cannot list '{directory}': {exc}")
+        return file_names, dir_names
+
+    @staticmethod
+    def walk(config: Config,
+             top: str,
+             skip_ignored: bool = False,
+             threads: int = 1) -> Generator[Tuple[str, List[str]], None, None]:
+        """Walks the directory top-down in the same order as os.walk(), excluded directories are not walked.
+
+        With several threads the subdirectories are listed in advance while files of a directory are processed,
+        which hides latency of network file systems.
+
+        Args:
+            config: credsweeper configuration
+            top: path to the directory
+            skip_ignored: skip files and directories ignored by git
+            threads: amount of threads to list directories
+
+        Return:
+            generator of paths of directories with names of their files to be scanned
+
+        """
+        executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="walk") if 1 < threads else None
+
+        def listing(directory: str) -> Callable[[], Tuple[List[str], List[str]]]:
+            """Starts the listing in a thread or postpones it"""
+            if executor is None:
+                return functools.partial(FilePathExtractor.list_directory, config, directory)
+            return executor.submit(FilePathExtractor.list_directory, config, directory).result
+
+        try:
+            # directories which wait to be walked in reverse order
+            stack = [(top, listing(top))]
+            while stack:
+                dirpath, get_listing = stack.pop()
+                file_names, dir_names = get_listing()
+                if skip_ignored and (dir_names or file_names):
+                    # subdirectories and files of the directory are checked at once
+                    ignored = FilePathExtractor.check_ignored(dirpath, dir_names + file_names)
+                    file_names = [x for x, y in zip(file_names, ignored[len(dir_names):]) if not y]
+                    # pruning of ignored subtrees
+                    dir_names = [x for x, y in zip(dir_names, ignored) if not y]
+                stack.extend((x, listing(x)) for x in reversed([os.path.join(dirpath, x) for x in dir_names]))
+                yield dirpath, file_names
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+    @classmethod
+    def locate_repo(cls, directory: Path) -> Optional[Repo]:
+        """Locate nearest repository of the directory. Results are cached for every visited directory.
 
-        # Iterate over file path to find nearest ".git" directory
-        while True:
+        Args:
+            directory: path to the directory
+
+        Return:
+            the repository or None when the directory is outside of any repository
+
+        """
+        visited_dirs = []
+        repo = None
+        # Iterate over the path to find nearest ".git" directory
+        while directory not in cls.located_dirs:
+            visited_dirs.append(directory)
             try:
-                if parent_directory in cls.located_repos:
-                    repo = cls.located_repos[parent_directory]
+                if directory in cls.located_repos:
+                    repo = cls.located_repos[directory]
                 else:
                     # The directory must have ".git" in it. If not it occurs error.
-                    repo = Repo(parent_directory)
+                    repo = Repo(directory)
 
                     # Cache already located repositories, so we would not need to load it for each new file
-                    cls.located_repos[parent_directory] = repo
-
-                # Return True if there is no ignored file in 'path' and False if any.
-                return len(repo.ignored(path)) == 0
-
+                    cls.located_repos[directory] = repo
+                break
             except (InvalidGitRepositoryError, NoSuchPathError):
-                new_parent = parent_directory.parent
+                new_parent = directory.parent
                 # If we encountered root and cannot move further: no .git directory located in the entire path
-                if new_parent == parent_directory:
-                    return True
-                parent_directory = new_parent
+                if new_parent == directory:
+                    break
+                directory = new_parent
+        else:
+            repo = cls.located_dirs[directory]
+        for visited_dir in visited_dirs:
+            cls.located_dirs[visited_dir] = repo
+        return repo
+
+    @classmethod
+    def check_ignored(cls, directory: str, names: Sequence[str]) -> List[bool]:
+        """Check whether the files or subdirectories of the directory are ignored with one request to git.
+
+        Args:
+            directory: path to the directory
+            names: names of files or subdirectories in the directory
+
+        Return:
+            list of flags in order of the names - True when the object is ignored by git
+
+        """
+        directory = os.path.abspath(directory)
+        repo = cls.locate_repo(Path(directory))
+        if repo is None or repo.working_tree_dir is None:
+            return [False] * len(names)
+        working_tree = Path(repo.working_tree_dir)
+        # e.g. directories of git itself which are located as linked worktrees
+        if not Path(os.path.realpath(directory)).is_relative_to(os.path.realpath(working_tree)):
+            return [False] * len(names)
+        checker = cls.ignore_checkers.get(working_tree)
+        if checker is None:
+            checker = GitIgnoreChecker(repo)
+            cls.ignore_checkers[working_tree] = checker
+        return checker.check([os.path.join(directory, x) for x in names])
+
+    @classmethod
+    def is_valid_path(cls, path: str) -> bool:
+        """Locate nearest .git directory to the path and check if path is ignored.
+
+        Args:
+            path: path to the file or directory to check
+
+        Return:
+            False if file is ignored by git. True otherwise
+
+        """
+        path = os.path.abspath(path)
+        return not cls.check_ignored(os.path.dirname(path), [os.path.basename(path)])[0]
 
     @staticmethod
     def is_find_by_ext_file(config: Config, extension: str) -> bool:
@@ -127,49 +292,69 @@ class FilePathExtractor:
         Return:
             True when the file full path should be excluded according config
         """
-        path = path.replace('\\', '/')
-        lower_path = path.lower()
-        if config.not_allowed_path_pattern.match(lower_path):
-            return True
-        for exclude_pattern in config.exclude_patterns:
-            if exclude_pattern.match(lower_path):
-                return True
-        for exclude_path in config.exclude_paths:
-            # must be case-sensitive
-            if exclude_path in path:
-                return True
-        file_extension = Util.get_extension(lower_path, lower=False)
-        if file_extension in config.exclude_extensions:
-            return True
-        if not config.depth and file_extension in config.exclude_containers:
-            return True
-        # --depth or --doc enables scan for all documents extensions
-        if not (config.depth or config.doc) and file_extension in config.exclude_documents:
-            return True
-        return False
+        return config.path_matcher.is_excluded_file(path.replace('\\', '/'), config.depth, config.doc)
 
     @staticmethod
-    def check_file_size(config: Config, reference: Union[str, Path, io.BytesIO, Tuple[Union[str, Path],
-                                                                                      io.BytesIO]]) -> bool:
+    def check_exclude_dir(config: Config, path: str) -> bool:
         """
-        Checks whether the file is over the size limit from configuration or less MIN_DATA_LEN
+        Checks whether all files in the directory would be excluded, so the directory may be not walked.
+
+        A path or a pattern which matches beginning of the directory path matches paths of all its files too.
+        Patterns with end of text anchors or lookarounds may behave differently, so they are not used here.
 
         Args:
             config: Config
+            path: str - path of the directory
+
+        Return:
+            True when the directory should be excluded according config
+        """
+        path = path.replace('\\', '/')
+        if not path.endswith('/'):
+            path += '/'
+        return config.path_matcher.is_excluded_dir(path)
+
+    @staticmethod
+    def get_file_size(reference: Union[str, Path, io.BytesIO, Tuple[Union[str, Path], io.BytesIO]]) -> Optional[int]:
+        """
+        Gets size of data which will be read from the reference
+
+        Args:
             reference: various types of a file reference
 
         Return:
-            True when the file is oversize or less than MIN_DATA_LEN, or unsupported
+            size in bytes from current position for io.BytesIO or size of the file, None for unsupported type
         """
         path = reference[1] if isinstance(reference, tuple) else reference
         if isinstance(path, str) or isinstance(path, Path):
-            file_size = os.path.getsize(path)
+            return os.path.getsize(path)
         elif isinstance(path, io.BytesIO):
             current_pos = path.tell()
             path.seek(0, io.SEEK_END)
             file_size = path.tell() - current_pos
             path.seek(current_pos, io.SEEK_SET)
-        else:
+            return file_size
+        return None
+
+    @staticmethod
+    def check_file_size(config: Config,
+                        reference: Union[str, Path, io.BytesIO, Tuple[Union[str, Path], io.BytesIO]],
+                        file_size: Optional[int] = None) -> bool:
+        """
+        Checks whether the file is over the size limit from configuration or less MIN_DATA_LEN
+
+        Args:
+            config: Config
+            reference: various types of a file reference
+            file_size: known size of the file, e.g. from a directory entry
+
+        Return:
+            True when the file is oversize or less than MIN_DATA_LEN, or unsupported
+        """
+        path = reference[1] if isinstance(reference, tuple) else reference
+        if file_size is None:
+            file_size = FilePathExtractor.get_file_size(path)
+        if file_size is None:
             logger.error(f"Unknown path type: {path}")
             return True
 
@@ -181,3 +366,7 @@ class FilePathExtractor:
             return True
 
         return False
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=FilePathExtractor.forget_located_repos)
@@ -1,12 +1,16 @@
 import io
 import logging
+import os
+import sys
+import zlib
 from pathlib import Path
-from typing import List, Optional, Union, Tuple, Sequence
+from typing import Optional, Union, Tuple, Sequence, Generator
 
 from credsweeper import DiffContentProvider
 from credsweeper.config import Config
 from credsweeper.file_handler.abstract_provider import AbstractProvider
 from credsweeper.file_handler.file_path_extractor import FilePathExtractor
+from credsweeper.file_handler.streaming_text_content_provider import StreamingTextContentProvider
 from credsweeper.file_handler.text_content_provider import TextContentProvider
 
 logger = logging.getLogger(__name__)
@@ -15,20 +19,67 @@ logger = logging.getLogger(__name__)
 class FilesProvider(AbstractProvider):
     """Provider of plain os files to be analysed."""
 
+    # the path is used for standard input
+    STDIN_PATH = "-"
+
     def __init__(self,
                  paths: Sequence[Union[str, Path, io.BytesIO, Tuple[Union[str, Path], io.BytesIO]]],
-                 skip_ignored: Optional[bool] = None) -> None:
+                 skip_ignored: Optional[bool] = None,
+                 shard: Optional[Tuple[int, int]] = None,
+                 walk_threads: int = 1) -> None:
         """Initialize Files Text Provider for files from 'paths'.
 
         Args:
-            paths: list of parent paths of files to scan
+            paths: list of parent paths of files to scan, "-" for standard input
                    OR tuple of path (info purpose) and io.BytesIO (reads the data from current pos)
             skip_ignored: boolean variable, Checking the directory to the list
                           of ignored directories from the gitignore file
+            shard: optional index and count of shards - only files of the shard are scanned,
+                   so the paths may be scanned on several nodes and the reports are merged
+            walk_threads: amount of threads to list directories, helps on network file systems
 
         """
         super().__init__(paths)
         self.skip_ignored = skip_ignored
+        self.shard = shard
+        self.walk_threads = walk_threads
+
+    @staticmethod
+    def get_shard_key(path: Union[str, Path], root: Union[None, str, Path] = None) -> str:
+        """Returns normalized path of a file relative to the scanned directory or to the directory of the scanned file,
+        so equivalent spellings of paths, e.g. relative and absolute ones, give the same key on every node.
+
+        Args:
+            path: path of a file
+            root: the scanned path which the file was found in
+
+        Return:
+            normalized path with forward slashes
+
+        """
+        if root is None:
+            return Path(os.path.normpath(path)).as_posix()
+        root = os.path.abspath(root)
+        base = root if os.path.isdir(root) else os.path.dirname(root)
+        return Path(os.path.relpath(os.path.abspath(path), base)).as_posix()
+
+    def is_in_shard(self, path: Union[str, Path], root: Union[None, str, Path] = None) -> bool:
+        """Checks whether the path belongs to the shard with stable hash partition of paths.
+
+        Args:
+            path: path of a file
+            root: optional scanned path which the file was found in
+
+        Return:
+            True when no sharding is used or the path belongs to the shard
+
+        """
+        if self.shard is None:
+            return True
+        index, count = self.shard
+        # crc32 of the path is the same for any process and node unlike built-in hash()
+        key = self.get_shard_key(path, root)
+        return index == zlib.crc32(key.encode(errors="surrogateescape")) % count
 
     def get_scannable_files(self, config: Config) -> Sequence[Union[DiffContentProvider, TextContentProvider]]:
         """Get list of full text file object for analysis of files with parent paths from "paths".
@@ -40,22 +91,41 @@ class FilesProvider(AbstractProvider):
             preprocessed file objects for analysis
 
         """
-        text_content_provider_list: List[Union[DiffContentProvider, TextContentProvider]] = []
+        return list(self.yield_scannable_files(config))
+
+    def yield_scannable_files(self,
+                              config: Config) -> Generator[Union[DiffContentProvider, TextContentProvider], None, None]:
+        """Yields full text file objects for analysis during walking of directories from "paths".
+
+        Args:
+            config: dict of credsweeper configuration
+
+        Return:
+            generator of preprocessed file objects for analysis
+
+        """
         for path in self.paths:
-            if isinstance(path, str) or isinstance(path, Path):
-                new_files = FilePathExtractor.get_file_paths(config, path)
-                if self.skip_ignored:
-                    new_files = FilePathExtractor.apply_gitignore(new_files)
-                for _file in new_files:
-                    text_content_provider_list.append(TextContentProvider(_file))
+            if self.STDIN_PATH == path:
+                if self.is_in_shard(path):
+                    # the stream is read by blocks without temporary files
+                    yield StreamingTextContentProvider(path, stream=sys.stdin.buffer)
+            elif isinstance(path, (str, Path)) and StreamingTextContentProvider.is_stream_path(str(path)):
+                if self.is_in_shard(path, path) and not FilePathExtractor.check_exclude_file(config, str(path)):
+                    yield StreamingTextContentProvider(str(path))
+            elif isinstance(path, str) or isinstance(path, Path):
+                for _file in FilePathExtractor.yield_file_paths(config, path, bool(self.skip_ignored),
+                                                                self.walk_threads):
+                    if self.is_in_shard(_file, path):
+                        yield TextContentProvider(_file)
             elif isinstance(path, io.BytesIO):
-                text_content_provider_list.append(TextContentProvider((":memory:", path)))
+                if self.is_in_shard(":memory:"):
+                    yield TextContentProvider((":memory:", path))
             elif isinstance(path, tuple) \
                     and (isinstance(path[0], str) or isinstance(path[0], Path)) \
                     and isinstance(path[1], io.BytesIO):
+                if not self.is_in_shard(path[0]):
+                    continue
                 # suppose, all the files must be scanned
-                text_content_provider_list.append(TextContentProvider(path))
+                yield TextContentProvider(path)
             else:
                 logger.error(f"Unknown path type: {path}")
-
-        return text_content_provider_list
@@ -0,0 +1,98 @@
+import io
+import logging
+import os
+import subprocess
+import threading
+from typing import List, Optional, Sequence
+
+from git import Repo
+from git.cmd import Git
+
+logger = logging.getLogger(__name__)
+
+
+class GitIgnoreChecker:
+    """Checks paths with one session of `git check-ignore --stdin` per repository instead of a process per path"""
+
+    # paths are written by portions, so output of git cannot overflow the pipe while the input is being written
+    PORTION_SIZE = 64
+    # verbose record of git check-ignore: source, line number, pattern and path
+    RECORD_FIELDS = 4
+    READ_SIZE = 1 << 16
+
+    def __init__(self, repo: Repo) -> None:
+        """Initialize the checker. The git process is started on first check.
+
+        Args:
+            repo: git repository with working tree
+
+        """
+        self.repo = repo
+        self.__lock = threading.Lock()
+        self.__process: Optional[Git.AutoInterrupt] = None
+        self.__fields: List[bytes] = []
+        self.__tail = b""
+
+    def __start(self) -> Git.AutoInterrupt:
+        """Starts the session of git check-ignore if it is not started yet"""
+        if self.__process is None:
+            # --non-matching gives a record for every path, so the answers are read in order of the paths
+            self.__process = self.repo.git.check_ignore("--stdin",
+                                                        "-z",
+                                                        "--verbose",
+                                                        "--non-matching",
+                                                        istream=subprocess.PIPE,
+                                                        as_process=True)
+        return self.__process
+
+    def close(self) -> None:
+        """Terminates the git process. A new session is started on next check"""
+        with self.__lock:
+            self.__close()
+
+    def __close(self) -> None:
+        # AutoInterrupt terminates the process when it is released
+        self.__process = None
+        self.__fields = []
+        self.__tail = b""
+
+    def __read_record(self, stdout: io.BufferedReader) -> List[bytes]:
+        """Reads fields of one record from output of git"""
+        while self.RECORD_FIELDS > len(self.__fields):
+            chunk = stdout.read1(self.READ_SIZE)
+            if not chunk:
+                raise EOFError("Unexpected end of git check-ignore output")
+            *fields, self.__tail = (self.__tail + chunk).split(b"\0")
+            self.__fields.extend(fields)
+        record = self.__fields[:self.RECORD_FIELDS]
+        del self.__fields[:self.RECORD_FIELDS]
+        return record
+
+    def check(self, paths: Sequence[str]) -> List[bool]:
+        """Checks whether the paths are ignored by git.
+
+        Args:
+            paths: absolute paths of files or directories in the working tree of the repository
+
+        Return:
+            list of flags in order of the paths - True when the path is ignored
+
+        """
+        result: List[bool] = []
+        with self.__lock:
+            try:
+                for i in range(0, len(paths), self.PORTION_SIZE):
+                    portion = paths[i:i + self.PORTION_SIZE]
+                    process = self.__start()
+                    process.stdin.write(b"".join(os.fsencode(x) + b"\0" for x in portion))
+                    process.stdin.flush()
+                    for _ in portion:
+                        source, _, pattern, _ = self.__read_record(process.stdout)
+                        # negative pattern is reported in verbose mode too, but the path is not ignored then
+                        result.append(bool(source) and not pattern.startswith(b"!"))
+            except (OSError, EOFError) as exc:
+                logger.error(f"Cannot check ignored paths in '{self.repo.working_tree_dir}': {exc}")
+                self.__close()
+                # the paths are scanned when the check is not possible
+                result.extend(False for _ in range(len(paths) - len(result)))
+        return result
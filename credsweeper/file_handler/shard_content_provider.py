@@ -0,0 +1,268 @@
+import contextlib
+import logging
+import mmap
+import os
+import re
+from functools import cached_property
+from typing import List, Optional, Generator, Union, BinaryIO, Tuple
+
+from credsweeper.common.constants import LATIN_1, MAX_LINE_LENGTH, UTF_8
+from credsweeper.file_handler.analysis_target import AnalysisTarget
+from credsweeper.file_handler.content_provider import ContentProvider
+from credsweeper.utils import Util
+
+logger = logging.getLogger(__name__)
+
+
+class ShardContentProvider(ContentProvider):
+    """Provides a range of lines of a large text to scan the text in parallel.
+
+    The shard keeps some lines around own range, so multiline rules and filters see the same neighbours as during scan
+    of whole text. Analysis targets are produced only for lines of own range, so shards of a text do not produce
+    the same candidates. Line numbers of the targets are absolute, but line positions are relative to the shard.
+    The shard is decoded on demand with the encoding which was detected by the beginning of the text.
+
+    """
+
+    # size of blocks which are read to find boundaries of lines
+    BLOCK_SIZE = 1 << 16
+    # line breaks which are applied in Util.decode_bytes
+    LINE_BREAK_PATTERN = re.compile(b"\r\n|\r|\n")
+
+    def __init__(
+            self,  #
+            file_path: str,  #
+            file_type: Optional[str],  #
+            info: Optional[str],  #
+            content: Optional[bytes],  #
+            offsets: Tuple[int, int, int],  #
+            line_offset: int,  #
+            core_lines: Tuple[int, int],  #
+            encoding: str = UTF_8) -> None:
+        """
+        Parameters:
+            content: bytes of the shard with lines around. The shard is read from the file when the content is None
+            offsets: start and end of the shard with lines around in the file and size of whole text
+            line_offset: position of the first line of the shard in whole text
+            core_lines: positions of the first line and after the last line of own range in lines of the shard
+            encoding: encoding of the text, latin_1 is applied when the shard cannot be decoded with the encoding
+
+        """
+        super().__init__(file_path=file_path, file_type=file_type, info=info)
+        self.__content = content
+        self.__offsets = offsets
+        self.__line_offset = line_offset
+        self.__core_lines = core_lines
+        self.__encoding = encoding
+        self.__lines: Optional[List[str]] = None
+
+    @cached_property
+    def data(self) -> Optional[bytes]:
+        """data RO getter for ShardContentProvider"""
+        if self.__content is not None:
+            return self.__content
+        return self._read_file()
+
+    def _read_file(self) -> Optional[bytes]:
+        """Reads the shard with lines around from the file"""
+        start, end, _ = self.__offsets
+        try:
+            with open(self.file_path, "rb") as f:
+                return self._read(f, start, end)
+        except Exception as exc:
+            logger.error(f"Unexpected Error: Can not read '{self.file_path}'. Error message: '{exc}'")
+        return None
+
+    def prefetch(self) -> None:
+        """Reads the shard from the file in advance"""
+        if self.__content is None:
+            self.__content = self._read_file()
+
+    @cached_property
+    def size(self) -> int:
+        """size of the shard with lines around"""
+        start, end, _ = self.__offsets
+        return end - start
+
+    def free(self) -> None:
+        """free data after scan to reduce memory usage"""
+        self.__content = None
+        if hasattr(self, "data"):
+            delattr(self, "data")
+        self.__lines = None
+        if hasattr(self, "lines"):
+            delattr(self, "lines")
+
+    @cached_property
+    def lines(self) -> List[str]:
+        """lines RO getter for ShardContentProvider"""
+        if self.__lines is None:
+            encodings = [self.__encoding] if LATIN_1 == self.__encoding else [self.__encoding, LATIN_1]
+            self.__lines = Util.decode_bytes(self.data, encodings)
+            _, end, total = self.__offsets
+            if self.__lines and end < total:
+                # the shard ends with line break, so the last empty line belongs to next shard
+                self.__lines.pop()
+        return self.__lines if self.__lines is not None else []
+
+    def yield_analysis_target(self, min_len: int) -> Generator[AnalysisTarget, None, None]:
+        """Return lines to scan.
+
+        Args:
+            min_len: minimal line length to scan
+
+        Return:
+            analysis targets of lines from own range of the shard
+
+        """
+        lines = self.lines
+        line_nums = range(1 + self.__line_offset, 1 + self.__line_offset + len(lines))
+        core_start, core_end = self.__core_lines
+        for target in self.lines_to_targets(min_len, lines, line_nums):
+            if core_start <= target.line_pos < core_end:
+                yield target
+
+    @classmethod
+    def split(
+            cls,  #
+            provider: ContentProvider,  #
+            content: Optional[bytes],  #
+            shard_size: int,  #
+            lines_before: int,  #
+            lines_after: int) -> List["ShardContentProvider"]:
+        """Splits text of the provider into shards of lines.
+
+        The encoding is detected by the beginning of the text and the shards are decoded with it on demand, so
+        the text is not read whole. Line breaks are found in bytes, so only UTF-8 and latin_1 texts are split.
+
+        Args:
+            provider: the provider of a file or bytes to split
+            content: bytes of the provider or None to read the file
+            shard_size: minimal size of own range of a shard in bytes
+            lines_before: amount of lines before own range which are kept in a shard
+            lines_after: amount of lines after own range which are kept in a shard
+
+        Return:
+            list of shards or empty list when the text cannot be split
+
+        """
+        with contextlib.ExitStack() as stack:
+            source: Union[bytes, mmap.mmap, BinaryIO]
+            if content is None:
+                file = stack.enter_context(open(provider.file_path, "rb"))
+                total = os.fstat(file.fileno()).st_size
+                source = file
+                if 2 * shard_size <= total:
+                    try:
+                        # boundaries are found in page cache without copies of the file into memory
+                        source = stack.enter_context(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+                    except (OSError, ValueError) as exc:
+                        logger.debug(f"{provider.file_path} is read without mmap: {exc}")
+            else:
+                source = content
+                total = len(content)
+            if total < 2 * shard_size:
+                return []
+            encoding = Util.detect_encoding(cls._read(source, 0, MAX_LINE_LENGTH))
+            if encoding not in (UTF_8, LATIN_1):
+                # a byte of line break may be a part of other symbol in UTF-16
+                logger.debug(f"{provider.file_path} is not split because of {encoding or 'binary data'}")
+                return []
+            boundaries = cls._get_boundaries(source, total, shard_size)
+            if 2 > len(boundaries) - 1:
+                return []
+            # positions of first lines of ranges in whole text
+            line_positions = [0]
+            for start, end in zip(boundaries[:-1], boundaries[1:]):
+                chunk = cls._read(source, start, end)
+                # bytes of line breaks are the same for UTF-8 and latin_1, so the count does not require decoding
+                line_breaks = chunk.count(b'\n') + chunk.count(b'\r') - chunk.count(b"\r\n")
+                line_positions.append(line_positions[-1] + line_breaks)
+            shards = []
+            for n in range(len(boundaries) - 1):
+                start, before = cls._get_lines_start(source, boundaries[n], lines_before)
+                end = cls._get_lines_end(source, total, boundaries[n + 1], lines_after)
+                core_lines = before, before + line_positions[n + 1] - line_positions[n]
+                if boundaries[n + 1] == total:
+                    # the last line of the text has no line break
+                    core_lines = before, 1 + core_lines[1]
+                shard = cls(
+                    file_path=provider.file_path,  #
+                    file_type=provider.file_type,  #
+                    info=provider.info,  #
+                    content=None if content is None else content[start:end],  #
+                    offsets=(start, end, total),  #
+                    line_offset=line_positions[n] - before,  #
+                    core_lines=core_lines,  #
+                    encoding=encoding)
+                shards.append(shard)
+        logger.debug(f"{provider.file_path} is split into {len(shards)} shards")
+        return shards
+
+    @staticmethod
+    def _read(source: Union[bytes, mmap.mmap, BinaryIO], start: int, end: int) -> bytes:
+        """Reads range of bytes from the content, the mapped or the opened file"""
+        if isinstance(source, (bytes, mmap.mmap)):
+            return source[start:end]
+        source.seek(start)
+        return source.read(end - start)
+
+    @classmethod
+    def _get_boundaries(cls, source: Union[bytes, mmap.mmap, BinaryIO], total: int, shard_size: int) -> List[int]:
+        """Returns offsets of line starts after each shard_size bytes, the first is 0 and the last is total"""
+        boundaries = [0]
+        position = shard_size
+        while position < total:
+            # position after the next new line symbol is a line start for any line break
+            block = cls._read(source, position, position + cls.BLOCK_SIZE)
+            while block and b'\n' not in block:
+                position += len(block)
+                block = cls._read(source, position, position + cls.BLOCK_SIZE)
+            if not block:
+                break
+            position += 1 + block.index(b'\n')
+            if total - position < shard_size:
+                # the rest is appended to the last shard
+                break
+            boundaries.append(position)
+            position += shard_size
+        boundaries.append(total)
+        return boundaries
+
+    @classmethod
+    def _get_lines_start(cls, source: Union[bytes, mmap.mmap, BinaryIO], position: int, lines: int) -> Tuple[int, int]:
+        """Returns offset of the line which is `lines` lines before the position and actual amount of the lines"""
+        if 0 >= lines or 0 == position:
+            return position, 0
+        block_size = cls.BLOCK_SIZE
+        while True:
+            start = max(0, position - block_size)
+            block = cls._read(source, start, position)
+            # the position is a line start, so the last line break is not used
+            line_starts = [start + x.end() for x in cls.LINE_BREAK_PATTERN.finditer(block)][:-1]
+            if 0 == start:
+                line_starts.insert(0, 0)
+            if lines <= len(line_starts):
+                return line_starts[-lines], lines
+            if 0 == start:
+                return 0, len(line_starts)
+            block_size <<= 1
+
+    @classmethod
+    def _get_lines_end(cls, source: Union[bytes, mmap.mmap, BinaryIO], total: int, position: int, lines: int) -> int:
+        """Returns offset after `lines` lines from the position"""
+        if 0 >= lines:
+            return position
+        block_size = cls.BLOCK_SIZE
+        while True:
+            end = min(total, position + block_size)
+            block = cls._read(source, position, end)
+            line_ends = [position + x.end() for x in cls.LINE_BREAK_PATTERN.finditer(block)]
+            if end < total and block.endswith(b'\r'):
+                # the symbol may be a part of the line break which is not read yet
+                line_ends.pop()
+            if lines <= len(line_ends):
+                return line_ends[lines - 1]
+            if end == total:
+                return total
+            block_size <<= 1
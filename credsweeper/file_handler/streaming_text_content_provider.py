@@ -0,0 +1,282 @@
+import codecs
+import itertools
+import logging
+import os
+import stat
+from functools import cached_property
+from typing import BinaryIO, Generator, Iterable, List, Optional, Sequence, Tuple
+
+from credsweeper.common.constants import LATIN_1, MAX_LINE_LENGTH, OVERLAP_SIZE
+from credsweeper.file_handler.analysis_target import AnalysisTarget
+from credsweeper.file_handler.byte_content_provider import ByteContentProvider
+from credsweeper.file_handler.content_provider import ContentProvider
+from credsweeper.file_handler.text_content_provider import TextContentProvider
+from credsweeper.utils import Util
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingTextContentProvider(TextContentProvider):
+    """Provides lines of a file, a FIFO or a stream which is read by blocks, so memory usage does not depend on size
+    of the input. Standard input may be scanned without temporary files.
+
+    Lines of a block are scanned in a window with LINES_BEFORE lines before and LINES_AFTER lines after the block,
+    so multiline rules and filters see the same neighbours as during scan of whole text. The encoding is detected once
+    by the beginning of the input and blocks are decoded incrementally. An overlong line is scanned by overlapping
+    pieces. Deep scan requires whole data, so the input is read whole in the mode.
+
+    Parameters:
+        file_path: path to the file or name of the stream
+        stream: optional binary stream which is read instead of the file, e.g. sys.stdin.buffer
+
+    """
+
+    # size of blocks which are read from the input
+    BLOCK_SIZE = 1 << 20
+    # lines around which are required for MultiPattern.MAX_SEARCH_MARGIN and PemKeyDetector.MAX_KEY_LINES
+    LINES_BEFORE = 10
+    LINES_AFTER = 200
+    # size of pieces which a line without line break is scanned by
+    LINE_PIECE_SIZE = 1 << 16
+
+    def __init__(self,
+                 file_path: str,
+                 stream: Optional[BinaryIO] = None,
+                 file_type: Optional[str] = None,
+                 info: Optional[str] = None) -> None:
+        super().__init__(file_path=file_path, file_type=file_type, info=info)
+        self.__stream = stream
+
+    def __reduce_ex__(self, protocol):
+        if self.__stream is None:
+            # a worker process receives only the path and reads the input itself
+            return self.__class__, (self.file_path, None, self.file_type, self.info)
+        # a stream cannot be transferred to a worker process, so whole input is read
+        logger.warning(f"{self.file_path} is read whole to be transferred to other process")
+        return ByteContentProvider, (self.data or b"", self.file_path, self.file_type, self.info)
+
+    @property
+    def has_stream(self) -> bool:
+        """The input is a stream which can be read by blocks only in current process"""
+        return self.__stream is not None
+
+    @staticmethod
+    def split_streams(content_providers: Iterable[ContentProvider],
+                      streams: List[ContentProvider]) -> Iterable[ContentProvider]:
+        """Filters providers which may be transferred to worker processes and collects providers of streams,
+        e.g. stdin, which have to be read by blocks in current process
+
+        Args:
+            content_providers: file objects to scan, a sequence is returned as a list
+            streams: list which the providers of streams are appended to
+
+        Return:
+            providers without the streams
+
+        """
+
+        def is_transferable(provider: ContentProvider) -> bool:
+            if isinstance(provider, StreamingTextContentProvider) and provider.has_stream:
+                streams.append(provider)
+                return False
+            return True
+
+        providers = filter(is_transferable, content_providers)
+        return list(providers) if isinstance(content_providers, Sequence) else providers
+
+    @staticmethod
+    def is_stream_path(path: str) -> bool:
+        """Checks whether the path is a FIFO or a character device which can be read only once"""
+        try:
+            mode = os.stat(path).st_mode
+        except OSError:
+            return False
+        return stat.S_ISFIFO(mode) or stat.S_ISCHR(mode)
+
+    @cached_property
+    def data(self) -> Optional[bytes]:
+        """Reads whole input, e.g. for deep scan"""
+        if self.__stream is not None:
+            return self.__stream.read()
+        return Util.read_data(self.file_path)
+
+    @cached_property
+    def lines(self) -> Optional[List[str]]:
+        """Decodes whole input, e.g. for XML"""
+        return Util.decode_bytes(self.data) if self.data else []
+
+    @cached_property
+    def size(self) -> int:
+        """size of a regular file, 0 for a stream"""
+        if self.__stream is None:
+            try:
+                file_stat = os.stat(self.file_path)
+                if stat.S_ISREG(file_stat.st_mode):
+                    return file_stat.st_size
+            except OSError as exc:
+                logger.debug(f"Cannot get size of {self.file_path}: {exc}")
+        return 0
+
+    def free(self) -> None:
+        """free data after scan to reduce memory usage. The input is not read for the check"""
+        self.__dict__.pop("data", None)
+        self.__dict__.pop("lines", None)
+
+    def prefetch(self) -> None:
+        """The input is read by blocks during the scan"""
+
+    def get_shards(self, shard_size: int, lines_before: int, lines_after: int) -> Sequence[ContentProvider]:
+        """The input is not split because it is read once"""
+        return [self]
+
+    def yield_blocks(self) -> Generator[bytes, None, None]:
+        """Yields blocks of BLOCK_SIZE bytes from the input"""
+        try:
+            if self.__stream is not None:
+                while block := self.__stream.read(self.BLOCK_SIZE):
+                    yield block
+            else:
+                with open(self.file_path, "rb") as f:
+                    while block := f.read(self.BLOCK_SIZE):
+                        yield block
+        except OSError as exc:
+            logger.error(f"Unexpected Error: Can not read '{self.file_path}'. Error message: '{exc}'")
+
+    def yield_texts(self) -> Generator[str, None, None]:
+        """Yields text of the input decoded by blocks. The encoding is detected once by first MAX_LINE_LENGTH bytes
+        and the decoder keeps an incomplete symbol of a block for next block. When a block cannot be decoded,
+        the rest of the input is decoded as latin_1 unless binary data is detected"""
+        blocks = self.yield_blocks()
+        head = bytearray()
+        for block in blocks:
+            head.extend(block)
+            if MAX_LINE_LENGTH <= len(head):
+                break
+        if not head:
+            return
+        if not (encoding := Util.detect_encoding(bytes(head))):
+            logger.warning(f"{self.file_path} is not scanned because of binary data")
+            return
+        decoder = codecs.getincrementaldecoder(encoding)(errors="strict")
+        # yield_blocks() never yields empty block, so the empty block finishes the decoding
+        for block in itertools.chain((bytes(head), ), blocks, (b"", )):
+            pending = decoder.getstate()[0]
+            try:
+                text = decoder.decode(block, final=not block)
+            except UnicodeError:
+                data = pending + block
+                if Util.is_binary(data):
+                    logger.warning(f"{self.file_path} is not scanned further because of binary data")
+                    return
+                logger.info(f"UnicodeError: Can't decode content of {self.file_path} as {encoding} further.")
+                decoder = codecs.getincrementaldecoder(LATIN_1)(errors="strict")
+                text = decoder.decode(data, final=not block)
+            if text:
+                yield text
+
+    def yield_lines(self) -> Generator[Tuple[List[str], List[Tuple[int, int, str]]], None, None]:
+        """Yields decoded lines by blocks. Lines are split the same way as Util.decode_bytes does for whole text.
+
+        A line which is longer than LINE_PIECE_SIZE is not kept whole in memory. It is yielded by overlapping pieces
+        with the line number and the offset of the piece like chunks of a long line, and an empty line holds
+        the place of the line in the lines.
+
+        Return:
+            generator of lines and pieces of overlong lines
+
+        """
+        # parts of the incomplete line, their length and the offset of the parts in the line
+        parts: List[str] = []
+        parts_len = parts_offset = 0
+        line_num = 1
+        carriage_return = False
+        is_empty = True
+        for text in self.yield_texts():
+            is_empty = False
+            if carriage_return:
+                text = '\r' + text
+            # CR may be followed with LF in next text
+            carriage_return = text.endswith('\r')
+            if carriage_return:
+                text = text[:-1]
+            lines = text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+            # the last line is incomplete
+            last_line = lines.pop()
+            pieces: List[Tuple[int, int, str]] = []
+            if lines:
+                parts.append(lines[0])
+                lines[0] = ''.join(parts)
+                if parts_offset:
+                    pieces.append((line_num, parts_offset, lines[0]))
+                    lines[0] = ""
+                line_num += len(lines)
+                parts, parts_len, parts_offset = [], 0, 0
+            parts.append(last_line)
+            parts_len += len(last_line)
+            while self.LINE_PIECE_SIZE <= parts_len:
+                line = ''.join(parts)
+                pieces.append((line_num, parts_offset, line[:self.LINE_PIECE_SIZE]))
+                # next piece overlaps the previous like chunks of a long line
+                step = self.LINE_PIECE_SIZE - OVERLAP_SIZE
+                parts = [line[step:]]
+                parts_len -= step
+                parts_offset += step
+            yield lines, pieces
+        if is_empty:
+            return
+        lines = [''.join(parts)]
+        if carriage_return:
+            # CR at the end of the input is a line break
+            lines.append("")
+        if parts_offset:
+            yield [""] + lines[1:], [(line_num, parts_offset, lines[0])]
+        else:
+            yield lines, []
+
+    def yield_analysis_target(self, min_len: int) -> Generator[AnalysisTarget, None, None]:
+        """Return lines to scan.
+
+        Args:
+            min_len: minimal line length to scan
+
+        Return:
+            analysis targets of lines with windows of lines around
+
+        """
+        if ".xml" == Util.get_extension(self.file_path):
+            # XML is parsed as whole document
+            yield from super().yield_analysis_target(min_len)
+            return
+        # lines before the pending lines, the pending lines and lines after them
+        lines: List[str] = []
+        # position of the first pending line in the lines and amount of lines before the lines
+        position = line_offset = 0
+        for block_lines, pieces in self.yield_lines():
+            for line_num, offset, piece in pieces:
+                yield from self._yield_piece_targets(min_len, line_num, offset, piece)
+            lines.extend(block_lines)
+            end = len(lines) - self.LINES_AFTER
+            if position < end:
+                yield from self._yield_window_targets(min_len, lines, line_offset, position, end)
+                start = max(0, end - self.LINES_BEFORE)
+                # new list is created, so lines of yielded targets are not changed
+                lines = lines[start:]
+                line_offset += start
+                position = end - start
+        yield from self._yield_window_targets(min_len, lines, line_offset, position, len(lines))
+
+    def _yield_window_targets(self, min_len: int, lines: List[str], line_offset: int, start: int,
+                              end: int) -> Generator[AnalysisTarget, None, None]:
+        """Yields targets of lines from start to end position in the window of lines"""
+        line_nums = range(1 + line_offset, 1 + line_offset + len(lines))
+        for target in self.lines_to_targets(min_len, lines, line_nums):
+            if start <= target.line_pos < end:
+                yield target
+
+    def _yield_piece_targets(self, min_len: int, line_num: int, offset: int,
+                             piece: str) -> Generator[AnalysisTarget, None, None]:
+        """Yields targets of a piece of an overlong line with offsets in the line. Duplicates which are found in
+        the overlaps are purged like for chunks of a long line because the pieces have the same position"""
+        lines, line_nums = [piece], [line_num]
+        for target in self.lines_to_targets(min_len, lines, line_nums):
+            yield AnalysisTarget(0, lines, line_nums, target.descriptor, target.line, offset + (target.offset or 0))
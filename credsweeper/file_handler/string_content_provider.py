@@ -66,4 +66,5 @@ class StringContentProvider(ContentProvider):
             list of analysis targets based on every row in file
 
         """
-        return self.lines_to_targets(min_len, self.lines, self.line_numbers)
+        # plain numeration is implicit in targets
+        return self.lines_to_targets(min_len, self.lines, self.__line_numbers)
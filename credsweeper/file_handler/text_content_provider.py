@@ -2,10 +2,12 @@ import io
 import logging
 from functools import cached_property
 from pathlib import Path
-from typing import List, Optional, Union, Tuple, Generator
+from typing import List, Optional, Union, Tuple, Generator, Sequence
 
 from credsweeper.file_handler.analysis_target import AnalysisTarget
 from credsweeper.file_handler.content_provider import ContentProvider
+from credsweeper.file_handler.file_path_extractor import FilePathExtractor
+from credsweeper.file_handler.shard_content_provider import ShardContentProvider
 from credsweeper.utils import Util
 
 logger = logging.getLogger(__name__)
@@ -29,6 +31,17 @@ class TextContentProvider(ContentProvider):
         self.__lines: Optional[List[str]] = None
         super().__init__(file_path=_path, file_type=file_type, info=info)
 
+    def __reduce_ex__(self, protocol):
+        if self.__io is None and self.__data is None:
+            # a worker process receives only the reference to the file and reads the data itself
+            return self.__class__, (self.file_path, self.file_type, self.info)
+        return super().__reduce_ex__(protocol)
+
+    @property
+    def is_file(self) -> bool:
+        """The data is not kept in memory and is read from the file by the path"""
+        return self.__io is None and self.__data is None
+
     @cached_property
     def data(self) -> Optional[bytes]:
         """data RO getter for TextContentProvider"""
@@ -39,6 +52,24 @@ class TextContentProvider(ContentProvider):
                 self.__data = Util.read_data(self.file_path)
         return self.__data
 
+    def prefetch(self) -> None:
+        """Reads the file in advance. The data is not set with cached property which locks all instances"""
+        if self.__data is None and self.__io is None:
+            self.__data = Util.read_data(self.file_path)
+
+    @cached_property
+    def size(self) -> int:
+        """size of the data without reading"""
+        if self.__data is not None:
+            return len(self.__data)
+        try:
+            file_size = FilePathExtractor.get_file_size(
+                self.__io if isinstance(self.__io, io.BytesIO) else self.file_path)
+        except (OSError, ValueError) as exc:
+            logger.debug(f"Cannot get size of {self.file_path}: {exc}")
+            file_size = None
+        return file_size or 0
+
     def free(self) -> None:
         """free data after scan to reduce memory usage"""
         self.__data = None
@@ -57,6 +88,17 @@ class TextContentProvider(ContentProvider):
             self.__lines = Util.decode_bytes(self.data)
         return self.__lines if self.__lines is not None else []
 
+    def get_shards(self, shard_size: int, lines_before: int, lines_after: int) -> Sequence[ContentProvider]:
+        """Splits a large text file into shards of lines. XML files are not split due the structure"""
+        if self.__io is not None or ".xml" == Util.get_extension(self.file_path):
+            return [self]
+        try:
+            shards = ShardContentProvider.split(self, self.__data, shard_size, lines_before, lines_after)
+        except OSError as exc:
+            logger.error(f"Cannot split {self.file_path}: {exc}")
+            shards = []
+        return shards or [self]
+
     def yield_analysis_target(self, min_len: int) -> Generator[AnalysisTarget, None, None]:
         """Load and preprocess file content to scan.
 
@@ -8,6 +8,9 @@ from credsweeper.file_handler.analysis_target import AnalysisTarget
 class Filter(ABC):
     """Base class for all filters that operates on 'line_data' objects."""
 
+    # the filter result depends on line_data.value only, so the verdict may be reused for the same value
+    VALUE_ONLY = False
+
     @abstractmethod
     def __init__(self, config: Config, *args):
         raise NotImplementedError()
@@ -12,6 +12,8 @@ from credsweeper.utils import Util
 class ValueAtlassianTokenCheck(Filter):
     """Check that candidate have a known structure"""
 
+    VALUE_ONLY = True
+
     def __init__(self, config: Config = None) -> None:
         pass
 
@@ -16,6 +16,8 @@ class ValueAzureTokenCheck(Filter):
     https://learn.microsoft.com/en-us/azure/active-directory-b2c/access-tokens
     """
 
+    VALUE_ONLY = True
+
     def __init__(self, config: Config = None) -> None:
         pass
 
@@ -13,6 +13,8 @@ class ValueBase64DataCheck(Filter):
     Check that candidate is NOT an ascii encoded string with entropy check
     """
 
+    VALUE_ONLY = True
+
     def __init__(self, config: Config = None) -> None:
         pass
 
@@ -13,6 +13,8 @@ from credsweeper.utils import Util
 class ValueBase64KeyCheck(Filter):
     """Check that candidate contains base64 encoded private key"""
 
+    VALUE_ONLY = True
+
     def __init__(self, config: Config = None) -> None:
         self.config = config
 
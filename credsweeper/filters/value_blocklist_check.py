@@ -7,6 +7,8 @@ from credsweeper.filters import Filter
 class ValueBlocklistCheck(Filter):
     """Check that words from block list is lest that 70% of candidate value length."""
 
+    VALUE_ONLY = True
+
     NOT_ALLOWED = [
         "true",
         "false",
@@ -8,6 +8,8 @@ from credsweeper.filters import Filter
 class ValueCoupleKeywordCheck(Filter):
     """Check value if TWO words from morphemes checklist exists in value"""
 
+    VALUE_ONLY = True
+
     def __init__(self, config: Config = None, threshold=1) -> None:
         # threshold - minimum morphemes number in a value
         self.threshold = threshold
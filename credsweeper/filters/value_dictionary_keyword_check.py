@@ -8,6 +8,8 @@ from credsweeper.filters import Filter
 class ValueDictionaryKeywordCheck(Filter):
     """Check that no word from dictionary present in the candidate value."""
 
+    VALUE_ONLY = True
+
     def __init__(self, config: Config = None) -> None:
         pass
 
@@ -7,6 +7,8 @@ from credsweeper.filters import Filter
 class ValueDictionaryValueLengthCheck(Filter):
     """Check that candidate length is between 5 and 30."""
 
+    VALUE_ONLY = True
+
     def __init__(self, config: Config = None, min_len: int = 4, max_len: int = 31) -> None:
         self.min_len = min_len
         self.max_len = max_len
@@ -12,6 +12,8 @@ from credsweeper.utils import Util
 class ValueDiscordBotCheck(Filter):
     """Discord bot Token"""
 
+    VALUE_ONLY = True
+
     def __init__(self, config: Config = None) -> None:
         pass
 
@@ -11,6 +11,8 @@ from credsweeper.utils import Util
 class ValueEntropyBase36Check(Filter):
     """Check that candidate have Shanon Entropy (for [a-z0-9])"""
 
+    VALUE_ONLY = True
+
     def __init__(self, config: Config = None) -> None:
         pass
 
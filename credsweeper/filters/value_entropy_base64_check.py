@@ -11,6 +11,8 @@ from credsweeper.utils import Util
 class ValueEntropyBase64Check(Filter):
     """Check that candidate have Shanon Entropy > 3 (for HEX_CHARS or BASE36_CHARS) or > 4.5 (for BASE64_CHARS)."""
 
+    VALUE_ONLY = True
+
     # If the value size is less than this value the entropy evaluation gives an imprecise result
     min_length = 12
 
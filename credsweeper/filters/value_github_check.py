@@ -13,6 +13,8 @@ from credsweeper.filters import Filter
 class ValueGitHubCheck(Filter):
     """GitHub Classic Token validation"""
 
+    VALUE_ONLY = True
+
     def __init__(self, config: Config = None) -> None:
         pass
 
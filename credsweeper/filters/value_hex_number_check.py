@@ -9,6 +9,8 @@ from credsweeper.filters import Filter
 class ValueHexNumberCheck(Filter):
     """Check value if it a value in 32 or 64 bits hex representation"""
 
+    VALUE_ONLY = True
+
     HEX_32_64_VALUE_REGEX = re.compile(r"^0x([0-9a-f]{8}){1,2}$")
 
     def __init__(self, config: Config = None) -> None:
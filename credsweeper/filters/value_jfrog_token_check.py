@@ -14,6 +14,8 @@ from credsweeper.utils import Util
 class ValueJfrogTokenCheck(Filter):
     """Check that candidate have a known structure JFROG token"""
 
+    VALUE_ONLY = True
+
     def __init__(self, config: Config = None) -> None:
         # reftkn:01:0123456789:abcdefGhijklmnoPqrstuVwxyz0
         self._pattern = re.compile(r"reftkn:\d+:\d+:[\w_/+-]+")
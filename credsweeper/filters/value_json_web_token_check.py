@@ -14,6 +14,8 @@ class ValueJsonWebTokenCheck(Filter):
     registered keys are checked to be in the JWT parts
     https://www.iana.org/assignments/jose/jose.xhtml
     """
+
+    VALUE_ONLY = True
     header_keys = {
         "alg", "jku", "jwk", "kid", "x5u", "x5c", "x5t", "x5t#S256", "typ", "cty", "crit", "alg", "enc", "zip", "jku",
         "jwk", "kid", "x5u", "x5c", "x5t", "x5t#S256", "typ", "cty", "crit", "epk", "apu", "apv", "iv", "tag", "p2s",
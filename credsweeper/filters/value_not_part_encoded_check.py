@@ -21,12 +21,14 @@ class ValueNotPartEncodedCheck(Filter):
 
     @staticmethod
     def check_line_target_fit(line_data: LineData, target: AnalysisTarget) -> bool:
-        """Verifies whether line data fit to be a part of many lines"""
+        """Verifies whether line data fit to be a part of many lines in plain order"""
         return line_data.line_num == target.line_num \
+            and line_data.line_pos == target.line_pos \
             and len(line_data.line) == target.line_len \
             and line_data.line == target.line \
-            and 0 < target.line_num <= target.lines_len \
-            and line_data.line == target.lines[target.line_num - 1]
+            and (target.line_num == 1 + target.line_pos or isinstance(target.line_nums, range)) \
+            and 0 <= target.line_pos < target.lines_len \
+            and line_data.line == target.lines[target.line_pos]
 
     @staticmethod
     def check_val(line: str, pattern: re.Pattern) -> Optional[bool]:
@@ -55,13 +57,13 @@ class ValueNotPartEncodedCheck(Filter):
 
         if ValueNotPartEncodedCheck.check_line_target_fit(line_data, target):
             # suppose, there is plain lines order
-            if 1 < target.line_num:
-                result = ValueNotPartEncodedCheck.check_val(target.lines[line_data.line_num - 2],
+            if 0 < target.line_pos:
+                result = ValueNotPartEncodedCheck.check_val(target.lines[target.line_pos - 1],
                                                             ValueNotPartEncodedCheck.BASE64_ENCODED_DATA_PATTERN_BEFORE)
                 if result is not None:
                     return result
-            if target.lines_len > target.line_num:
-                result = ValueNotPartEncodedCheck.check_val(target.lines[line_data.line_num],
+            if target.lines_len > 1 + target.line_pos:
+                result = ValueNotPartEncodedCheck.check_val(target.lines[target.line_pos + 1],
                                                             ValueNotPartEncodedCheck.BASE64_ENCODED_DATA_PATTERN_AFTER)
                 if result is not None:
                     return result
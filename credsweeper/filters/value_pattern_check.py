@@ -22,6 +22,8 @@ class ValuePatternCheck(Filter):
     Default pattern LEN is 4
     """
 
+    VALUE_ONLY = True
+
     def __init__(self, config: Config = None, pattern_len: int = DEFAULT_PATTERN_LEN):
         """Create ValuePatternCheck with a specific pattern_len to check.
 
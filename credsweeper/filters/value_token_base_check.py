@@ -12,6 +12,8 @@ from credsweeper.utils.hop_stat import HopStat
 class ValueTokenBaseCheck(Filter):
     """Check that candidate have good randomization"""
 
+    VALUE_ONLY = True
+
     MUL_DICT = {
         8: 2.61619746,
         10: 2.48685659,
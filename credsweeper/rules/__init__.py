@@ -1 +1,2 @@
 from credsweeper.rules.rule import Rule
+from credsweeper.rules.rules_cache import RulesCache
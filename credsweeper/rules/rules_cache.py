@@ -0,0 +1,147 @@
+import hashlib
+import io
+import logging
+import os
+import pickle
+import re
+import stat
+import sys
+import tempfile
+from enum import Enum
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from credsweeper.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class RulesCache:
+    """Persistent cache of rules which were built from a rule file with a config.
+
+    The cache file name is a digest of the rule file content, the config state, the package and python versions,
+    so any change of them leads to another file and the rules are built from scratch. The config object is not stored
+    in the file - the current one is substituted during the loading.
+
+    Unpickling of a file may execute any code, so a cache is loaded only when the directory and the file belong to
+    the current user and are not writable for group or others. The check is skipped on systems without owners.
+
+    """
+
+    CONFIG_ID = "config"
+
+    def __init__(self, cache_dir: Union[str, Path], config: Config, rule_data: bytes) -> None:
+        """
+        Args:
+            cache_dir: directory where the cache files are stored
+            config: config which is used for the rules
+            rule_data: raw content of the rule file
+
+        """
+        self.config = config
+        self.path = Path(cache_dir) / f"rules-{self.get_digest(config, rule_data)}.pickle"
+
+    @staticmethod
+    def _get_state(value: Any) -> Any:
+        """Transforms the value to a representation which does not depend on python hash randomization"""
+        if isinstance(value, dict):
+            return sorted((repr(k), RulesCache._get_state(v)) for k, v in value.items())
+        if isinstance(value, (list, tuple)):
+            return [RulesCache._get_state(x) for x in value]
+        if isinstance(value, (set, frozenset)):
+            return sorted(repr(RulesCache._get_state(x)) for x in value)
+        if isinstance(value, re.Pattern):
+            return value.pattern, value.flags
+        if isinstance(value, Enum):
+            return repr(value)
+        return value
+
+    @staticmethod
+    def get_digest(config: Config, rule_data: bytes) -> str:
+        """Calculates digest of the rule file content and the config
+
+        Args:
+            config: config which is used for the rules
+            rule_data: raw content of the rule file
+
+        Return:
+            hexadecimal digest
+
+        """
+        # the package is initialized already when the method is called
+        from credsweeper import __version__  # pylint: disable=import-outside-toplevel
+        digest = hashlib.sha256()
+        digest.update(f"{__version__}:{sys.version}:{pickle.HIGHEST_PROTOCOL}".encode())
+        # location of the cache does not affect the rules, private attributes are derived from others
+        config_state = {k: v for k, v in vars(config).items() if "rules_cache" != k and not k.startswith("_Config__")}
+        digest.update(repr(RulesCache._get_state(config_state)).encode())
+        digest.update(rule_data)
+        return digest.hexdigest()
+
+    @staticmethod
+    def is_trusted(path: Path) -> bool:
+        """Checks whether the path belongs to the current user and is not writable for group or others.
+
+        Args:
+            path: path of the cache directory or file, symbolic link is not followed
+
+        Return:
+            True when nobody else could plant the content
+
+        """
+        if not hasattr(os, "getuid"):
+            return True
+        try:
+            path_stat = os.lstat(path)
+        except OSError:
+            return False
+        return not stat.S_ISLNK(path_stat.st_mode) and os.getuid() == path_stat.st_uid \
+            and not path_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+    def load(self) -> Optional[Any]:
+        """Loads the cached object. None is returned when the cache is absent, untrusted or cannot be read"""
+        if not self.path.is_file():
+            return None
+        if not (self.is_trusted(self.path.parent) and self.is_trusted(self.path)):
+            logger.warning(f"Rules cache {self.path} is not loaded: the directory or the file is not private")
+            return None
+        try:
+            with open(self.path, "rb") as f:
+                unpickler = pickle.Unpickler(f)
+                unpickler.persistent_load = self._persistent_load  # type: ignore
+                return unpickler.load()
+        except Exception as exc:
+            logger.debug(f"Rules cache {self.path} was not loaded: {exc}")
+        return None
+
+    def save(self, obj: Any) -> None:
+        """Stores the object to the cache file atomically. Errors are logged only"""
+        try:
+            buffer = io.BytesIO()
+            pickler = pickle.Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL)
+            pickler.persistent_id = self._persistent_id  # type: ignore
+            pickler.dump(obj)
+            # the file is loaded only from a private directory
+            self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(buffer.getvalue())
+                os.replace(tmp_path, self.path)
+            except Exception:
+                os.unlink(tmp_path)
+                raise
+        except Exception as exc:
+            logger.warning(f"Rules cache {self.path} was not saved: {exc}")
+
+    def _persistent_id(self, obj: Any) -> Optional[str]:
+        """The config is not stored in the cache"""
+        if obj is self.config:
+            return self.CONFIG_ID
+        return None
+
+    def _persistent_load(self, pid: Any) -> Any:
+        """Substitutes the current config"""
+        if self.CONFIG_ID == pid:
+            return self.config
+        raise pickle.UnpicklingError(f"Unsupported persistent id {pid}")
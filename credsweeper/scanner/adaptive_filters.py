@@ -0,0 +1,105 @@
+import copy
+import time
+from typing import Dict, List, Type
+
+from credsweeper.config import Config
+from credsweeper.credentials import Candidate, LineData
+from credsweeper.file_handler.analysis_target import AnalysisTarget
+from credsweeper.filters import Filter
+from credsweeper.rules import Rule
+from credsweeper.scanner.scan_type import ScanType
+
+
+class MeasuringFilter(Filter):
+    """Runs all filters of a rule without short circuit to measure cost and rejection rate of each one"""
+
+    def __init__(self, config: Config, filters: List[Filter]) -> None:
+        self.config = config
+        self.filters = filters
+        self.samples = 0
+        self.time = [0.0] * len(filters)
+        self.rejected = [0] * len(filters)
+
+    def run(self, line_data: LineData, target: AnalysisTarget) -> bool:
+        """Result is the same as the filters give in any order"""
+        result = False
+        for n, filter_ in enumerate(self.filters):
+            start_time = time.perf_counter()
+            if filter_.run(line_data, target):
+                self.rejected[n] += 1
+                result = True
+            self.time[n] += time.perf_counter() - start_time
+        self.samples += 1
+        return result
+
+    def get_order(self) -> List[int]:
+        """Returns indexes of the filters in order of the least expected cost of the chain.
+
+        Independent filters are sorted by ratio of cost to rejection rate. Filters which rejected nothing go last in
+        original order.
+
+        """
+        return sorted(range(len(self.filters)),
+                      key=lambda x: (0 == self.rejected[x], self.time[x] / self.rejected[x] if self.rejected[x] else x))
+
+
+class AdaptiveFilters:
+    """Reorders filters of rules during a scan by measured cost and selectivity.
+
+    A rule is applied with all filters without short circuit for first SAMPLES_LIMIT line data. Then the filters of
+    the rule are reordered in place and the rule is used as is. Filters do not change the line data, so any order
+    gives the same result.
+
+    """
+
+    SAMPLES_LIMIT = 256
+
+    def __init__(self) -> None:
+        self.__measuring_rules: Dict[str, Rule] = {}
+        self.__adapted_rules: Dict[str, Rule] = {}
+
+    def __getstate__(self) -> Dict[str, Dict[str, Rule]]:
+        # every process adapts own rules
+        return {}
+
+    def __setstate__(self, state: Dict[str, Dict[str, Rule]]) -> None:
+        self.__init__()  # type: ignore
+
+    def _get_measuring_rule(self, config: Config, rule: Rule) -> Rule:
+        """Creates a copy of the rule with the single measuring filter"""
+        if measuring_rule := self.__measuring_rules.get(rule.rule_name):
+            return measuring_rule
+        measuring_rule = copy.copy(rule)
+        # the getter is cached property, so instance value is used by the scanner
+        vars(measuring_rule)["filters"] = [MeasuringFilter(config, rule.filters)]
+        self.__measuring_rules[rule.rule_name] = measuring_rule
+        return measuring_rule
+
+    def run(self, scanner: Type[ScanType], config: Config, rule: Rule, target: AnalysisTarget) -> List[Candidate]:
+        """Runs the scanner with measuring filters of the rule until the order is adapted
+
+        Args:
+            scanner: scanner type of the rule
+            config: user configs
+            rule: rule to scan the target
+            target: analysis target
+
+        Return:
+            candidates which were found by the scanner
+
+        """
+        if rule.rule_name in self.__adapted_rules or not rule.filters:
+            return scanner.run(config, rule, target)
+        measuring_rule = self._get_measuring_rule(config, rule)
+        candidates = scanner.run(config, measuring_rule, target)
+        measuring_filter = measuring_rule.filters[0]
+        assert isinstance(measuring_filter, MeasuringFilter), "unexpected filter"
+        if self.SAMPLES_LIMIT <= measuring_filter.samples:
+            rule.filters[:] = [rule.filters[x] for x in measuring_filter.get_order()]
+            self.__adapted_rules[rule.rule_name] = rule
+            del self.__measuring_rules[rule.rule_name]
+        return candidates
+
+    def get_orders(self) -> Dict[str, List[str]]:
+        """Returns names of filters for adapted rules"""
+        return {name: [type(x).__name__ for x in rule.filters] for name, rule in self.__adapted_rules.items()}
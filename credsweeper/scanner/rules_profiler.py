@@ -0,0 +1,163 @@
+import copy
+import re
+import time
+from typing import Any, Dict, Iterator, List, Optional, Type
+
+from credsweeper.config import Config
+from credsweeper.credentials import Candidate, LineData
+from credsweeper.file_handler.analysis_target import AnalysisTarget
+from credsweeper.filters import Filter
+from credsweeper.rules import Rule
+from credsweeper.scanner.scan_type import ScanType
+
+
+class ProfiledPattern:
+    """Transparent proxy of compiled regex which measures time of matching"""
+
+    def __init__(self, pattern: re.Pattern, stat: Dict[str, Any]) -> None:
+        self.__pattern = pattern
+        self.__stat = stat
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.__pattern, name)
+
+    def __reduce__(self) -> Any:
+        # the original pattern is stored in results
+        return re.compile, (self.__pattern.pattern, self.__pattern.flags)
+
+    def finditer(self, *args, **kwargs) -> Iterator[re.Match]:
+        """Collects all matches at once to measure pure time of the regex"""
+        start_time = time.perf_counter()
+        matches = list(self.__pattern.finditer(*args, **kwargs))
+        self.__stat["regex_time"] += time.perf_counter() - start_time
+        self.__stat["matches"] += len(matches)
+        return iter(matches)
+
+    def search(self, *args, **kwargs) -> Optional[re.Match]:
+        """Measured search"""
+        start_time = time.perf_counter()
+        match = self.__pattern.search(*args, **kwargs)
+        self.__stat["regex_time"] += time.perf_counter() - start_time
+        if match:
+            self.__stat["matches"] += 1
+        return match
+
+
+class ProfiledFilter(Filter):
+    """Wrapper of a filter which measures time and amount of rejected candidates"""
+
+    def __init__(self, config: Config, filter_: Filter, stat: Dict[str, Any]) -> None:
+        self.config = config
+        self.filter = filter_
+        self.stat = stat
+
+    def run(self, line_data: LineData, target: AnalysisTarget) -> bool:
+        """Runs the original filter"""
+        start_time = time.perf_counter()
+        result = self.filter.run(line_data, target)
+        self.stat["time"] += time.perf_counter() - start_time
+        self.stat["calls"] += 1
+        if result:
+            self.stat["rejected"] += 1
+        return result
+
+
+class RulesProfiler:
+    """Collects statistics of scan per rule and per filter of the rule.
+
+    Rules are substituted with copies where patterns and filters are wrapped with measuring proxies, so the scanner
+    code stays the same and nothing is spent for the profiling when the profiler is not used.
+
+    """
+
+    def __init__(self) -> None:
+        self.__stats: Dict[str, Dict[str, Any]] = {}
+        self.__profiled_rules: Dict[str, Rule] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # proxies are created again in a worker process
+        return {"stats": self.__stats}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__stats = state["stats"]
+        self.__profiled_rules = {}
+
+    def clear(self) -> None:
+        """Drops collected statistics"""
+        self.__stats.clear()
+        self.__profiled_rules.clear()
+
+    def _get_profiled_rule(self, config: Config, rule: Rule) -> Rule:
+        """Creates a copy of the rule with measuring patterns and filters"""
+        if profiled_rule := self.__profiled_rules.get(rule.rule_name):
+            return profiled_rule
+        stat = self.__stats.get(rule.rule_name)
+        if stat is None:
+            stat = {
+                "rule": rule.rule_name,
+                "calls": 0,
+                "time": 0.0,
+                "regex_time": 0.0,
+                "matches": 0,
+                "candidates": 0,
+                "filters": [{
+                    "filter": type(x).__name__,
+                    "calls": 0,
+                    "time": 0.0,
+                    "rejected": 0,
+                } for x in rule.filters],
+            }
+            self.__stats[rule.rule_name] = stat
+        profiled_rule = copy.copy(rule)
+        # the getters are cached properties, so instance values are used by the scanner
+        vars(profiled_rule)["patterns"] = [ProfiledPattern(x, stat) for x in rule.patterns]
+        vars(profiled_rule)["filters"] = [ProfiledFilter(config, x, y) for x, y in zip(rule.filters, stat["filters"])]
+        self.__profiled_rules[rule.rule_name] = profiled_rule
+        return profiled_rule
+
+    def run(self, scanner: Type[ScanType], config: Config, rule: Rule, target: AnalysisTarget) -> List[Candidate]:
+        """Runs the scanner with measuring of the rule
+
+        Args:
+            scanner: scanner type of the rule
+            config: user configs
+            rule: rule to scan the target
+            target: analysis target
+
+        Return:
+            candidates which were found by the scanner
+
+        """
+        profiled_rule = self._get_profiled_rule(config, rule)
+        stat = self.__stats[rule.rule_name]
+        start_time = time.perf_counter()
+        candidates = scanner.run(config, profiled_rule, target)
+        stat["time"] += time.perf_counter() - start_time
+        stat["calls"] += 1
+        stat["candidates"] += len(candidates)
+        for candidate in candidates:
+            # original patterns are kept in results
+            candidate.patterns = rule.patterns
+        return candidates
+
+    def update(self, stats: List[Dict[str, Any]]) -> None:
+        """Adds statistics which were collected in another process
+
+        Args:
+            stats: result of get_stats() of another profiler
+
+        """
+        for other_stat in stats:
+            stat = self.__stats.get(other_stat["rule"])
+            if stat is None:
+                self.__stats[other_stat["rule"]] = copy.deepcopy(other_stat)
+                continue
+            for key in ("calls", "time", "regex_time", "matches", "candidates"):
+                stat[key] += other_stat[key]
+            for filter_stat, other_filter_stat in zip(stat["filters"], other_stat["filters"]):
+                for key in ("calls", "time", "rejected"):
+                    filter_stat[key] += other_filter_stat[key]
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Returns statistics of rules ordered by spent time - the most expensive first"""
+        return sorted(self.__stats.values(), key=lambda x: x["time"], reverse=True)
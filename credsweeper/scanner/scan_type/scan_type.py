@@ -1,7 +1,9 @@
 import logging
 import re
+import threading
 from abc import ABC, abstractmethod
-from typing import List
+from collections import OrderedDict
+from typing import List, Tuple
 
 from credsweeper.common.constants import RuleType, MIN_DATA_LEN
 from credsweeper.config import Config
@@ -18,8 +20,17 @@ class ScanType(ABC):
 
     Scanner allow to check if regex pattern defined in a rule is present in a line.
 
+    Parameters:
+        VERDICTS_LIMIT: size of LRU cache of verdicts of filters which depend on the value only
+
     """
 
+    VERDICTS_LIMIT = 1 << 16
+    # the verdicts are shared for all files in the process and keyed by the filter instance and the value
+    __verdicts: "OrderedDict[Tuple[Filter, str], bool]" = OrderedDict()
+    # scans may run in several threads of the process, the filters are run without the lock
+    __verdicts_lock = threading.Lock()
+
     @classmethod
     @abstractmethod
     def run(cls, config: Config, rule: Rule, target: AnalysisTarget) -> List[Candidate]:
@@ -59,13 +70,33 @@ class ScanType(ABC):
                          line_data.line_num, line_data.line, line_data.value)
             return True
         for filter_ in filters:
-            if filter_.run(line_data, target):
+            if filter_.VALUE_ONLY:
+                filtered = cls._get_value_verdict(filter_, line_data, target)
+            else:
+                filtered = filter_.run(line_data, target)
+            if filtered:
                 logger.debug("Filtered line with filter: %s in file: %s:%d  in line: %s value: %s",
                              filter_.__class__.__name__, line_data.path, line_data.line_num, line_data.line,
                              line_data.value)
                 return True
         return False
 
+    @classmethod
+    def _get_value_verdict(cls, filter_: Filter, line_data: LineData, target: AnalysisTarget) -> bool:
+        """Runs the filter for a value which was not met recently or returns the cached verdict"""
+        key = (filter_, line_data.value)
+        with cls.__verdicts_lock:
+            verdict = cls.__verdicts.get(key)
+            if verdict is not None:
+                cls.__verdicts.move_to_end(key)
+                return verdict
+        verdict = filter_.run(line_data, target)
+        with cls.__verdicts_lock:
+            cls.__verdicts[key] = verdict
+            while cls.VERDICTS_LIMIT < len(cls.__verdicts):
+                cls.__verdicts.popitem(last=False)
+        return verdict
+
     @classmethod
     def get_line_data_list(
             cls,  #
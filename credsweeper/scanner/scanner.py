@@ -1,16 +1,21 @@
+import bisect
 import logging
 import re
 from pathlib import Path
-from typing import List, Type, Tuple, Union, Dict, Generator, Set
+from typing import List, Type, Tuple, Union, Dict, Generator, Set, Iterable, Optional
 
 from credsweeper.app import APP_PATH
 from credsweeper.common.constants import RuleType, MIN_VARIABLE_LENGTH, MIN_SEPARATOR_LENGTH, MIN_VALUE_LENGTH, \
     MAX_LINE_LENGTH, PEM_BEGIN_PATTERN
+from credsweeper.common.keyword_pattern import KeywordPattern
+from credsweeper.common.substring_matcher import SubstringMatcher
 from credsweeper.config import Config
 from credsweeper.credentials import Candidate
 from credsweeper.file_handler.analysis_target import AnalysisTarget
 from credsweeper.file_handler.content_provider import ContentProvider
-from credsweeper.rules import Rule
+from credsweeper.rules import Rule, RulesCache
+from credsweeper.scanner.adaptive_filters import AdaptiveFilters
+from credsweeper.scanner.rules_profiler import RulesProfiler
 from credsweeper.scanner.scan_type import PemKeyPattern, ScanType, SinglePattern, MultiPattern
 from credsweeper.utils import Util
 
@@ -31,6 +36,11 @@ class Scanner:
 
     TargetGroup = List[Tuple[AnalysisTarget, str, int]]
 
+    # amount of targets which are collected for search in whole text
+    BUFFER_TARGETS_LIMIT = 4096
+    # limit of cached merged patterns for combinations of keyword rules
+    KEYWORDS_PATTERNS_LIMIT = 1024
+
     def __init__(self, config: Config, rule_path: Union[None, str, Path]) -> None:
         self.config = config
         # init with MAX_LINE_LENGTH before _set_rules
@@ -38,15 +48,167 @@ class Scanner:
         self.min_pattern_len = MAX_LINE_LENGTH
         self.min_pem_key_len = MAX_LINE_LENGTH
         self.min_multi_len = MAX_LINE_LENGTH
-        self.rules_scanners: List[Tuple[Rule, Type[ScanType]]] = []
+        # optional collector of statistics per rule
+        self.profiler: Optional[RulesProfiler] = None
+        # optional reordering of filters - is not used with profiler to keep the statistics consistent
+        self.adaptive_filters: Optional[AdaptiveFilters] = None
+        self.rules_scanners = []
         self._set_rules_scanners(rule_path)
         self.min_len = min(self.min_pattern_len, self.min_keyword_len, self.min_pem_key_len, self.min_multi_len,
                            MIN_VARIABLE_LENGTH + MIN_SEPARATOR_LENGTH + MIN_VALUE_LENGTH)
-        self.__keyword_rules_required_substrings = self._get_required_substrings(RuleType.KEYWORD)
+
+    @property
+    def rules_scanners(self) -> List[Tuple[Rule, Type[ScanType]]]:
+        """rules_scanners getter"""
+        return self.__rules_scanners
+
+    @rules_scanners.setter
+    def rules_scanners(self, rules_scanners: List[Tuple[Rule, Type[ScanType]]]) -> None:
+        """rules_scanners setter - prepares substring matchers and inverted index for the rules"""
+        self.__rules_scanners = rules_scanners
+        self.__substring_matcher = SubstringMatcher(substring for rule, _ in rules_scanners
+                                                    for substring in rule.required_substrings)
+        self.__keyword_substring_matcher = SubstringMatcher(self._get_required_substrings(RuleType.KEYWORD))
+        self._set_rules_index()
+
+    def _set_rules_index(self) -> None:
+        """Builds inverted index of rules by triggers. Every rule is a bit of integer mask with position in the list.
+
+        The index contains masks of rules for each required substring, rule type, required regex and minimal line
+        length. Masks of rules which may be applied to a line are combined with bitwise operations, so the cost depends
+        on amount of relevant rules instead of whole rule set, and the order of rules is kept.
+
+        """
+        # rules which do not require any substring are candidates for every line
+        self.__free_substrings_mask = 0
+        self.__substring_masks: Dict[str, int] = {}
+        type_masks: Dict[RuleType, int] = {x: 0 for x in RuleType}
+        regex_masks: Dict[re.Pattern, int] = {}
+        length_masks: Dict[int, int] = {}
+        for n, (rule, _) in enumerate(self.rules_scanners):
+            bit = 1 << n
+            if rule.has_required_substrings:
+                for substring in rule.required_substrings:
+                    self.__substring_masks[substring] = self.__substring_masks.get(substring, 0) | bit
+            else:
+                self.__free_substrings_mask |= bit
+            type_masks[rule.rule_type] |= bit
+            if rule.required_regex:
+                regex_masks[rule.required_regex] = regex_masks.get(rule.required_regex, 0) | bit
+            length_masks[rule.min_line_len] = length_masks.get(rule.min_line_len, 0) | bit
+        # separated values are faster than dictionary with enum keys
+        self.__pattern_mask = type_masks[RuleType.PATTERN]
+        self.__keyword_mask = type_masks[RuleType.KEYWORD]
+        self.__pem_key_mask = type_masks[RuleType.PEM_KEY]
+        self.__multi_mask = type_masks[RuleType.MULTI]
+        self.__regex_masks: List[Tuple[re.Pattern, int]] = list(regex_masks.items())
+        # sorted thresholds of line length with cumulative masks of rules which are applicable for the length
+        self.__length_thresholds: List[int] = sorted(length_masks.keys())
+        self.__length_masks: List[int] = []
+        mask = 0
+        for min_line_len in self.__length_thresholds:
+            mask |= length_masks[min_line_len]
+            self.__length_masks.append(mask)
+        # keywords of keyword rules made with the template to be merged in single pattern
+        self.__keywords: Dict[int, str] = {}
+        for n, (rule, _) in enumerate(self.rules_scanners):
+            if RuleType.KEYWORD == rule.rule_type and 1 == len(rule.patterns):
+                if keyword := KeywordPattern.get_keyword(rule.patterns[0]):
+                    self.__keywords[1 << n] = keyword
+        self.__keywords_mask = sum(self.__keywords.keys())
+        self.__keywords_patterns: Dict[int, Optional[re.Pattern]] = {}
+        # pattern rules which are searched in whole text of lines at once
+        self.__buffer_mask = 0
+        self.__buffer_patterns: Dict[int, re.Pattern] = {}
+        if self.config.whole_buffer:
+            for n, (rule, _) in enumerate(self.rules_scanners):
+                if RuleType.PATTERN == rule.rule_type and self._is_buffer_safe(rule.patterns[0]):
+                    self.__buffer_mask |= 1 << n
+                    self.__buffer_patterns[1 << n] = re.compile(rule.patterns[0].pattern,
+                                                                flags=rule.patterns[0].flags | re.MULTILINE)
+
+    @staticmethod
+    def _is_buffer_safe(pattern: re.Pattern) -> bool:
+        """Checks whether the pattern finds a match of a line in whole text as well as in the single line.
+
+        The line in text differs with new line symbol around, so absolute anchors and negative lookarounds which may
+        match the symbol are not allowed. Line anchors are supported with re.MULTILINE flag.
+
+        """
+        source = pattern.pattern
+        if "\\A" in source or "\\Z" in source:
+            return False
+        for lookaround in re.finditer(r"\(\?<?!", source):
+            # extract body of negative lookaround
+            depth = 1
+            pos = lookaround.end()
+            body_start = pos
+            while depth and pos < len(source):
+                if "\\" == source[pos]:
+                    pos += 1
+                elif "[" == source[pos]:
+                    class_end = Scanner._get_class_end(source, pos)
+                    try:
+                        if re.match(source[pos:class_end], "\n", flags=pattern.flags):
+                            return False
+                    except re.error:
+                        return False
+                    pos = class_end - 1
+                elif "(" == source[pos]:
+                    depth += 1
+                elif ")" == source[pos]:
+                    depth -= 1
+                pos += 1
+            body = source[body_start:pos]
+            if re.search(r"\\[sWDn]|\\x0[aA]|\\0?12",
+                         body) or pattern.flags & re.DOTALL and re.search(r"(?<!\\)\.", body):
+                return False
+        return True
+
+    @staticmethod
+    def _get_class_end(source: str, start: int) -> int:
+        """Returns position after character class which begins at the start position"""
+        pos = start + 1
+        if pos < len(source) and "^" == source[pos]:
+            pos += 1
+        if pos < len(source) and "]" == source[pos]:
+            pos += 1
+        while pos < len(source) and "]" != source[pos]:
+            pos += 2 if "\\" == source[pos] else 1
+        return pos + 1
+
+    def _get_rules_mask(
+            self,  #
+            line_len: int,  #
+            matched_pattern: bool,  #
+            matched_keyword: bool,  #
+            matched_pem_key: bool,  #
+            matched_multi: bool) -> int:
+        """returns mask of rules which are applicable for the line length and matched types"""
+        length_index = bisect.bisect_right(self.__length_thresholds, line_len) - 1
+        if 0 > length_index:
+            return 0
+        types_mask = 0
+        if matched_pattern:
+            types_mask |= self.__pattern_mask
+        if matched_keyword:
+            types_mask |= self.__keyword_mask
+        if matched_pem_key:
+            types_mask |= self.__pem_key_mask
+        if matched_multi:
+            types_mask |= self.__multi_mask
+        return self.__length_masks[length_index] & types_mask
+
+    def _yield_masked_rule_scanner(self, mask: int) -> Generator[Tuple[Rule, Type[ScanType]], None, None]:
+        """returns generator for rules and according scanner with the bits in mask in order of rules"""
+        while mask:
+            low_bit = mask & -mask
+            mask ^= low_bit
+            yield self.rules_scanners[low_bit.bit_length() - 1]
 
     def keywords_required_substrings_check(self, text: str) -> bool:
         """check whether `text` has any required substring for all keyword type rules"""
-        return self._substring_check(self.__keyword_rules_required_substrings, text)
+        return self.__keyword_substring_matcher.search(text)
 
     def _get_required_substrings(self, rule_type: RuleType) -> Set[str]:
         """init set of required substrings for custom rule type"""
@@ -55,20 +217,20 @@ class Scanner:
             required_substrings.update(set(rule.required_substrings))
         return required_substrings
 
-    @staticmethod
-    def _substring_check(substrings: Set[str], text: str) -> bool:
-        """checks whether `text` has any required substring. Set is used to reduce extra transformations"""
-        for substring in substrings:
-            if substring in text:
-                return True
-        return False
-
     def _set_rules_scanners(self, rule_path: Union[None, str, Path]) -> None:
         """Auxiliary method to fill rules, determine min_pattern_len and set scanners"""
         if rule_path is None:
             rule_path = APP_PATH / "rules" / "config.yaml"
+        rules_cache: Optional[RulesCache] = None
+        if self.config.rules_cache:
+            rule_data = Util.read_data(rule_path)
+            if rule_data is not None:
+                rules_cache = RulesCache(self.config.rules_cache, self.config, rule_data)
+                if self._load_rules_cache(rules_cache):
+                    return
         rule_templates = Util.yaml_load(rule_path)
         if rule_templates and isinstance(rule_templates, list):
+            rules_scanners: List[Tuple[Rule, Type[ScanType]]] = []
             rule_names = set()
             for rule_template in rule_templates:
                 try:
@@ -93,10 +255,40 @@ class Scanner:
                         self.min_multi_len = min(self.min_multi_len, rule.min_line_len)
                     else:
                         logger.warning(f"Unknown rule type:{rule.rule_type}")
-                self.rules_scanners.append((rule, self.get_scanner(rule)))
+                rules_scanners.append((rule, self.get_scanner(rule)))
+            self.rules_scanners = rules_scanners
+            if rules_cache is not None:
+                rules_cache.save({
+                    "rules_scanners": rules_scanners,
+                    "min_lens": self._get_min_lens(),
+                })
         else:
             raise RuntimeError(f"Wrong rules '{rule_templates}' were read from '{rule_path}'")
 
+    def _get_min_lens(self) -> Tuple[int, int, int, int]:
+        """Minimal line lengths of keyword, pattern, pem key and multi rules"""
+        return self.min_keyword_len, self.min_pattern_len, self.min_pem_key_len, self.min_multi_len
+
+    def _load_rules_cache(self, rules_cache: RulesCache) -> bool:
+        """Sets rules from the cache. Returns False when the cache is absent or inconsistent"""
+        cached = rules_cache.load()
+        if not isinstance(cached, dict):
+            return False
+        try:
+            min_lens = tuple(int(x) for x in cached["min_lens"])
+            rules_scanners = list(cached["rules_scanners"])
+            if 4 != len(min_lens) or not all(
+                    isinstance(rule, Rule) and isinstance(scanner, type) and issubclass(scanner, ScanType)
+                    for rule, scanner in rules_scanners):
+                raise ValueError("Unexpected content")
+        except Exception as exc:
+            logger.debug(f"Rules cache {rules_cache.path} is inconsistent: {exc}")
+            return False
+        self.min_keyword_len, self.min_pattern_len, self.min_pem_key_len, self.min_multi_len = min_lens
+        self.rules_scanners = rules_scanners
+        logger.debug(f"{len(rules_scanners)} rules were loaded from {rules_cache.path}")
+        return True
+
     def _is_available(self, rule: Rule) -> bool:
         """separate the method to reduce complexity"""
         if rule.severity < self.config.severity:
@@ -117,27 +309,32 @@ class Scanner:
             matched_pem_key: bool,  #
             matched_multi: bool) -> Generator[Tuple[Rule, Type[ScanType]], None, None]:
         """returns generator for rules and according scanner"""
-        for rule, scanner in self.rules_scanners:
-            if line_len >= rule.min_line_len \
-                    and (RuleType.PATTERN == rule.rule_type and matched_pattern
-                         or RuleType.KEYWORD == rule.rule_type and matched_keyword
-                         or RuleType.PEM_KEY == rule.rule_type and matched_pem_key
-                         or RuleType.MULTI == rule.rule_type and matched_multi):
-                yield rule, scanner
-
-    def scan(self, provider: ContentProvider) -> List[Candidate]:
-        """Run scanning of list of target lines from 'targets' with set of rule from 'self.rules'.
-
-        Args:
-            provider: objects with data to analyze: line, line number,
-              filepath and all lines in file
-
-        Return:
-            list of all detected credential candidates in analyzed targets
+        yield from self._yield_masked_rule_scanner(
+            self._get_rules_mask(line_len, matched_pattern, matched_keyword, matched_pem_key, matched_multi))
 
-        """
-        credentials: List[Candidate] = []
+    def _get_keywords_pattern(self, keywords_mask: int) -> Optional[re.Pattern]:
+        """Returns merged pattern of keyword rules in the mask. The patterns are compiled for used combinations only"""
+        if keywords_mask in self.__keywords_patterns:
+            return self.__keywords_patterns[keywords_mask]
+        keywords = []
+        mask = keywords_mask
+        while mask:
+            low_bit = mask & -mask
+            mask ^= low_bit
+            keywords.append(self.__keywords[low_bit])
+        try:
+            keywords_pattern: Optional[re.Pattern] = KeywordPattern.get_keywords_pattern(keywords)
+        except re.error as exc:
+            # e.g. duplicated group names in keywords
+            logger.debug("Keywords %s cannot be merged: %s", keywords, exc)
+            keywords_pattern = None
+        if self.KEYWORDS_PATTERNS_LIMIT <= len(self.__keywords_patterns):
+            self.__keywords_patterns.clear()
+        self.__keywords_patterns[keywords_mask] = keywords_pattern
+        return keywords_pattern
 
+    def _yield_targets_masks(self, provider: ContentProvider) -> Generator[Tuple[AnalysisTarget, int], None, None]:
+        """Yields targets of the provider with masks of rules which may be applied according the index"""
         for target in provider.yield_analysis_target(self.min_len):
             # Trim string from outer spaces to make future `x in str` checks faster
             target_line_stripped = target.line_strip
@@ -159,28 +356,107 @@ class Scanner:
                              target.line_num)
                 continue
 
-            # use lower case for required substring
-            target_line_stripped_lower = target.line_lower_strip
-            # cached value to skip the same regex verifying
-            matched_regex: Dict[re.Pattern, bool] = {}
+            rules_mask = self._get_rules_mask(target_line_stripped_len, matched_pattern, matched_keyword,
+                                              matched_pem_key, matched_multi)
+            # all required substrings of the rules are found in lower case line with single pass
+            substrings_mask = self.__free_substrings_mask
+            for substring in self.__substring_matcher.find(target.line_lower_strip):
+                substrings_mask |= self.__substring_masks[substring]
+            rules_mask &= substrings_mask
+            # common regex might be required for several rules - it is verified once and only for remaining rules
+            for required_regex, regex_mask in self.__regex_masks:
+                if rules_mask & regex_mask and not required_regex.search(target_line_stripped):
+                    rules_mask &= ~regex_mask
+            # keyword rules share the template, so merged pattern verifies several of them with single search
+            keywords_mask = rules_mask & self.__keywords_mask
+            if keywords_mask & (keywords_mask - 1):
+                keywords_pattern = self._get_keywords_pattern(keywords_mask)
+                if keywords_pattern and not keywords_pattern.search(target.line):
+                    rules_mask &= ~keywords_mask
+            if rules_mask:
+                yield target, rules_mask
 
-            for rule, scanner in self.yield_rule_scanner(target_line_stripped_len, matched_pattern, matched_keyword,
-                                                         matched_pem_key, matched_multi):
-                if rule.has_required_substrings \
-                        and not self._substring_check(rule.required_substrings, target_line_stripped_lower):
-                    continue
+    def _yield_buffer_targets_masks(
+            self,  #
+            targets_masks: Iterable[Tuple[AnalysisTarget, int]]) -> Generator[Tuple[AnalysisTarget, int], None, None]:
+        """Collects targets with masks into buffer and yields them with masks which are reduced by whole text search"""
+        targets: List[AnalysisTarget] = []
+        masks: List[int] = []
+        for target, rules_mask in targets_masks:
+            targets.append(target)
+            masks.append(rules_mask)
+            if self.BUFFER_TARGETS_LIMIT <= len(targets):
+                self._reduce_buffer_masks(targets, masks)
+                yield from zip(targets, masks)
+                targets.clear()
+                masks.clear()
+        if targets:
+            self._reduce_buffer_masks(targets, masks)
+            yield from zip(targets, masks)
 
-                # common regex might be triggered for the same target
-                if rule.required_regex:
-                    if rule.required_regex in matched_regex:
-                        regex_result = matched_regex[rule.required_regex]
-                    else:
-                        regex_result = bool(rule.required_regex.search(target_line_stripped))
-                        matched_regex[rule.required_regex] = regex_result
-                    if not regex_result:
-                        continue
+    def _reduce_buffer_masks(self, targets: List[AnalysisTarget], masks: List[int]) -> None:
+        """Searches every pattern rule in whole text of the lines where the rule is candidate and resets the rule bit
+        in masks of lines without a match.
+
+        Search from start of the next line after a line with match gives all lines which can be matched, because
+        a match which crosses lines does not hide matches in next lines.
+
+        """
+        buffer_positions: Dict[int, List[int]] = {}
+        for n, (target, rules_mask) in enumerate(zip(targets, masks)):
+            # chunks of long lines are scanned without the whole text search
+            if target.offset is None:
+                buffer_mask = rules_mask & self.__buffer_mask
+                while buffer_mask:
+                    low_bit = buffer_mask & -buffer_mask
+                    buffer_mask ^= low_bit
+                    buffer_positions.setdefault(low_bit, []).append(n)
+        for bit, positions in buffer_positions.items():
+            text = '\n'.join(targets[n].line for n in positions)
+            if text.count('\n') != len(positions) - 1:
+                # a line with new line symbol cannot be mapped back
+                continue
+            line_starts = [0]
+            for n in positions[:-1]:
+                line_starts.append(line_starts[-1] + targets[n].line_len + 1)
+            matched = [False] * len(positions)
+            pattern = self.__buffer_patterns[bit]
+            pos = 0
+            while _match := pattern.search(text, pos):
+                line_index = bisect.bisect_right(line_starts, _match.start()) - 1
+                matched[line_index] = True
+                if len(positions) <= line_index + 1:
+                    break
+                pos = line_starts[line_index + 1]
+            for n, is_matched in zip(positions, matched):
+                if not is_matched:
+                    masks[n] &= ~bit
+
+    def scan(self, provider: ContentProvider) -> List[Candidate]:
+        """Run scanning of list of target lines from 'targets' with set of rule from 'self.rules'.
+
+        Args:
+            provider: objects with data to analyze: line, line number,
+              filepath and all lines in file
 
-                if new_credentials := scanner.run(self.config, rule, target):
+        Return:
+            list of all detected credential candidates in analyzed targets
+
+        """
+        credentials: List[Candidate] = []
+
+        targets_masks: Iterable[Tuple[AnalysisTarget, int]] = self._yield_targets_masks(provider)
+        if self.__buffer_mask:
+            targets_masks = self._yield_buffer_targets_masks(targets_masks)
+
+        runner: Union[None, RulesProfiler, AdaptiveFilters] = self.profiler or self.adaptive_filters
+        for target, rules_mask in targets_masks:
+            for rule, scanner in self._yield_masked_rule_scanner(rules_mask):
+                if runner is None:
+                    new_credentials = scanner.run(self.config, rule, target)
+                else:
+                    new_credentials = runner.run(scanner, self.config, rule, target)
+                if new_credentials:
                     credentials.extend(new_credentials)
                     logger.debug("Credential for rule: %s in file: %s:%d in line: %s", rule.rule_name, target.file_path,
                                  target.line_num, target.line)
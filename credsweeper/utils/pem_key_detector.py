@@ -16,6 +16,8 @@ logger = logging.getLogger(__name__)
 
 class PemKeyDetector:
     """Class to detect PEM PRIVATE keys only"""
+    # amount of lines which are checked for a key from the line with begin pattern
+    MAX_KEY_LINES = 200
     base64set = set(string.ascii_uppercase) | set(string.ascii_lowercase) | set(string.digits) | {'+', '/', '='}
 
     ignore_starts = [PEM_BEGIN_PATTERN, "Proc-Type", "Version", "DEK-Info"]
@@ -48,7 +50,7 @@ class PemKeyDetector:
         line_data.append(first_line)
         # protection check for case when first line starts from 0
         start_pos = target.line_pos if 0 <= target.line_pos else 0
-        finish_pos = min(start_pos + 200, target.lines_len)
+        finish_pos = min(start_pos + cls.MAX_KEY_LINES, target.lines_len)
         begin_pattern_not_passed = True
         for line_pos in range(start_pos, finish_pos):
             line = target.lines[line_pos]
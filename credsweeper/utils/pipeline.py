@@ -0,0 +1,151 @@
+import asyncio
+import collections
+import contextlib
+import itertools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, Callable, Deque, Generator, Iterable, List, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class Pipeline:
+    """Stages of processing which overlap each other with bounded amount of items between the stages"""
+
+    # timeout in seconds to check whether the consumer has stopped
+    POLL_TIMEOUT = 0.1
+
+    @classmethod
+    def yield_ahead(cls, items: Iterable[T], maxsize: int) -> Generator[T, None, None]:
+        """Yields items which are produced in a thread while previous items are processed by the consumer.
+
+        The producer waits when maxsize items are not consumed yet, so the memory is bounded. An exception of
+        the producer is raised in the consumer. The producer is stopped when the generator is closed.
+
+        Args:
+            items: iterable which is iterated in a thread, e.g. walking of directories
+            maxsize: maximal amount of produced items which wait for the consumer
+
+        Return:
+            generator of the items in the same order
+
+        """
+        bounded: queue.Queue = queue.Queue(maxsize=max(1, maxsize))
+        stopped = threading.Event()
+        done = object()
+
+        def put(item) -> bool:
+            """Puts the item to the queue until it is accepted or the consumer is stopped"""
+            while not stopped.is_set():
+                try:
+                    bounded.put(item, timeout=cls.POLL_TIMEOUT)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce() -> None:
+            """Iterates the items in the thread"""
+            try:
+                for item in items:
+                    if not put((item, None)):
+                        return
+                put((done, None))
+            except BaseException as exc:
+                put((done, exc))
+
+        producer = threading.Thread(target=produce, name="pipeline", daemon=True)
+        producer.start()
+        try:
+            while True:
+                item, exc = bounded.get()
+                if item is done:
+                    if exc is not None:
+                        raise exc
+                    break
+                yield item
+        finally:
+            stopped.set()
+            producer.join()
+
+    @staticmethod
+    def yield_mapped(function: Callable[[T], R], items: Iterable[T], threads: int,
+                     ahead: int) -> Generator[R, None, None]:
+        """Yields results of the function for the items in order. The function is applied in threads ahead.
+
+        Suitable for I/O bound functions, e.g. reading of files while previous files are scanned.
+
+        Args:
+            function: function to apply for every item
+            items: iterable of items
+            threads: amount of threads, the function is applied in the consumer thread when it is less than 2
+            ahead: maximal amount of items which are processed before the consumer takes them
+
+        Return:
+            generator of results of the function
+
+        """
+        if 1 >= threads:
+            for item in items:
+                yield function(item)
+            return
+        items_iter = iter(items)
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="pipeline") as executor:
+            pending: Deque[Future] = collections.deque(
+                executor.submit(function, x) for x in itertools.islice(items_iter, max(1, ahead)))
+            try:
+                while pending:
+                    future = pending.popleft()
+                    for item in itertools.islice(items_iter, 1):
+                        pending.append(executor.submit(function, item))
+                    yield future.result()
+            finally:
+                # the generator may be closed before all items were taken
+                for future in pending:
+                    future.cancel()
+
+    @staticmethod
+    def yield_grouped(items: Iterable[T], size_of: Callable[[T], int], max_size: int,
+                      max_len: int) -> Generator[List[T], None, None]:
+        """Yields groups of items in order of appearance, so first groups are processed before all items appear.
+
+        Args:
+            items: iterable of items
+            size_of: function to get size of an item
+            max_size: a group is yielded when total size of its items reaches the value
+            max_len: a group is yielded when amount of its items reaches the value
+
+        Return:
+            generator of lists of items
+
+        """
+        group: List[T] = []
+        group_size = 0
+        for item in items:
+            group.append(item)
+            group_size += size_of(item)
+            if max_size <= group_size or max_len <= len(group):
+                yield group
+                group = []
+                group_size = 0
+        if group:
+            yield group
+
+    @staticmethod
+    def set_future_threadsafe(loop: asyncio.AbstractEventLoop, future: asyncio.Future, result: Any) -> None:
+        """Passes a result from another thread, e.g. the result thread of a pool, to the future in the event loop"""
+        # the loop may be closed after cancellation and an exception must not break the thread
+        with contextlib.suppress(RuntimeError):
+            loop.call_soon_threadsafe(Pipeline._set_future, future, result)
+
+    @staticmethod
+    def _set_future(future: asyncio.Future, result: Any) -> None:
+        """Sets the result to the future unless the future was cancelled. An exception is set as the exception"""
+        if future.done():
+            return
+        if isinstance(result, BaseException):
+            future.set_exception(result)
+        else:
+            future.set_result(result)
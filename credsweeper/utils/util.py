@@ -1,5 +1,6 @@
 import ast
 import base64
+import codecs
 import json
 import logging
 import math
@@ -18,7 +19,7 @@ from lxml import etree
 from typing_extensions import TypedDict
 
 from credsweeper.common.constants import DiffRowType, AVAILABLE_ENCODINGS, \
-    DEFAULT_ENCODING, LATIN_1, CHUNK_SIZE, MAX_LINE_LENGTH, CHUNK_STEP_SIZE
+    DEFAULT_ENCODING, LATIN_1, CHUNK_SIZE, MAX_LINE_LENGTH, CHUNK_STEP_SIZE, UTF_16
 
 logger = logging.getLogger(__name__)
 
@@ -248,6 +249,33 @@ class Util:
                 logger.error(f"Unexpected Error: Can't read content as {encoding}. Error message: {exc}")
         return text
 
+    @staticmethod
+    def detect_encoding(data: bytes) -> Optional[str]:
+        """Detects encoding of beginning of a text the same way as Util.decode_text does for whole text, but
+        an incomplete symbol at the end of the data is allowed. UTF-16 requires BOM.
+
+        Args:
+            data: first bytes of the text
+
+        Return:
+            name of the encoding or None when binary data detected
+
+        """
+        binary_suggest = False
+        for encoding in AVAILABLE_ENCODINGS:
+            if binary_suggest and LATIN_1 == encoding and (Util.is_known(data) or Util.is_binary(data)):
+                logger.warning("Binary file detected")
+                break
+            if UTF_16 == encoding and not data.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+                continue
+            try:
+                codecs.getincrementaldecoder(encoding)(errors="strict").decode(data)
+                return encoding
+            except UnicodeError:
+                binary_suggest = True
+                logger.info(f"UnicodeError: Can't decode content as {encoding}.")
+        return None
+
     @staticmethod
     def decode_bytes(content: bytes, encodings: Optional[List[str]] = None) -> List[str]:
         """Decode content using different encodings.
@@ -1,3 +1,5 @@
+import re
+
 import pytest
 
 from credsweeper.common.keyword_pattern import KeywordPattern
@@ -146,3 +148,26 @@ class TestKeywordPattern:
         pattern = KeywordPattern.get_keyword_pattern("api")
         line_data = LineData(config, line, 0, 1, file_path, "file_type", "info", pattern)
         assert line_data.value is None
+
+    def test_get_keyword_p(self) -> None:
+        for keyword in ["melon", "api(?!tal)", r"(?<!by)pass(?!ed|ing|es|\s+[a-z]{3,80})|pw(d|\b)"]:
+            assert KeywordPattern.get_keyword(KeywordPattern.get_keyword_pattern(keyword)) == keyword
+
+    def test_get_keyword_n(self) -> None:
+        assert KeywordPattern.get_keyword(re.compile("melon")) is None
+        assert KeywordPattern.get_keyword(re.compile(KeywordPattern.get_keyword_pattern("melon").pattern)) is None
+
+    @pytest.mark.parametrize("line",
+                             ["melon = 'banAna'", "pass = 'banAna'", "my_pw := 'banAna'", "x = 1; melon = 'banana'"])
+    def test_get_keywords_pattern_p(self, line: str) -> None:
+        keywords = ["melon", r"(?<!by)pass(?!ed|ing|es|\s+[a-z]{3,80})|pw(d|\b)"]
+        keywords_pattern = KeywordPattern.get_keywords_pattern(keywords)
+        assert any(KeywordPattern.get_keyword_pattern(x).search(line) for x in keywords)
+        assert keywords_pattern.search(line)
+
+    @pytest.mark.parametrize("line", ["melons", "bypass = 'banAna'", "passed = 'banAna'", "lemon = 'banAna'"])
+    def test_get_keywords_pattern_n(self, line: str) -> None:
+        keywords = ["melon", r"(?<!by)pass(?!ed|ing|es|\s+[a-z]{3,80})|pw(d|\b)"]
+        keywords_pattern = KeywordPattern.get_keywords_pattern(keywords)
+        assert not any(KeywordPattern.get_keyword_pattern(x).search(line) for x in keywords)
+        assert not keywords_pattern.search(line)
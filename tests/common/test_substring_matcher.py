@@ -0,0 +1,54 @@
+import random
+from unittest import TestCase
+
+from credsweeper.app import APP_PATH, CredSweeper
+from credsweeper.common.substring_matcher import SubstringMatcher
+from credsweeper.utils import Util
+
+
+class TestSubstringMatcher(TestCase):
+
+    def test_find_p(self):
+        matcher = SubstringMatcher(["key", "keys", "pass", "password", "assw", "wor", "ey"])
+        self.assertSetEqual({"key", "keys", "ey"}, matcher.find("my_keys"))
+        self.assertSetEqual({"pass", "password", "assw", "wor"}, matcher.find("password"))
+        self.assertSetEqual({"key", "ey", "pass"}, matcher.find("key=pass"))
+        self.assertTrue(matcher.search("a_word"))
+
+    def test_find_n(self):
+        matcher = SubstringMatcher(["key", "pass"])
+        self.assertSetEqual(set(), matcher.find(""))
+        self.assertSetEqual(set(), matcher.find("ke pas"))
+        self.assertFalse(matcher.search("ke pas"))
+        self.assertFalse(SubstringMatcher([]).search("key"))
+        self.assertSetEqual(set(), SubstringMatcher([]).find("key"))
+
+    def test_empty_substring_p(self):
+        # empty substring is present in any text
+        matcher = SubstringMatcher(["", "key"])
+        self.assertSetEqual({""}, matcher.find("pass"))
+        self.assertSetEqual({"", "key"}, matcher.find("key"))
+        self.assertTrue(matcher.search(""))
+
+    def test_special_symbols_p(self):
+        matcher = SubstringMatcher(["a.b", "(x", "[y]", "\\", "$", "\n"])
+        self.assertSetEqual({"a.b", "(x", "[y]", "\\", "$", "\n"}, matcher.find("a.b (x [y] \\ $\n"))
+        self.assertSetEqual(set(), matcher.find("axb x y"))
+
+    def test_rules_substrings_p(self):
+        # the matcher must return the same as plain check for every substring of the rules
+        rules = Util.yaml_load(APP_PATH / "rules" / "config.yaml")
+        substrings = set(i.strip().lower() for x in rules for i in x.get("required_substrings", []))
+        matcher = SubstringMatcher(substrings)
+        self.assertSetEqual(substrings, matcher.substrings)
+        random.seed(42)
+        alphabet = ''.join(sorted(set(''.join(substrings)))) + " =:_"
+        for _ in range(1000):
+            text = ''.join(random.choices(alphabet, k=random.randint(0, 40)))
+            text += random.choice(list(substrings)) + random.choice(list(substrings))[:3]
+            self.assertSetEqual(set(x for x in substrings if x in text), matcher.find(text), text)
+
+    def test_scanner_keywords_required_substrings_check_p(self):
+        scanner = CredSweeper().scanner
+        self.assertTrue(scanner.keywords_required_substrings_check("my_password"))
+        self.assertFalse(scanner.keywords_required_substrings_check("nothing"))
@@ -1,6 +1,6 @@
 from unittest import TestCase
 
-from credsweeper.app import APP_PATH
+from credsweeper.app import APP_PATH, CredSweeper
 from credsweeper.utils import Util
 
 
@@ -24,3 +24,20 @@ class ConfigTest(TestCase):
         # all extensions MUST be in lower
         self.assertTrue(all(i.islower() for i in container_set))
         self.assertTrue(all(i.islower() for i in extension_set))
+
+    def test_path_matcher_p(self):
+        config = CredSweeper().config
+        path_matcher = config.path_matcher
+        self.assertIs(path_matcher, config.path_matcher)
+        self.assertTrue(path_matcher.is_excluded_file("/src/.git/config", config.depth, config.doc))
+        # the matcher is compiled again after assignment
+        config.exclude_paths = []
+        self.assertIsNot(path_matcher, config.path_matcher)
+        self.assertFalse(config.path_matcher.is_excluded_file("/src/.git/config", config.depth, config.doc))
+
+    def test_path_matcher_n(self):
+        config = CredSweeper().config
+        path_matcher = config.path_matcher
+        # other attributes do not affect the matcher
+        config.depth = 3
+        self.assertIs(path_matcher, config.path_matcher)
@@ -0,0 +1,86 @@
+import pickle
+import random
+import re
+from unittest import TestCase
+
+from credsweeper.config.path_matcher import PathMatcher
+from credsweeper.utils import Util
+
+
+class PathMatcherTest(TestCase):
+
+    def setUp(self) -> None:
+        self.patterns = [re.compile(r".*\.min\.js", flags=re.IGNORECASE), re.compile(r".*magic.*number.*")]
+        self.paths = ["/.git/", "/node_modules/", "secret.txt"]
+        self.matcher = PathMatcher(self.patterns, self.paths, [".so"], [".gz"], [".pdf"])
+
+    def reference(self, path: str, depth: int, doc: bool) -> bool:
+        """Straightforward check of all rules one by one"""
+        lower_path = path.lower()
+        file_extension = Util.get_extension(lower_path, lower=False)
+        return any(x.match(lower_path) for x in self.patterns) or any(x in path for x in self.paths) \
+            or ".so" == file_extension or (not depth and ".gz" == file_extension) \
+            or (not (depth or doc) and ".pdf" == file_extension)
+
+    def test_is_excluded_file_p(self) -> None:
+        self.assertTrue(self.matcher.is_excluded_file("/src/.git/config", 0, False))
+        self.assertTrue(self.matcher.is_excluded_file("/src/app.MIN.js", 0, False))
+        self.assertTrue(self.matcher.is_excluded_file("/src/MagicNumber.py", 0, False))
+        # the substring crosses the directory boundary
+        self.assertTrue(self.matcher.is_excluded_file("/src/my_secret.txt.py", 0, False))
+        self.assertTrue(self.matcher.is_excluded_file("/src/lib.so", 3, True))
+        self.assertTrue(self.matcher.is_excluded_file("/src/data.gz", 0, True))
+        self.assertTrue(self.matcher.is_excluded_file("/src/doc.pdf", 0, False))
+        # random paths are checked equally to the straightforward way
+        random.seed(42)
+        parts = ["src", ".git", "node_modules", "magic", "number", "secret.txt", "app.min.js", "x.so", "a.gz", "b.pdf"]
+        for _ in range(1000):
+            path = '/'.join(random.choice(parts) for _ in range(random.randint(1, 5)))
+            for depth, doc in ((0, False), (0, True), (1, False)):
+                self.assertEqual(self.reference(path, depth, doc), self.matcher.is_excluded_file(path, depth, doc),
+                                 path)
+
+    def test_is_excluded_file_n(self) -> None:
+        self.assertFalse(self.matcher.is_excluded_file("/src/.github/config", 0, False))
+        self.assertFalse(self.matcher.is_excluded_file("/src/app.js", 0, False))
+        self.assertFalse(self.matcher.is_excluded_file("/src/data.gz", 1, False))
+        self.assertFalse(self.matcher.is_excluded_file("/src/doc.pdf", 0, True))
+        empty_matcher = PathMatcher([], [], [], [], [])
+        self.assertFalse(empty_matcher.is_excluded_file("/.git/config", 0, False))
+        self.assertFalse(empty_matcher.is_excluded_dir("/.git/"))
+
+    def test_is_excluded_dir_p(self) -> None:
+        self.assertTrue(self.matcher.is_excluded_dir("/src/node_modules/"))
+        self.assertTrue(self.matcher.is_excluded_dir("/src/MagicNumbers/"))
+        # cached decision is used for next files of the directory
+        self.assertTrue(self.matcher.is_excluded_file("/src/MagicNumbers/dummy.py", 0, False))
+        # the cache is not pickled
+        restored = pickle.loads(pickle.dumps(self.matcher))
+        self.assertTrue(restored.is_excluded_file("/src/node_modules/dummy.py", 0, False))
+
+    def test_is_excluded_dir_n(self) -> None:
+        self.assertFalse(self.matcher.is_excluded_dir("/src/"))
+        # end of text anchor may not match files in the directory
+        matcher = PathMatcher([re.compile(r".*/magic/$")], [], [], [], [])
+        self.assertFalse(matcher.is_excluded_dir("/src/magic/"))
+        self.assertFalse(matcher.is_excluded_file("/src/magic/dummy.py", 0, False))
+
+    def test_combine_patterns_p(self) -> None:
+        combined = PathMatcher.combine_patterns(self.patterns + [re.compile(r".*test.*", flags=re.DOTALL)])
+        self.assertEqual(1, len(combined))
+        self.assertTrue(combined[0].match("app.MIN.JS"))
+        self.assertFalse(combined[0].match("MAGIC_NUMBER"))
+        self.assertTrue(combined[0].match("a\ntest"))
+
+    def test_combine_patterns_n(self) -> None:
+        self.assertListEqual([], PathMatcher.combine_patterns([]))
+        # backreference and verbose pattern are kept separately
+        backreference = re.compile(r"(.)\1")
+        verbose = re.compile(r"a # comment", flags=re.VERBOSE)
+        combined = PathMatcher.combine_patterns(self.patterns + [backreference, verbose])
+        self.assertEqual(3, len(combined))
+        self.assertIn(backreference, combined)
+        self.assertIn(verbose, combined)
+        # global flag in a pattern cannot be combined
+        global_flag = [re.compile(r"(?i)abc"), re.compile(r"def")]
+        self.assertListEqual(global_flag, PathMatcher.combine_patterns(global_flag))
@@ -1,3 +1,4 @@
+import pickle
 import re
 import string
 import unittest
@@ -216,3 +217,44 @@ class TestLineDataStartEnd(unittest.TestCase):
             "",
             LineData(None, "[{(extra-cleaned-value password=}}]})]}}])", 0, 1, "", "", "",
                      re.compile(r".*(?P<variable>password)(?P<separator>=)(?P<value>.+)")).value)
+
+    def test_slots_n(self) -> None:
+        line_data = LineData(None, "password = 'Xdj@jcN834b'", 0, 1, "", "", "",
+                             re.compile(r"(?P<variable>password) = (?P<value>.+)"))
+        self.assertFalse(hasattr(line_data, "__dict__"))
+        with self.assertRaises(AttributeError):
+            line_data.unknown = 1  # type: ignore
+
+    def test_pickle_p(self) -> None:
+        line_data = LineData(None, "password = 'Xdj@jcN834b'", 0, 1, "path", "ext", "info",
+                             re.compile(r"(?P<variable>password) (?P<separator>=) (?P<value>.+)"))
+        restored = pickle.loads(pickle.dumps(line_data))
+        for slot in LineData.__slots__:
+            self.assertEqual(getattr(line_data, slot), getattr(restored, slot), slot)
+        self.assertEqual("'Xdj@jcN834b'", restored.value)
+        self.assertEqual("password", restored.variable)
+
+    def test_record_p(self) -> None:
+        line_data = LineData(None, "password = 'Xdj@jcN834b'", 0, 1, "path", "ext", "info",
+                             re.compile(r"(?P<variable>password) (?P<separator>=) (?P<value>.+)"))
+        restored = LineData.from_record(None, pickle.loads(pickle.dumps(line_data.to_record())))
+        for slot in LineData.__slots__:
+            self.assertEqual(getattr(line_data, slot), getattr(restored, slot), slot)
+
+    def test_lazy_quoted_p(self) -> None:
+        line_data = LineData(None, '"password = Xdj@jcN834b"', 0, 1, "", "", "",
+                             re.compile(r"(?P<variable>password) (?P<separator>=) (?P<value>[^\"]+)"))
+        # the check is not required for sanitizing of the value
+        self.assertIsNone(line_data._is_quoted)
+        self.assertTrue(line_data.is_quoted)
+        self.assertTrue(line_data._is_quoted)
+        self.assertFalse(line_data.is_well_quoted_value)
+
+    def test_absent_groups_n(self) -> None:
+        line_data = LineData(None, "Xdj@jcN834b", 0, 1, "", "", "", re.compile(r"(?P<value>.+)"))
+        self.assertEqual("Xdj@jcN834b", line_data.value)
+        self.assertIsNone(line_data.variable)
+        self.assertIsNone(line_data.separator)
+        self.assertEqual(LineData.EXCEPTION_POSITION, line_data.variable_start)
+        self.assertEqual(LineData.EXCEPTION_POSITION, line_data.separator_end)
+        self.assertFalse(line_data.is_well_quoted_value)
@@ -0,0 +1,44 @@
+import unittest
+
+from credsweeper.file_handler.analysis_target import AnalysisTarget
+from tests.filters.conftest import DUMMY_DESCRIPTOR
+
+
+class TestAnalysisTarget(unittest.TestCase):
+
+    def test_slots_n(self) -> None:
+        target = AnalysisTarget(0, ["  Password = X3dj@cN84b  "], None, DUMMY_DESCRIPTOR)
+        self.assertFalse(hasattr(target, "__dict__"))
+        with self.assertRaises(AttributeError):
+            target.line_num = 42  # type: ignore
+
+    def test_line_p(self) -> None:
+        target = AnalysisTarget(0, ["  Password = X3dj@cN84b  "], None, DUMMY_DESCRIPTOR)
+        self.assertEqual("  Password = X3dj@cN84b  ", target.line)
+        self.assertEqual(25, target.line_len)
+        self.assertEqual("Password = X3dj@cN84b", target.line_strip)
+        self.assertEqual(21, target.line_strip_len)
+        self.assertEqual("  password = x3dj@cn84b  ", target.line_lower)
+        self.assertEqual("password = x3dj@cn84b", target.line_lower_strip)
+        # the value is kept after first access
+        self.assertIs(target.line_lower_strip, target.line_lower_strip)
+        self.assertIsNone(target.offset)
+
+    def test_chunk_p(self) -> None:
+        target = AnalysisTarget(0, ["0123456789"], None, DUMMY_DESCRIPTOR, line="345", offset=3)
+        self.assertEqual("345", target.line)
+        self.assertEqual(3, target.line_len)
+        self.assertEqual(3, target.offset)
+        self.assertListEqual(["0123456789"], target.lines)
+
+    def test_line_num_p(self) -> None:
+        lines = ["a", "b", "c"]
+        # implicit plain numeration
+        target = AnalysisTarget(2, lines, None, DUMMY_DESCRIPTOR)
+        self.assertEqual(3, target.line_num)
+        self.assertListEqual([1, 2, 3], list(target.line_nums))
+        self.assertEqual(3, target.lines_len)
+        # remapped numeration
+        target = AnalysisTarget(2, lines, [7, 42, 13], DUMMY_DESCRIPTOR)
+        self.assertEqual(13, target.line_num)
+        self.assertListEqual([7, 42, 13], target.line_nums)
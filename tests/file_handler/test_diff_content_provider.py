@@ -104,3 +104,21 @@ class TestDiffContentProvider(unittest.TestCase):
     def test_data_n(self) -> None:
         with self.assertRaises(NotImplementedError):
             _ = DiffContentProvider("file_path", DiffRowType.ADDED, []).data
+
+    def test_size_p(self) -> None:
+        diff = [
+            DiffDict({
+                "old": None,
+                "new": 2,
+                "line": "new line",
+                "hunk": 1
+            }),
+            DiffDict({
+                "old": 2,
+                "new": None,
+                "line": "moved line",
+                "hunk": 1
+            })
+        ]
+        self.assertEqual(18, DiffContentProvider("file_path", DiffRowType.ADDED, diff).size)
+        self.assertEqual(0, DiffContentProvider("file_path", DiffRowType.ADDED, []).size)
@@ -2,6 +2,7 @@ import os.path
 import re
 import tempfile
 import unittest
+from pathlib import Path
 from typing import List
 from unittest import mock
 
@@ -10,7 +11,7 @@ from humanfriendly import parse_size
 
 from credsweeper.config import Config
 from credsweeper.file_handler.file_path_extractor import FilePathExtractor
-from tests import AZ_STRING
+from tests import AZ_STRING, SAMPLES_PATH
 
 
 class TestFilePathExtractor(unittest.TestCase):
@@ -195,3 +196,140 @@ class TestFilePathExtractor(unittest.TestCase):
             paths = FilePathExtractor.get_file_paths(self.config, tmp_dir)
             self.assertEqual(1, len(paths))
             self.assertEqual(target_path, paths[0])
+
+    def test_yield_file_paths_p(self) -> None:
+        generator = FilePathExtractor.yield_file_paths(self.config, SAMPLES_PATH)
+        # the first file is obtained before the walking is done
+        self.assertTrue(os.path.isfile(next(generator)))
+        generator.close()
+        self.assertListEqual(FilePathExtractor.get_file_paths(self.config, SAMPLES_PATH),
+                             list(FilePathExtractor.yield_file_paths(self.config, SAMPLES_PATH)))
+
+    def test_yield_file_paths_n(self) -> None:
+        self.assertListEqual([], list(FilePathExtractor.yield_file_paths(self.config, "not_existed_path")))
+
+    def test_check_exclude_dir_p(self) -> None:
+        self.config.exclude_paths = ["/.git/", "/node_modules/"]
+        self.config.exclude_patterns = [re.compile(r".*/magic[^/]*/")]
+        self.assertTrue(FilePathExtractor.check_exclude_dir(self.config, "/tmp/.git"))
+        self.assertTrue(FilePathExtractor.check_exclude_dir(self.config, "C:\\src\\node_modules\\"))
+        self.assertTrue(FilePathExtractor.check_exclude_dir(self.config, "/tmp/MagicNumbers"))
+        # a file of the directory is excluded too
+        self.assertTrue(FilePathExtractor.check_exclude_file(self.config, "/tmp/MagicNumbers/dummy.py"))
+        # not allowed path pattern
+        self.assertTrue(FilePathExtractor.check_exclude_dir(self.config, "/tmp/makefiles"))
+        self.assertTrue(FilePathExtractor.check_exclude_file(self.config, "/tmp/makefiles/dummy.py"))
+
+    def test_check_exclude_dir_n(self) -> None:
+        self.config.exclude_paths = ["/.git/"]
+        self.assertFalse(FilePathExtractor.check_exclude_dir(self.config, "/tmp/.github"))
+        self.assertFalse(FilePathExtractor.check_exclude_dir(self.config, "/tmp/.GIT"))
+        # the pattern may not match files in the directory, so it is not applied
+        self.config.exclude_patterns = [re.compile(r".*/magic/$"), re.compile(r".*/magic/(?!dummy)")]
+        self.assertFalse(FilePathExtractor.check_exclude_dir(self.config, "/tmp/magic"))
+        self.assertFalse(FilePathExtractor.check_exclude_file(self.config, "/tmp/magic/dummy.py"))
+
+    def test_walk_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for sub_path in ["a/b/c/file.txt", "a/file.txt", "a/.git/config", "d/e/file.txt", "d/small.txt"]:
+                os.makedirs(os.path.dirname(os.path.join(tmp_dir, sub_path)), exist_ok=True)
+                with open(os.path.join(tmp_dir, sub_path), "w") as f:
+                    f.write("x" if "small" in sub_path else AZ_STRING)
+            os.symlink(os.path.join(tmp_dir, "a"), os.path.join(tmp_dir, "s_dir_link"))
+            os.symlink(os.path.join(tmp_dir, "a", "file.txt"), os.path.join(tmp_dir, "s_link"))
+            self.config.exclude_paths = ["/.git/"]
+            expected = []
+            for dirpath, _, filenames in os.walk(tmp_dir):
+                if "/.git" not in dirpath:
+                    # symbolic links and too small files are skipped
+                    expected.append((dirpath, [x for x in filenames if "file.txt" == x]))
+            for threads in (1, 3):
+                walked = [(x, sorted(y)) for x, y in FilePathExtractor.walk(self.config, tmp_dir, threads=threads)]
+                # same order as os.walk and the excluded directory is not walked
+                self.assertListEqual(expected, walked)
+                self.assertListEqual(
+                    FilePathExtractor.get_file_paths(self.config, tmp_dir),
+                    list(FilePathExtractor.yield_file_paths(self.config, tmp_dir, walk_threads=threads)))
+            with mock.patch.object(FilePathExtractor, "list_directory", side_effect=FilePathExtractor.list_directory) \
+                    as mock_list:
+                self.assertEqual(3, len(FilePathExtractor.get_file_paths(self.config, tmp_dir)))
+            self.assertNotIn(os.path.join(tmp_dir, "a", ".git"), [x.args[1] for x in mock_list.call_args_list])
+
+    def test_walk_n(self) -> None:
+        self.assertListEqual([], FilePathExtractor.list_directory(self.config, "not_existed_path")[0])
+        generator = FilePathExtractor.walk(self.config, str(SAMPLES_PATH), threads=4)
+        self.assertEqual(str(SAMPLES_PATH), next(generator)[0])
+        # the threads are stopped
+        generator.close()
+        self.config.exclude_paths = ["/samples/"]
+        self.assertListEqual([], FilePathExtractor.get_file_paths(self.config, SAMPLES_PATH))
+
+    def test_skip_ignored_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            git.Repo.init(tmp_dir)
+            with open(os.path.join(tmp_dir, ".gitignore"), "w") as f:
+                f.write("build/\n*.log\n!keep.log\n")
+            for sub_path in ["build/sub/file.txt", "src/file.txt", "src/file.log", "src/keep.log"]:
+                os.makedirs(os.path.dirname(os.path.join(tmp_dir, sub_path)), exist_ok=True)
+                with open(os.path.join(tmp_dir, sub_path), "w") as f:
+                    f.write(AZ_STRING)
+            self.config.exclude_paths = ["/.git/"]
+            check_ignored = FilePathExtractor.check_ignored
+            with mock.patch.object(FilePathExtractor, "check_ignored", side_effect=check_ignored) as mock_check:
+                paths = list(FilePathExtractor.yield_file_paths(self.config, tmp_dir, skip_ignored=True))
+            expected = [os.path.join(tmp_dir, x) for x in [".gitignore", "src/file.txt", "src/keep.log"]]
+            self.assertListEqual(expected, sorted(paths))
+            # the ignored directory is pruned, so its files are not checked
+            checked_dirs = [x.args[0] for x in mock_check.call_args_list]
+            self.assertNotIn(os.path.join(tmp_dir, "build"), checked_dirs)
+            self.assertNotIn(os.path.join(tmp_dir, "build", "sub"), checked_dirs)
+            self.assertEqual(5, len(FilePathExtractor.get_file_paths(self.config, tmp_dir)))
+            self.assertFalse(FilePathExtractor.is_valid_path(os.path.join(tmp_dir, "build", "sub", "file.txt")))
+            self.assertListEqual([True, False, True],
+                                 FilePathExtractor.check_ignored(tmp_dir, ["build", "src", "x.log"]))
+
+    def test_skip_ignored_n(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # the directory is outside any repository or inside the repository of tests
+            if FilePathExtractor.locate_repo(Path(tmp_dir)) is None:
+                self.assertListEqual([False, False], FilePathExtractor.check_ignored(tmp_dir, ["file.log", "build"]))
+            self.assertListEqual([], FilePathExtractor.check_ignored(tmp_dir, []))
+            self.assertListEqual([], list(FilePathExtractor.yield_file_paths(self.config, tmp_dir, skip_ignored=True)))
+            # nested repository has own rules
+            repo_dir = os.path.join(tmp_dir, "repo")
+            git.Repo.init(repo_dir)
+            with open(os.path.join(repo_dir, ".gitignore"), "w") as f:
+                f.write("*.log\n")
+            nested_dir = os.path.join(repo_dir, "nested")
+            git.Repo.init(nested_dir)
+            with open(os.path.join(nested_dir, ".gitignore"), "w") as f:
+                f.write("*.txt\n")
+            self.assertListEqual([True, False], FilePathExtractor.check_ignored(repo_dir, ["file.log", "file.txt"]))
+            self.assertListEqual([False, True], FilePathExtractor.check_ignored(nested_dir, ["file.log", "file.txt"]))
+            # git directory of a linked worktree is located as a repository with the working tree elsewhere
+            repo = git.Repo(repo_dir)
+            repo.index.commit("dummy")
+            repo.git.worktree("add", os.path.join(tmp_dir, "worktree"))
+            worktree_git_dir = os.path.join(repo_dir, ".git", "worktrees", "worktree")
+            self.assertListEqual([False], FilePathExtractor.check_ignored(worktree_git_dir, ["file.log"]))
+
+    @unittest.skipUnless(hasattr(os, "fork"), "fork is not available")
+    def test_located_repos_fork_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            git.Repo.init(tmp_dir)
+            self.assertTrue(FilePathExtractor.is_valid_path(os.path.join(tmp_dir, "file.py")))
+            located_repos = FilePathExtractor.located_repos
+            self.assertIn(Path(tmp_dir), located_repos)
+            read_fd, write_fd = os.pipe()
+            pid = os.fork()
+            if 0 == pid:
+                # the child process locates own repositories and keeps the inherited untouched
+                code = 0 if not FilePathExtractor.located_repos and not FilePathExtractor.ignore_checkers \
+                    and any(located_repos is x for x in FilePathExtractor.inherited_repos) else 1
+                os.write(write_fd, bytes([code]))
+                os._exit(code)
+            os.close(write_fd)
+            self.assertEqual(b"\x00", os.read(read_fd, 1))
+            os.close(read_fd)
+            os.waitpid(pid, 0)
+            self.assertIs(located_repos, FilePathExtractor.located_repos)
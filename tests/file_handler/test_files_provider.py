@@ -1,11 +1,14 @@
 import io
 import os
 import tempfile
+import threading
 import unittest
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+from credsweeper.config.path_matcher import PathMatcher
 from credsweeper.file_handler.files_provider import FilesProvider
+from credsweeper.file_handler.streaming_text_content_provider import StreamingTextContentProvider
 from tests import AZ_DATA, AZ_STRING
 
 
@@ -25,6 +28,7 @@ class TestFilesProvider(unittest.TestCase):
             config.exclude_patterns.return_value = []
             config.exclude_paths.return_value = []
             config.exclude_extensions.return_value = []
+            config.path_matcher = PathMatcher([], [], [], [], [])
             config.depth.return_value = True
 
             file_providers_str = FilesProvider([str(sample_path)])
@@ -80,3 +84,90 @@ class TestFilesProvider(unittest.TestCase):
         provider = FilesProvider([io_data])
         self.assertEqual(1, len(provider.get_scannable_files(config)))
         config.assert_not_called()
+
+    def test_get_scannable_files_shard_p(self) -> None:
+        config = MagicMock()
+        config.not_allowed_path_pattern.match.return_value = False
+        config.exclude_patterns.return_value = []
+        config.exclude_paths.return_value = []
+        config.exclude_extensions.return_value = []
+        config.path_matcher = PathMatcher([], [], [], [], [])
+        config.depth.return_value = True
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for i in range(30):
+                with open(os.path.join(tmp_dir, f"sample_{i}"), "wb") as f:
+                    f.write(AZ_DATA)
+            expected = sorted(x.file_path for x in FilesProvider([tmp_dir]).get_scannable_files(config))
+            self.assertEqual(30, len(expected))
+            shards = [[x.file_path for x in FilesProvider([tmp_dir], shard=(i, 3)).get_scannable_files(config)]
+                      for i in range(3)]
+            # every file belongs to single shard
+            self.assertListEqual(expected, sorted(x for y in shards for x in y))
+            self.assertTrue(all(shards))
+            # the partition is stable
+            self.assertListEqual(
+                shards[1], [x.file_path for x in FilesProvider([tmp_dir], shard=(1, 3)).get_scannable_files(config)])
+
+    def test_get_scannable_files_shard_spelling_p(self) -> None:
+        config = MagicMock()
+        config.not_allowed_path_pattern.match.return_value = False
+        config.path_matcher = PathMatcher([], [], [], [], [])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.makedirs(os.path.join(tmp_dir, "src"))
+            for i in range(30):
+                with open(os.path.join(tmp_dir, "src", f"sample_{i}"), "wb") as f:
+                    f.write(AZ_DATA)
+            # equivalent spellings of the scanned directory give the same partition
+            spellings = [tmp_dir, tmp_dir + os.sep, os.path.relpath(tmp_dir), os.path.join(tmp_dir, ".", "src", "..")]
+            partitions = [[
+                sorted(
+                    os.path.relpath(x.file_path, y)
+                    for x in FilesProvider([y], shard=(i, 3)).get_scannable_files(config)) for i in range(3)
+            ] for y in spellings]
+            self.assertTrue(all(partitions[0]))
+            for partition in partitions[1:]:
+                self.assertListEqual(partitions[0], partition)
+            # a file gives the same key for any spelling
+            file_path = os.path.join(tmp_dir, "src", "sample_1")
+            expected = FilesProvider.get_shard_key(file_path, tmp_dir)
+            self.assertEqual("src/sample_1", expected)
+            self.assertEqual(expected, FilesProvider.get_shard_key(os.path.relpath(file_path),
+                                                                   os.path.relpath(tmp_dir)))
+            self.assertEqual(
+                expected, FilesProvider.get_shard_key(os.path.join(tmp_dir, ".", "src", "sample_1"), tmp_dir + os.sep))
+            self.assertEqual("sample_1", FilesProvider.get_shard_key(file_path, file_path))
+            self.assertEqual("src/a.py", FilesProvider.get_shard_key("./src/a.py"))
+
+    def test_get_scannable_files_shard_n(self) -> None:
+        provider = FilesProvider([io.BytesIO(AZ_DATA)], shard=(0, 1))
+        self.assertEqual(1, len(provider.get_scannable_files(MagicMock())))
+        self.assertTrue(FilesProvider([]).is_in_shard("any"))
+        in_shard = [FilesProvider([], shard=(i, 2)).is_in_shard("any") for i in range(2)]
+        self.assertListEqual([True, False], sorted(in_shard, reverse=True))
+
+    def test_get_scannable_files_stream_p(self) -> None:
+        config = MagicMock()
+        config.path_matcher = PathMatcher([], [], [], [], [])
+        with patch("sys.stdin") as stdin_mock:
+            stdin_mock.buffer = io.BytesIO(AZ_DATA)
+            providers = FilesProvider(["-"]).get_scannable_files(config)
+            self.assertEqual(1, len(providers))
+            self.assertIsInstance(providers[0], StreamingTextContentProvider)
+            self.assertListEqual([AZ_STRING], [x.line for x in providers[0].yield_analysis_target(0)])
+
+    @unittest.skipUnless(hasattr(os, "mkfifo"), "FIFO is not supported")
+    def test_get_scannable_files_fifo_p(self) -> None:
+        config = MagicMock()
+        config.path_matcher = PathMatcher([], [], [], [], [])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            fifo_path = os.path.join(tmp_dir, "fifo")
+            os.mkfifo(fifo_path)
+            providers = FilesProvider([fifo_path]).get_scannable_files(config)
+            self.assertEqual(1, len(providers))
+            self.assertIsInstance(providers[0], StreamingTextContentProvider)
+            writer = threading.Thread(target=Path(fifo_path).write_bytes, args=(AZ_DATA, ))
+            writer.start()
+            self.assertListEqual([AZ_STRING], [x.line for x in providers[0].yield_analysis_target(0)])
+            writer.join()
+            # FIFO in a directory is not scanned
+            self.assertListEqual([], FilesProvider([tmp_dir]).get_scannable_files(config))
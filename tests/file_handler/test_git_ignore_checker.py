@@ -0,0 +1,40 @@
+import os
+import tempfile
+import unittest
+
+import git
+
+from credsweeper.file_handler.git_ignore_checker import GitIgnoreChecker
+
+
+class TestGitIgnoreChecker(unittest.TestCase):
+
+    def test_check_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            repo = git.Repo.init(tmp_dir)
+            with open(os.path.join(tmp_dir, ".gitignore"), "w") as f:
+                f.write("*.log\n!keep.log\n")
+            checker = GitIgnoreChecker(repo)
+            names = [f"file_{i}.{'log' if i % 3 else 'txt'}" for i in range(3 * GitIgnoreChecker.PORTION_SIZE)]
+            names.append("keep.log")
+            expected = [x.endswith(".log") and "keep.log" != x for x in names]
+            self.assertListEqual(expected, checker.check([os.path.join(tmp_dir, x) for x in names]))
+            # the session is reused
+            self.assertListEqual([True], checker.check([os.path.join(tmp_dir, "next.log")]))
+            checker.close()
+            self.assertListEqual([False], checker.check([os.path.join(tmp_dir, "next.txt")]))
+            checker.close()
+
+    def test_check_n(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            repo = git.Repo.init(os.path.join(tmp_dir, "repo"))
+            checker = GitIgnoreChecker(repo)
+            self.assertListEqual([], checker.check([]))
+            # git fails for a path outside the repository, so the path is not ignored
+            with self.assertLogs(level="ERROR"):
+                self.assertListEqual([False, False],
+                                     checker.check([os.path.join(tmp_dir, "x.log"),
+                                                    os.path.join(tmp_dir, "y.log")]))
+            # new session is started after the failure
+            self.assertListEqual([False], checker.check([os.path.join(tmp_dir, "repo", "x.log")]))
+            checker.close()
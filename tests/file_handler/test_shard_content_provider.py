@@ -0,0 +1,90 @@
+import mmap
+import os
+import tempfile
+import unittest
+
+from credsweeper.file_handler.byte_content_provider import ByteContentProvider
+from credsweeper.file_handler.shard_content_provider import ShardContentProvider
+from credsweeper.file_handler.text_content_provider import TextContentProvider
+
+
+class TestShardContentProvider(unittest.TestCase):
+
+    def setUp(self):
+        lines = [f"line {x} {'#' * (x % 7)}" for x in range(300)]
+        # all kinds of line breaks are used
+        self.data = '\n'.join(lines[:100]).encode() + b"\r\n" + '\r\n'.join(lines[100:200]).encode() + b"\r" \
+            + '\r'.join(lines[200:]).encode() + b"\n"
+
+    def assert_targets(self, provider, shards) -> None:
+        expected = [(x.line_num, x.line) for x in provider.yield_analysis_target(0)]
+        targets = [(x.line_num, x.line) for y in shards for x in y.yield_analysis_target(0)]
+        self.assertListEqual(expected, targets)
+        for shard in shards:
+            for target in shard.yield_analysis_target(0):
+                # lines around are kept in plain numeration
+                self.assertEqual(target.line, target.lines[target.line_pos])
+                self.assertEqual(target.line_nums[0] + target.line_pos, target.line_num)
+
+    def test_split_p(self) -> None:
+        provider = ByteContentProvider(self.data, file_path="dump.sql")
+        for shard_size in (100, 333, 1000):
+            shards = provider.get_shards(shard_size, 10, 200)
+            self.assertLess(1, len(shards))
+            self.assertTrue(all(isinstance(x, ShardContentProvider) for x in shards))
+            self.assertTrue(all("dump.sql" == x.file_path and ".sql" == x.file_type for x in shards))
+            self.assert_targets(provider, shards)
+
+    def test_split_encoding_p(self) -> None:
+        # latin-1 text and UTF-8 text with an invalid byte far from the beginning are split without whole decoding
+        for data in (self.data.replace(b"#", b"\xa3"), self.data + b"\xa3" + self.data):
+            provider = ByteContentProvider(data, file_path="dump.sql")
+            shards = provider.get_shards(333, 10, 200)
+            self.assertLess(1, len(shards))
+            self.assert_targets(provider, shards)
+
+    def test_split_file_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "dump.sql")
+            with open(file_path, "wb") as f:
+                f.write(self.data)
+            provider = TextContentProvider(file_path)
+            shards = provider.get_shards(500, 0, 0)
+            self.assertLess(1, len(shards))
+            # shards without lines around do not overlap
+            self.assertEqual(len(self.data), sum(x.size for x in shards))
+            self.assert_targets(provider, shards)
+
+    def test_split_mmap_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "dump.sql")
+            with open(file_path, "wb") as f:
+                f.write(self.data)
+            provider = TextContentProvider(file_path)
+            shards = provider.get_shards(333, 10, 200)
+            self.assertLess(1, len(shards))
+            self.assert_targets(provider, shards)
+            self.assertListEqual([x.data for x in ByteContentProvider(self.data).get_shards(333, 10, 200)],
+                                 [x.data for x in shards])
+            # the mapped file, the opened file and the content give same boundaries
+            with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                expected = ShardContentProvider._get_boundaries(self.data, len(self.data), 333)
+                self.assertListEqual(expected, ShardContentProvider._get_boundaries(mapped, len(self.data), 333))
+                self.assertListEqual(expected, ShardContentProvider._get_boundaries(f, len(self.data), 333))
+
+    def test_split_n(self) -> None:
+        # small content
+        provider = ByteContentProvider(self.data)
+        self.assertListEqual([provider], provider.get_shards(len(self.data), 10, 200))
+        # no line breaks
+        provider = ByteContentProvider(b'x' * 1000)
+        self.assertListEqual([provider], provider.get_shards(100, 10, 200))
+        # a byte of line break may be a part of other symbol in UTF-16
+        provider = ByteContentProvider(self.data.decode().encode("utf_16"))
+        self.assertListEqual([provider], provider.get_shards(100, 10, 200))
+        # binary data
+        provider = ByteContentProvider(b"\x01\x02\xff\n" * 1000)
+        self.assertListEqual([provider], provider.get_shards(100, 10, 200))
+        # structured data
+        provider = TextContentProvider(("dump.xml", None))
+        self.assertListEqual([provider], provider.get_shards(100, 10, 200))
@@ -0,0 +1,138 @@
+import io
+import pickle
+import unittest
+from typing import List, Tuple
+from unittest.mock import patch, PropertyMock
+
+from credsweeper.app import CredSweeper
+from credsweeper.common.constants import OVERLAP_SIZE
+from credsweeper.file_handler.byte_content_provider import ByteContentProvider
+from credsweeper.file_handler.streaming_text_content_provider import StreamingTextContentProvider
+from credsweeper.file_handler.text_content_provider import TextContentProvider
+from credsweeper.scanner.scan_type.multi_pattern import MultiPattern
+from credsweeper.utils.pem_key_detector import PemKeyDetector
+from tests import SAMPLES_PATH
+
+
+class TestStreamingTextContentProvider(unittest.TestCase):
+
+    def setUp(self):
+        lines = [f"line {x} {'#' * (x % 7)}" for x in range(900)]
+        # all kinds of line breaks are used
+        self.data = '\n'.join(lines[:300]).encode() + b"\r\n" + '\r\n'.join(lines[300:600]).encode() + b"\r" \
+            + '\r'.join(lines[600:]).encode() + b"\n"
+
+    def test_window_lines_p(self) -> None:
+        self.assertLessEqual(MultiPattern.MAX_SEARCH_MARGIN, StreamingTextContentProvider.LINES_BEFORE)
+        self.assertLessEqual(max(MultiPattern.MAX_SEARCH_MARGIN, PemKeyDetector.MAX_KEY_LINES),
+                             StreamingTextContentProvider.LINES_AFTER)
+
+    def test_yield_analysis_target_p(self) -> None:
+        before, after = StreamingTextContentProvider.LINES_BEFORE, StreamingTextContentProvider.LINES_AFTER
+        for data in (self.data, self.data.rstrip(), b"\n", b"line"):
+            expected = [(x.line_num, x.line, x.lines[max(0, x.line_pos - before):x.line_pos + 1 + after])
+                        for x in TextContentProvider(("dump.txt", io.BytesIO(data))).yield_analysis_target(0)]
+            for block_size in (1, 100, 1 << 20):
+                with patch.object(StreamingTextContentProvider, "BLOCK_SIZE", block_size):
+                    provider = StreamingTextContentProvider("dump.txt", stream=io.BytesIO(data))
+                    targets = [(x.line_num, x.line, x.lines[max(0, x.line_pos - before):x.line_pos + 1 + after])
+                               for x in provider.yield_analysis_target(0)]
+                self.assertListEqual(expected, targets)
+
+    def test_yield_analysis_target_encoding_p(self) -> None:
+        text = '\n'.join(f"пароль {x} = '{'Ж' * (x % 5)}'\r" for x in range(300))
+        for data in (text.encode("utf_8"), text.encode("utf_16")):
+            expected = [
+                (x.line_num, x.line) for x in TextContentProvider(("dump.txt", io.BytesIO(data)))  #
+                .yield_analysis_target(0)
+            ]
+            self.assertLess(300, len(expected))
+            # multibyte symbols and UTF-16 line breaks are split between blocks
+            for block_size in (1, 3, 100, 1 << 20):
+                with patch.object(StreamingTextContentProvider, "BLOCK_SIZE", block_size):
+                    provider = StreamingTextContentProvider("dump.txt", stream=io.BytesIO(data))
+                    self.assertListEqual(expected, [(x.line_num, x.line) for x in provider.yield_analysis_target(0)])
+
+    def test_yield_lines_without_line_break_p(self) -> None:
+        cred_sweeper = CredSweeper(ml_threshold=0)
+
+        def scan(provider: TextContentProvider) -> List[Tuple[str, int, str, int]]:
+            cred_sweeper.credential_manager.set_credentials(cred_sweeper.file_scan(provider))
+            # duplicates from overlaps of chunks and pieces are purged
+            cred_sweeper.post_processing()
+            return [(x.rule_name, x.line_data_list[0].line_num, x.line_data_list[0].value,
+                     x.line_data_list[0].value_start) for x in cred_sweeper.credential_manager.get_credentials()]
+
+        step = 10000 - OVERLAP_SIZE
+        # the first value is in the overlap of pieces and the second one crosses the end of the overlap
+        data = b"x = 1; " * 3900 + b'password = "cackle!"' + b" " * 670 + b'password = "Ckl3e!Xq"' \
+            + b"y = 2; " * 5000
+        expected = scan(TextContentProvider(("dump.txt", io.BytesIO(data))))
+        self.assertEqual(2, len(expected))
+        with patch.object(StreamingTextContentProvider, "BLOCK_SIZE", 1000), \
+                patch.object(StreamingTextContentProvider, "LINE_PIECE_SIZE", 10000):
+            all_lines, all_pieces = [], []
+            for lines, pieces in StreamingTextContentProvider("dump.txt", io.BytesIO(data)).yield_lines():
+                all_lines.extend(lines)
+                all_pieces.extend(pieces)
+            # only pieces of bounded size are kept for the line
+            self.assertListEqual([""], all_lines)
+            self.assertEqual(data.decode(), ''.join(x[2][:step] for x in all_pieces[:-1]) + all_pieces[-1][2])
+            self.assertListEqual(list(range(0, len(data) - OVERLAP_SIZE + 1, step)), [x[1] for x in all_pieces])
+            self.assertTrue(all(1 == x[0] and 10000 >= len(x[2]) for x in all_pieces))
+            self.assertListEqual(expected, scan(StreamingTextContentProvider("dump.txt", io.BytesIO(data))))
+
+    def test_yield_analysis_target_n(self) -> None:
+        self.assertListEqual([], list(StreamingTextContentProvider("-", io.BytesIO(b"")).yield_analysis_target(0)))
+        # binary data is not scanned
+        provider = StreamingTextContentProvider("-", io.BytesIO((SAMPLES_PATH / "pem_key.gz").read_bytes()))
+        self.assertListEqual([], list(provider.yield_analysis_target(0)))
+        # missing file
+        provider = StreamingTextContentProvider(str(SAMPLES_PATH / "not_existed_file"))
+        self.assertListEqual([], list(provider.yield_analysis_target(0)))
+
+    def test_scan_p(self) -> None:
+        cred_sweeper = CredSweeper(ml_threshold=0)
+        data = b"\n".join((SAMPLES_PATH / x).read_bytes() for x in ("pem_key", "aws_multi.md", "password.gradle")) * 3
+        expected = [(x.rule_name, [(y.line_num, y.value) for y in x.line_data_list])
+                    for x in cred_sweeper.file_scan(TextContentProvider(("dump.txt", io.BytesIO(data))))]
+        self.assertLess(3, len(expected))
+        with patch.object(StreamingTextContentProvider, "BLOCK_SIZE", 64):
+            candidates = cred_sweeper.file_scan(StreamingTextContentProvider("dump.txt", io.BytesIO(data)))
+        self.assertListEqual(expected,
+                             [(x.rule_name, [(y.line_num, y.value) for y in x.line_data_list]) for x in candidates])
+
+    def test_scan_pool_p(self) -> None:
+        data = b"\n".join((SAMPLES_PATH / x).read_bytes() for x in ("pem_key", "aws_multi.md", "password.gradle"))
+        file_path = SAMPLES_PATH / "password.gradle"
+        expected = sorted(
+            (x.line_data_list[0].path, x.line_data_list[0].line_num, x.line_data_list[0].value)
+            for x in CredSweeper(ml_threshold=0).files_scan(
+                [TextContentProvider((
+                    "-",
+                    io.BytesIO(data))), TextContentProvider(file_path)]))
+        self.assertLess(3, len(expected))
+        # the stream is read by blocks in the process instead of transfer of whole data to the pool
+        with CredSweeper(ml_threshold=0, pool_count=2) as cred_sweeper, \
+                patch.object(StreamingTextContentProvider, "data", new_callable=PropertyMock,
+                             side_effect=AssertionError("whole stream is read")):
+            cred_sweeper.scan([StreamingTextContentProvider("-", io.BytesIO(data)), TextContentProvider(file_path)])
+            candidates = cred_sweeper.credential_manager.get_credentials()
+            providers = iter([StreamingTextContentProvider("-", io.BytesIO(data)), TextContentProvider(file_path)])
+            streamed = [x for portion in cred_sweeper.yield_scan(providers) for x in portion]
+        for result in (candidates, streamed):
+            self.assertListEqual(
+                expected,
+                sorted((x.line_data_list[0].path, x.line_data_list[0].line_num, x.line_data_list[0].value)
+                       for x in result))
+
+    def test_pickle_p(self) -> None:
+        provider = pickle.loads(pickle.dumps(StreamingTextContentProvider("-", io.BytesIO(self.data))))
+        # a stream is transferred with the data
+        self.assertIsInstance(provider, ByteContentProvider)
+        self.assertEqual(self.data, provider.data)
+        file_path = str(SAMPLES_PATH / "password.gradle")
+        provider = pickle.loads(pickle.dumps(StreamingTextContentProvider(file_path)))
+        self.assertIsInstance(provider, StreamingTextContentProvider)
+        self.assertEqual(len(list(TextContentProvider(file_path).yield_analysis_target(0))),
+                         len(list(provider.yield_analysis_target(0))))
@@ -1,4 +1,6 @@
+import io
 import os
+import pickle
 import tempfile
 import unittest
 
@@ -67,3 +69,48 @@ class TestTextContentProvider(unittest.TestCase):
         provider = TextContentProvider("dummy")
         provider.free()
         self.assertListEqual([], provider.lines)
+
+    def test_size_p(self) -> None:
+        target_path = SAMPLES_PATH / "password.gradle"
+        self.assertEqual(os.path.getsize(target_path), TextContentProvider(target_path).size)
+        self.assertEqual(5, TextContentProvider(("dummy", io.BytesIO(b"12345"))).size)
+
+    def test_size_n(self) -> None:
+        self.assertEqual(0, TextContentProvider("not_existed_file").size)
+
+    def test_pickle_p(self) -> None:
+        target_path = SAMPLES_PATH / "password.gradle"
+        provider = TextContentProvider(target_path, info="dummy")
+        # only the reference is pickled before reading
+        dumped = pickle.dumps(provider)
+        self.assertGreater(256, len(dumped))
+        restored = pickle.loads(dumped)
+        self.assertEqual(provider.descriptor, restored.descriptor)
+        self.assertListEqual(provider.lines, restored.lines)
+
+    def test_pickle_n(self) -> None:
+        provider = TextContentProvider(("dummy", io.BytesIO(b"password = 'cackle!'")))
+        restored = pickle.loads(pickle.dumps(provider))
+        self.assertEqual(b"password = 'cackle!'", restored.data)
+        # loaded data is transferred as is
+        provider = TextContentProvider(SAMPLES_PATH / "password.gradle")
+        self.assertTrue(provider.data)
+        self.assertLess(len(provider.data), len(pickle.dumps(provider)))
+
+    def test_prefetch_p(self) -> None:
+        target_path = SAMPLES_PATH / "password.gradle"
+        provider = TextContentProvider(target_path)
+        provider.prefetch()
+        with open(target_path, "rb") as f:
+            expected = f.read()
+        self.assertEqual(expected, provider.data)
+        # prefetched data is transferred to worker process
+        self.assertEqual(expected, pickle.loads(pickle.dumps(provider)).data)
+
+    def test_prefetch_n(self) -> None:
+        provider = TextContentProvider(("dummy", io.BytesIO(b"password = 'cackle!'")))
+        provider.prefetch()
+        self.assertEqual(b"password = 'cackle!'", provider.data)
+        provider = TextContentProvider("not_existed_file")
+        provider.prefetch()
+        self.assertIsNone(provider.data)
@@ -0,0 +1,108 @@
+import unittest
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from credsweeper import filters
+from credsweeper.config import Config
+from credsweeper.credentials import LineData
+from credsweeper.file_handler.analysis_target import AnalysisTarget
+from credsweeper.filters import Filter, ValuePatternCheck, ValueSimilarityCheck
+from credsweeper.scanner.scan_type import ScanType
+from tests.filters.conftest import DUMMY_ANALYSIS_TARGET
+from tests.test_utils.dummy_line_data import config, get_line_data
+
+
+class CountingFilter(Filter):
+    """Filter which rejects the value 'reject' and counts calls"""
+
+    def __init__(self, config: Config = None, value_only: bool = True) -> None:
+        self.VALUE_ONLY = value_only
+        self.calls = 0
+
+    def run(self, line_data: LineData, target: AnalysisTarget) -> bool:
+        self.calls += 1
+        return "reject" == line_data.value
+
+
+class TestScanType(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.config = config()
+
+    def _get_line_data(self, line: str) -> LineData:
+        return get_line_data(self.config, line=line, pattern=r"=\s*(?P<value>\S+)")
+
+    def test_value_verdict_p(self) -> None:
+        counting_filter = CountingFilter()
+        for line in ["pwd = reject", "password = reject", "x = accept", "pwd = accept", "y = reject"]:
+            line_data = self._get_line_data(line)
+            expected = "reject" == line_data.value
+            self.assertEqual(expected,
+                             ScanType.filtering(self.config, DUMMY_ANALYSIS_TARGET, line_data, [counting_filter]))
+        # the filter was called once per unique value
+        self.assertEqual(2, counting_filter.calls)
+        # the verdicts are kept per filter instance
+        another_filter = CountingFilter()
+        self.assertTrue(
+            ScanType.filtering(self.config, DUMMY_ANALYSIS_TARGET, self._get_line_data("x = reject"), [another_filter]))
+        self.assertEqual(1, another_filter.calls)
+
+    def test_value_verdict_n(self) -> None:
+        counting_filter = CountingFilter(value_only=False)
+        for line in ["pwd = reject", "password = reject", "pwd = reject"]:
+            line_data = self._get_line_data(line)
+            self.assertTrue(ScanType.filtering(self.config, DUMMY_ANALYSIS_TARGET, line_data, [counting_filter]))
+        self.assertEqual(3, counting_filter.calls)
+
+    def test_value_verdict_limit_n(self) -> None:
+        counting_filter = CountingFilter()
+        with patch.object(ScanType, "VERDICTS_LIMIT", 2):
+            for line in ["a = first", "a = second", "a = third", "a = first"]:
+                line_data = self._get_line_data(line)
+                self.assertFalse(ScanType.filtering(self.config, DUMMY_ANALYSIS_TARGET, line_data, [counting_filter]))
+        # the least recently used value was evicted
+        self.assertEqual(4, counting_filter.calls)
+
+    def test_value_verdict_lock_p(self) -> None:
+        lock = ScanType._ScanType__verdicts_lock
+        test_case = self
+
+        class LockedOrderedDict(OrderedDict):
+            """Checks that the cache is accessed under the lock only"""
+
+            def get(self, *args, **kwargs):
+                test_case.assertTrue(lock.locked())
+                return super().get(*args, **kwargs)
+
+            def move_to_end(self, *args, **kwargs):
+                test_case.assertTrue(lock.locked())
+                return super().move_to_end(*args, **kwargs)
+
+            def popitem(self, *args, **kwargs):
+                test_case.assertTrue(lock.locked())
+                return super().popitem(*args, **kwargs)
+
+            def __setitem__(self, *args, **kwargs):
+                test_case.assertTrue(lock.locked())
+                return super().__setitem__(*args, **kwargs)
+
+        counting_filter = CountingFilter()
+        line_data_list = [self._get_line_data(f"a = value{x % 7}") for x in range(100)]
+        line_data_list.append(self._get_line_data("a = reject"))
+
+        def filtering(line_data: LineData) -> bool:
+            return ScanType.filtering(self.config, DUMMY_ANALYSIS_TARGET, line_data, [counting_filter])
+
+        with patch.object(ScanType, "_ScanType__verdicts", LockedOrderedDict()), \
+                patch.object(ScanType, "VERDICTS_LIMIT", 3), ThreadPoolExecutor(max_workers=4) as executor:
+            verdicts = list(executor.map(filtering, line_data_list * 5))
+        self.assertListEqual(["reject" == x.value for x in line_data_list * 5], verdicts)
+        self.assertFalse(lock.locked())
+
+    def test_value_only_declaration_p(self) -> None:
+        self.assertFalse(Filter.VALUE_ONLY)
+        self.assertTrue(ValuePatternCheck.VALUE_ONLY)
+        self.assertTrue(filters.ValueTokenBase64Check.VALUE_ONLY)
+        # the filter compares value and variable
+        self.assertFalse(ValueSimilarityCheck.VALUE_ONLY)
@@ -0,0 +1,58 @@
+import random
+import unittest
+
+from credsweeper.app import CredSweeper
+from credsweeper.file_handler.files_provider import FilesProvider
+from credsweeper.file_handler.string_content_provider import StringContentProvider
+from credsweeper.scanner.adaptive_filters import AdaptiveFilters, MeasuringFilter
+from tests import SAMPLES_PATH
+
+
+class TestAdaptiveFilters(unittest.TestCase):
+
+    def test_get_order_p(self) -> None:
+        scanner = CredSweeper().scanner
+        token_rule = next(rule for rule, _ in scanner.rules_scanners if "Token" == rule.rule_name)
+        measuring_filter = MeasuringFilter(scanner.config, token_rule.filters[:5])
+        measuring_filter.time = [1.0, 1.0, 0.1, 5.0, 0.2]
+        measuring_filter.rejected = [10, 0, 1, 100, 0]
+        # cost per rejection: 0.1, inf, 0.1, 0.05, inf
+        self.assertListEqual([3, 0, 2, 1, 4], measuring_filter.get_order())
+
+    def test_adaptive_filters_p(self) -> None:
+        random.seed(42)
+        values = ["Xdj@jcN834b.", "aaaaaaaaaaaa", "{{TOKEN}}", "12345678", "/path/to/file", "get_token()"]
+        lines = [f"token = '{random.choice(values)}'" for _ in range(100)]
+        expected = [x.to_json(False, False) for x in CredSweeper().scanner.scan(StringContentProvider(lines))]
+        scanner = CredSweeper(adaptive_filters=True).scanner
+        self.assertIsInstance(scanner.adaptive_filters, AdaptiveFilters)
+        scanner.adaptive_filters.SAMPLES_LIMIT = 50
+        token_rule = next(rule for rule, _ in scanner.rules_scanners if "Token" == rule.rule_name)
+        token_filters = list(token_rule.filters)
+        self.assertListEqual(expected, [x.to_json(False, False) for x in scanner.scan(StringContentProvider(lines))])
+        orders = scanner.adaptive_filters.get_orders()
+        self.assertIn("Token", orders)
+        # same filters in another order
+        self.assertEqual(len(token_filters), len(token_rule.filters))
+        self.assertSetEqual(set(id(x) for x in token_filters), set(id(x) for x in token_rule.filters))
+        self.assertNotEqual(token_filters, token_rule.filters)
+        # the adapted rule gives the same result
+        self.assertListEqual(expected, [x.to_json(False, False) for x in scanner.scan(StringContentProvider(lines))])
+
+    def test_adaptive_filters_samples_p(self) -> None:
+        provider = FilesProvider([SAMPLES_PATH])
+        cred_sweeper = CredSweeper(ml_threshold=0)
+        cred_sweeper.scan(provider.get_scannable_files(cred_sweeper.config))
+        expected = sorted(str(x.to_json(False, False)) for x in cred_sweeper.credential_manager.get_credentials())
+        cred_sweeper = CredSweeper(ml_threshold=0, adaptive_filters=True)
+        cred_sweeper.scanner.adaptive_filters.SAMPLES_LIMIT = 8
+        cred_sweeper.scan(provider.get_scannable_files(cred_sweeper.config))
+        self.assertTrue(cred_sweeper.scanner.adaptive_filters.get_orders())
+        self.assertListEqual(
+            expected, sorted(str(x.to_json(False, False)) for x in cred_sweeper.credential_manager.get_credentials()))
+
+    def test_adaptive_filters_n(self) -> None:
+        self.assertIsNone(CredSweeper().scanner.adaptive_filters)
+        scanner = CredSweeper(adaptive_filters=True).scanner
+        scanner.scan(StringContentProvider(["nothing to find"]))
+        self.assertDictEqual({}, scanner.adaptive_filters.get_orders())
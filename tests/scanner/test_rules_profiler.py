@@ -0,0 +1,74 @@
+import pickle
+import tempfile
+import unittest
+from pathlib import Path
+
+from credsweeper.app import CredSweeper
+from credsweeper.file_handler.files_provider import FilesProvider
+from credsweeper.file_handler.string_content_provider import StringContentProvider
+from credsweeper.scanner.rules_profiler import RulesProfiler
+from credsweeper.utils import Util
+from tests import SAMPLES_PATH
+
+
+class TestRulesProfiler(unittest.TestCase):
+
+    def test_profile_p(self) -> None:
+        lines = [
+            "password = 'Xdj@jcN834b.'", "token = 'aaaaaaaaaaaa'", "secret = 'Xdj@jcN834b.' token = 'Xdj@jcN834b.'"
+        ]
+        expected = [x.to_json(False, False) for x in CredSweeper().scanner.scan(StringContentProvider(lines))]
+        scanner = CredSweeper(profile_filename="profile.json").scanner
+        self.assertIsInstance(scanner.profiler, RulesProfiler)
+        self.assertListEqual(expected, [x.to_json(False, False) for x in scanner.scan(StringContentProvider(lines))])
+        stats = {x["rule"]: x for x in scanner.profiler.get_stats()}
+        self.assertEqual(2, stats["Token"]["calls"])
+        self.assertEqual(2, stats["Token"]["matches"])
+        self.assertEqual(1, stats["Token"]["candidates"])
+        self.assertLessEqual(stats["Token"]["regex_time"], stats["Token"]["time"])
+        # the repeated symbols value was rejected by a filter
+        self.assertListEqual([("ValuePatternCheck", 1)],
+                             [(x["filter"], x["rejected"]) for x in stats["Token"]["filters"] if x["rejected"]])
+        for stat in stats.values():
+            for filter_stat in stat["filters"]:
+                self.assertLessEqual(filter_stat["rejected"], filter_stat["calls"])
+                self.assertLessEqual(filter_stat["time"], stat["time"])
+
+    def test_profile_update_p(self) -> None:
+        scanner = CredSweeper(profile_filename="profile.json").scanner
+        scanner.scan(StringContentProvider(["password = 'Xdj@jcN834b.'"]))
+        stats = scanner.profiler.get_stats()
+        # a copy for worker process has no proxies
+        worker_profiler = pickle.loads(pickle.dumps(scanner.profiler))
+        worker_profiler.update(stats)
+        worker_stats = {x["rule"]: x for x in worker_profiler.get_stats()}
+        for stat in stats:
+            self.assertEqual(2 * stat["calls"], worker_stats[stat["rule"]]["calls"])
+            self.assertEqual(2 * stat["matches"], worker_stats[stat["rule"]]["matches"])
+        worker_profiler.clear()
+        self.assertListEqual([], worker_profiler.get_stats())
+
+    def test_profile_n(self) -> None:
+        self.assertIsNone(CredSweeper().scanner.profiler)
+        profiler = RulesProfiler()
+        self.assertListEqual([], profiler.get_stats())
+        profiler.update([])
+        self.assertListEqual([], profiler.get_stats())
+
+    def test_profile_file_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            profile_path = Path(tmp_dir) / "profile.json"
+            json_path = Path(tmp_dir) / "output.json"
+            for pool_count in [1, 2]:
+                cred_sweeper = CredSweeper(profile_filename=profile_path,
+                                           json_filename=json_path,
+                                           pool_count=pool_count,
+                                           ml_threshold=0)
+                cred_sweeper.run(FilesProvider([SAMPLES_PATH / "password.gradle"]))
+                report = Util.json_load(json_path)
+                self.assertEqual(1, len(report))
+                profile = Util.json_load(profile_path)
+                self.assertTrue(profile)
+                self.assertEqual(1, sum(x["candidates"] for x in profile))
+                # the most expensive rules are on top
+                self.assertListEqual(sorted(profile, key=lambda x: x["time"], reverse=True), profile)
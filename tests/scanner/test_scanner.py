@@ -0,0 +1,238 @@
+import os
+import re
+import tempfile
+import unittest
+from pathlib import Path
+from typing import List
+from unittest.mock import patch
+
+from credsweeper.app import APP_PATH, CredSweeper
+from credsweeper.common.constants import RuleType
+from credsweeper.file_handler.string_content_provider import StringContentProvider
+from credsweeper.rules import Rule, RulesCache
+from credsweeper.scanner import Scanner
+
+
+class TestScanner(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.scanner = CredSweeper().scanner
+        self.config = self.scanner.config
+
+    def _set_rules(self, rule_templates: List[dict]) -> None:
+        rules_scanners = []
+        for rule_template in rule_templates:
+            rule_dict = {"severity": "info", "confidence": "moderate", "filter_type": [], "target": ["code"]}
+            rule_dict.update(rule_template)
+            rule = Rule(self.config, rule_dict)
+            rules_scanners.append((rule, Scanner.get_scanner(rule)))
+        self.scanner.rules_scanners = rules_scanners
+
+    def test_yield_rule_scanner_p(self) -> None:
+        # the index must give the same rules in the same order as plain check of every rule
+        for rule_scanner in self.scanner.rules_scanners:
+            self.assertIn(rule_scanner, list(self.scanner.yield_rule_scanner(8000, True, True, True, True)))
+        for line_len in [0, 4, 8, 10, 16, 32, 100]:
+            for flags in range(16):
+                matched = [bool(flags & 1 << x) for x in range(4)]
+                matched_types = {
+                    x
+                    for x, y in zip([RuleType.PATTERN, RuleType.KEYWORD, RuleType.PEM_KEY, RuleType.MULTI], matched)
+                    if y
+                }
+                expected = [(rule, scanner) for rule, scanner in self.scanner.rules_scanners
+                            if line_len >= rule.min_line_len and rule.rule_type in matched_types]
+                self.assertListEqual(expected, list(self.scanner.yield_rule_scanner(line_len, *matched)))
+
+    def test_yield_rule_scanner_n(self) -> None:
+        self.assertListEqual([], list(self.scanner.yield_rule_scanner(0, True, True, True, True)))
+        self.assertListEqual([], list(self.scanner.yield_rule_scanner(8000, False, False, False, False)))
+        self.scanner.rules_scanners = []
+        self.assertListEqual([], list(self.scanner.yield_rule_scanner(8000, True, True, True, True)))
+
+    def test_scan_index_p(self) -> None:
+        self._set_rules([
+            {
+                "name": "FIRST",
+                "type": "pattern",
+                "values": ["(?P<value>first_[0-9a-z]{8})"],
+                "required_substrings": ["first_", "any_"],
+                "min_line_len": 14,
+            },
+            {
+                "name": "SECOND",
+                "type": "pattern",
+                "values": ["(?P<value>second_[0-9a-z]{8})"],
+                "required_regex": "[0-9]",
+                "min_line_len": 15,
+            },
+            {
+                "name": "THIRD",
+                "type": "pattern",
+                "values": ["(?P<value>[a-z]+_[0-9a-z]{8})"],
+                "required_substrings": ["first_"],
+                "required_regex": "[0-9]",
+                "min_line_len": 8,
+            },
+        ])
+        provider = StringContentProvider(["first_abcdefgh second_abcdefgh", "first_1bcdefgh second_1bcdefgh"])
+        candidates = self.scanner.scan(provider)
+        self.assertListEqual([("FIRST", 1), ("FIRST", 2), ("SECOND", 2), ("THIRD", 2), ("THIRD", 2)],
+                             [(x.rule_name, x.line_data_list[0].line_num) for x in candidates])
+
+    def test_scan_index_n(self) -> None:
+        self._set_rules([
+            {
+                "name": "FIRST",
+                "type": "pattern",
+                "values": ["(?P<value>first_[0-9a-z]{8})"],
+                "required_substrings": ["first_"],
+                "min_line_len": 100,
+            },
+            {
+                "name": "SECOND",
+                "type": "pattern",
+                "values": ["(?P<value>second_[0-9a-z]{8})"],
+                "required_regex": "[0-9]",
+                "min_line_len": 15,
+            },
+        ])
+        provider = StringContentProvider(["first_abcdefgh second_abcdefgh", "FIRST_1bcdefgh"])
+        self.assertListEqual([], self.scanner.scan(provider))
+
+    def test_is_buffer_safe_p(self) -> None:
+        for rule, _ in self.scanner.rules_scanners:
+            if RuleType.PATTERN == rule.rule_type:
+                self.assertTrue(Scanner._is_buffer_safe(rule.patterns[0]), rule.rule_name)
+        self.assertTrue(Scanner._is_buffer_safe(re.compile(r"^key(?![0-9A-Za-z_-])$")))
+
+    def test_is_buffer_safe_n(self) -> None:
+        for pattern in [r"\Akey", r"key\Z", r"(?<![^0-9])key", r"key(?!\s)", r"key(?![\x00-\x20])", r"(?s)key(?!.)"]:
+            self.assertFalse(Scanner._is_buffer_safe(re.compile(pattern)), pattern)
+
+    def test_whole_buffer_p(self) -> None:
+        lines = [
+            "first_1bcdefgh", "", "  second_abcdefgh  ", "first_abcdefgh x first_", "bcdefgh0", "x" * 10000,
+            "x second_1234abcd"
+        ]
+        rule_templates = [
+            {
+                "name": "FIRST",
+                "type": "pattern",
+                "values": [r"^(?P<value>first_\s*[0-9a-z]{8})$"],
+                "required_regex": "[0-9]",
+                "min_line_len": 8,
+            },
+            {
+                "name": "SECOND",
+                "type": "pattern",
+                "values": ["(?<![0-9A-Za-z_-])(?P<value>second_[0-9a-z]{8})"],
+                "min_line_len": 15,
+            },
+        ]
+        self._set_rules(rule_templates)
+        expected = [(x.rule_name, x.line_data_list[0].line_num, x.line_data_list[0].value)
+                    for x in self.scanner.scan(StringContentProvider(lines))]
+        self.assertListEqual([("FIRST", 1, "first_1bcdefgh"), ("SECOND", 3, "second_abcdefgh"),
+                              ("SECOND", 7, "second_1234abcd")], expected)
+        self.config.whole_buffer = True
+        self._set_rules(rule_templates)
+        targets = [x for x in StringContentProvider(lines).yield_analysis_target(0) if x.offset is None]
+        masks = [3] * len(targets)
+        self.scanner._reduce_buffer_masks(targets, masks)
+        self.assertListEqual([1, 0, 2, 0, 0, 2], masks)
+        self.assertListEqual(expected, [(x.rule_name, x.line_data_list[0].line_num, x.line_data_list[0].value)
+                                        for x in self.scanner.scan(StringContentProvider(lines))])
+
+    def test_keywords_pattern_p(self) -> None:
+        lines = ["my_secret_token = 'Xdj@jcN834b.'", "token = 'Xdj@jcN834b.'", "secret and token are absent"]
+        expected = [(x.rule_name, x.line_data_list[0].line_num)
+                    for x in self.scanner.scan(StringContentProvider(lines))]
+        self.assertListEqual([("Secret", 1), ("Token", 1), ("Token", 2)], expected)
+        secret_token_mask = sum(1 << n for n, (rule, _) in enumerate(self.scanner.rules_scanners)
+                                if rule.rule_name in ("Secret", "Token"))
+        keywords_pattern = self.scanner._get_keywords_pattern(secret_token_mask)
+        self.assertIs(keywords_pattern, self.scanner._get_keywords_pattern(secret_token_mask))
+        self.assertTrue(keywords_pattern.search(lines[0]))
+        self.assertFalse(keywords_pattern.search(lines[2]))
+
+    def test_keywords_pattern_n(self) -> None:
+        # duplicated group names cannot be merged, so the rules are applied separately
+        self._set_rules([
+            {
+                "name": "FIRST",
+                "type": "keyword",
+                "values": ["(?P<x>first)"],
+                "min_line_len": 8,
+            },
+            {
+                "name": "SECOND",
+                "type": "keyword",
+                "values": ["(?P<x>second)"],
+                "min_line_len": 8,
+            },
+        ])
+        self.assertIsNone(self.scanner._get_keywords_pattern(3))
+        candidates = self.scanner.scan(StringContentProvider(["first_second = 'Xdj@jcN834b.'"]))
+        self.assertListEqual(["FIRST", "SECOND"], [x.rule_name for x in candidates])
+
+    def test_rules_cache_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            scanner = CredSweeper(rules_cache=tmp_dir).scanner
+            cache_files = list(Path(tmp_dir).glob("rules-*.pickle"))
+            self.assertEqual(1, len(cache_files))
+            cached_scanner = CredSweeper(rules_cache=tmp_dir).scanner
+            self.assertEqual(cache_files, list(Path(tmp_dir).glob("rules-*.pickle")))
+            self.assertEqual(scanner.min_len, cached_scanner.min_len)
+            self.assertListEqual([(rule.rule_name, rule.patterns, scan_type)
+                                  for rule, scan_type in scanner.rules_scanners],
+                                 [(rule.rule_name, rule.patterns, scan_type)
+                                  for rule, scan_type in cached_scanner.rules_scanners])
+            for rule, _ in cached_scanner.rules_scanners:
+                self.assertIs(cached_scanner.config, rule.config)
+            lines = ["my_secret_token = 'Xdj@jcN834b.'", "gi_reo_gi_key = 'AIzaGiReoGiCrYpToKeY1234567890ABCDEFG'"]
+            self.assertListEqual([(x.rule_name, x.line_data_list[0].value)
+                                  for x in scanner.scan(StringContentProvider(lines))],
+                                 [(x.rule_name, x.line_data_list[0].value)
+                                  for x in cached_scanner.scan(StringContentProvider(lines))])
+
+    def test_rules_cache_n(self) -> None:
+        rule_data = (APP_PATH / "rules" / "config.yaml").read_bytes()
+        digest = RulesCache.get_digest(self.config, rule_data)
+        self.assertEqual(digest, RulesCache.get_digest(CredSweeper().config, rule_data))
+        self.assertNotEqual(digest, RulesCache.get_digest(self.config, rule_data + b"\n"))
+        self.assertNotEqual(digest, RulesCache.get_digest(CredSweeper(doc=True).config, rule_data))
+        self.assertNotEqual(digest, RulesCache.get_digest(CredSweeper(exclude_values=["x"]).config, rule_data))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # broken cache file is ignored and replaced
+            cache = RulesCache(tmp_dir, CredSweeper().config, rule_data)
+            cache.path.write_bytes(b"garbage")
+            self.assertIsNone(cache.load())
+            scanner = CredSweeper(rules_cache=tmp_dir).scanner
+            self.assertEqual(len(self.scanner.rules_scanners), len(scanner.rules_scanners))
+            self.assertIsInstance(cache.load(), dict)
+
+    @unittest.skipUnless(hasattr(os, "getuid"), "owners of files are not supported")
+    def test_rules_cache_untrusted_n(self) -> None:
+        rule_data = (APP_PATH / "rules" / "config.yaml").read_bytes()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = RulesCache(tmp_dir, CredSweeper().config, rule_data)
+            cache.save({"rules": []})
+            self.assertEqual(0o600, cache.path.stat().st_mode & 0o777)
+            self.assertIsNotNone(cache.load())
+            # a file which may be planted by others is not unpickled
+            os.chmod(cache.path, 0o666)
+            with patch("pickle.Unpickler") as unpickler_mock:
+                self.assertIsNone(cache.load())
+                unpickler_mock.assert_not_called()
+            os.chmod(cache.path, 0o600)
+            os.chmod(tmp_dir, 0o777)
+            self.assertIsNone(cache.load())
+            os.chmod(tmp_dir, 0o700)
+            self.assertIsNotNone(cache.load())
+            # a symbolic link may point to a file of others
+            link_dir = os.path.join(tmp_dir, "link")
+            os.symlink(tmp_dir, link_dir)
+            self.assertIsNone(RulesCache(link_dir, CredSweeper().config, rule_data).load())
+            with patch("os.getuid", return_value=os.getuid() + 1):
+                self.assertIsNone(cache.load())
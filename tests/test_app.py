@@ -6,6 +6,7 @@ import subprocess
 import sys
 import tempfile
 import time
+import zipfile
 from typing import AnyStr, Tuple
 from unittest import TestCase
 
@@ -207,8 +208,10 @@ class TestApp(TestCase):
                    " | --diff_path PATH [PATH ...]" \
                    " | --export_config [PATH]" \
                    " | --export_log_config [PATH]" \
+                   " | --merge PATH [PATH ...]" \
                    ")" \
                    " [--rules PATH]" \
+                   " [--cache_dir PATH]" \
                    " [--severity SEVERITY]" \
                    " [--config PATH]" \
                    " [--log_config PATH]" \
@@ -223,11 +226,18 @@ class TestApp(TestCase):
                    " [--ml_model PATH]" \
                    " [--ml_providers STR] " \
                    " [--jobs POSITIVE_INT]" \
+                   " [--start-method {spawn,fork,forkserver}]" \
                    " [--thrifty | --no-thrifty]" \
+                   " [--whole-buffer]" \
+                   " [--adaptive-filters]" \
+                   " [--stream]" \
+                   " [--shard INDEX/COUNT]" \
                    " [--skip_ignored]" \
+                   " [--walk-threads POSITIVE_INT]" \
                    " [--error | --no-error]"\
                    " [--save-json [PATH]]" \
                    " [--save-xlsx [PATH]]" \
+                   " [--profile [PATH]]" \
                    " [--stdout | --no-stdout]" \
                    " [--color | --no-color]" \
                    " [--hashed | --no-hashed]" \
@@ -242,6 +252,7 @@ class TestApp(TestCase):
                    " --diff_path" \
                    " --export_config" \
                    " --export_log_config" \
+                   " --merge" \
                    " is required "
         expected = " ".join(expected.split())
         self.assertEqual(expected, output)
@@ -779,3 +790,28 @@ class TestApp(TestCase):
             self.assertNotIn(md5_config, _stdout)
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def test_merge_depth_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            zip_path = os.path.join(tmp_dir, "samples.zip")
+            with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+                for sample in sorted(SAMPLES_PATH.glob("*.*")):
+                    if sample.suffix in (".py", ".gradle", ".yaml", ".json", ".sh"):
+                        zf.write(sample, f"samples/{sample.name}")
+            expected_json = os.path.join(tmp_dir, "expected.json")
+            self._m_credsweeper(["--path", zip_path, "--depth", "3", "--save-json", expected_json, "--log", "silence"])
+            expected = sorted(json.dumps(x, sort_keys=True) for x in Util.json_load(expected_json))
+            self.assertLess(0, len(expected))
+            shard_reports = []
+            for i in range(2):
+                shard_reports.append(os.path.join(tmp_dir, f"shard_{i}.json"))
+                self._m_credsweeper([
+                    "--path", zip_path, "--depth", "3", "--shard", f"{i}/2", "--ml_threshold", "0", "--save-json",
+                    shard_reports[-1], "--log", "silence"
+                ])
+            # types of members are kept in the reports of shards for ML features
+            file_types = {y["file_type"] for x in shard_reports for z in Util.json_load(x) for y in z["line_data_list"]}
+            self.assertLess({".py", ".gradle"}, file_types)
+            merged_json = os.path.join(tmp_dir, "merged.json")
+            self._m_credsweeper(["--merge", *shard_reports, "--save-json", merged_json, "--log", "silence"])
+            self.assertListEqual(expected, sorted(json.dumps(x, sort_keys=True) for x in Util.json_load(merged_json)))
@@ -1,11 +1,17 @@
+import asyncio
 import io
+import json
+import multiprocessing
 import os
+import pickle
 import random
 import shutil
 import string
 import tempfile
+import threading
 import unittest
 import uuid
+import zipfile
 from argparse import ArgumentTypeError
 from pathlib import Path
 from typing import List, Any, Dict
@@ -22,10 +28,15 @@ from credsweeper.__main__ import EXIT_FAILURE, EXIT_SUCCESS
 from credsweeper.app import APP_PATH
 from credsweeper.app import CredSweeper
 from credsweeper.common.constants import ThresholdPreset, Severity, MIN_DATA_LEN
+from credsweeper.deep_scanner.zip_scanner import ZipScanner
 from credsweeper.file_handler.abstract_provider import AbstractProvider
+from credsweeper.file_handler.archive_content_provider import ArchiveContentProvider
 from credsweeper.file_handler.files_provider import FilesProvider
+from credsweeper.file_handler.shard_content_provider import ShardContentProvider
+from credsweeper.file_handler.streaming_text_content_provider import StreamingTextContentProvider
 from credsweeper.file_handler.text_content_provider import TextContentProvider
 from credsweeper.utils import Util
+from credsweeper.utils.pipeline import Pipeline
 from tests import SAMPLES_CRED_COUNT, SAMPLES_CRED_LINE_COUNT, SAMPLES_POST_CRED_COUNT, SAMPLES_PATH, TESTS_PATH, \
     SAMPLES_IN_DEEP_1, SAMPLES_IN_DEEP_3, SAMPLES_IN_DEEP_2, NEGLIGIBLE_ML_THRESHOLD, AZ_DATA
 from tests.data import DATA_TEST_CFG
@@ -134,6 +145,14 @@ class TestMain(unittest.TestCase):
                          stdout=False,
                          color=False,
                          rule_path=None,
+                         rules_cache=None,
+                         profile_filename=None,
+                         adaptive_filters=False,
+                         stream=False,
+                         start_method="spawn",
+                         shard=None,
+                         walk_threads=1,
+                         merge=None,
                          jobs=1)
         mock_get_arguments.return_value = args_mock
         self.assertEqual(EXIT_FAILURE, app_main.main())
@@ -156,6 +175,14 @@ class TestMain(unittest.TestCase):
                              subtext=False,
                              hashed=False,
                              rule_path=None,
+                             rules_cache=None,
+                             profile_filename=None,
+                             adaptive_filters=False,
+                             stream=False,
+                             start_method="spawn",
+                             shard=None,
+                             walk_threads=1,
+                             merge=None,
                              jobs=1,
                              ml_threshold=0.0,
                              ml_batch_size=1,
@@ -192,6 +219,14 @@ class TestMain(unittest.TestCase):
                              hashed=False,
                              sort_output=False,
                              rule_path=None,
+                             rules_cache=None,
+                             profile_filename=None,
+                             adaptive_filters=False,
+                             stream=False,
+                             start_method="spawn",
+                             shard=None,
+                             walk_threads=1,
+                             merge=None,
                              jobs=1,
                              ml_threshold=0.0,
                              ml_batch_size=1,
@@ -244,6 +279,14 @@ class TestMain(unittest.TestCase):
                              hashed=False,
                              sort_output=True,
                              rule_path=None,
+                             rules_cache=None,
+                             profile_filename=None,
+                             adaptive_filters=False,
+                             stream=False,
+                             start_method="spawn",
+                             shard=None,
+                             walk_threads=1,
+                             merge=None,
                              jobs=1,
                              ml_threshold=NEGLIGIBLE_ML_THRESHOLD,
                              ml_batch_size=16,
@@ -311,6 +354,19 @@ class TestMain(unittest.TestCase):
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
+    def test_shard_index_count_p(self):
+        self.assertTupleEqual((0, 1), app_main.shard_index_count("0/1"))
+        self.assertTupleEqual((7, 8), app_main.shard_index_count("7/8"))
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def test_shard_index_count_n(self):
+        for arg in ("1/1", "0/0", "-1/2", "1", "1/", "/2", "a/b", "0/1/2"):
+            with pytest.raises(ArgumentTypeError):
+                app_main.shard_index_count(arg)
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
     def test_wrong_severity_n(self) -> None:
         with self.assertRaises(RuntimeError):
             CredSweeper(severity="wrong")
@@ -399,6 +455,403 @@ class TestMain(unittest.TestCase):
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
+    def test_persistent_pool_p(self) -> None:
+        with CredSweeper(pool_count=2, ml_threshold=0) as cred_sweeper:
+            providers = FilesProvider([SAMPLES_PATH]).get_scannable_files(cred_sweeper.config)
+            pool = cred_sweeper.start_pool()
+            cred_sweeper.scan(providers)
+            expected = sorted(str(x.to_json(False, False)) for x in cred_sweeper.credential_manager.get_credentials())
+            self.assertTrue(expected)
+            # the same workers are used for next scan and the results are not accumulated
+            self.assertIs(pool, cred_sweeper.start_pool())
+            cred_sweeper.scan(providers)
+            self.assertIs(pool, cred_sweeper.start_pool())
+            self.assertListEqual(
+                expected,
+                sorted(str(x.to_json(False, False)) for x in cred_sweeper.credential_manager.get_credentials()))
+            cred_sweeper.shutdown_pool()
+            self.assertIsNot(pool, cred_sweeper.start_pool())
+        # the pool is stopped on exit
+        cred_sweeper.shutdown_pool()
+
+    def test_stream_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_filename = os.path.join(tmp_dir, "expected.json")
+            cred_sweeper = CredSweeper(ml_threshold=0, json_filename=json_filename)
+            expected_count = cred_sweeper.run(FilesProvider([SAMPLES_PATH]))
+            expected = sorted(json.dumps(x, sort_keys=True) for x in Util.json_load(json_filename))
+            self.assertEqual(expected_count, len(expected))
+            for pool_count in (1, 2):
+                json_filename = os.path.join(tmp_dir, f"stream_{pool_count}.json")
+                with CredSweeper(ml_threshold=0, json_filename=json_filename, pool_count=pool_count,
+                                 stream=True) as cred_sweeper:
+                    # small portions for post-processing
+                    cred_sweeper.STREAM_CANDIDATES_LIMIT = 7
+                    self.assertEqual(expected_count, cred_sweeper.run(FilesProvider([SAMPLES_PATH])))
+                # candidates are not kept in streaming mode
+                self.assertEqual(0, cred_sweeper.credential_manager.len_credentials())
+                self.assertListEqual(expected,
+                                     sorted(json.dumps(x, sort_keys=True) for x in Util.json_load(json_filename)))
+
+    def test_export_color_p(self) -> None:
+        cred_sweeper = CredSweeper(ml_threshold=0, stdout=True, color=True)
+        cred_sweeper.run(FilesProvider([SAMPLES_PATH / "password.gradle", SAMPLES_PATH / "aws_multi.md"]))
+        credentials = cred_sweeper.credential_manager.get_credentials()
+        self.assertLess(1, len(credentials))
+        with patch("builtins.print") as print_mock:
+            cred_sweeper.export_results()
+        lines = [x.args[0] for x in print_mock.call_args_list]
+        plain = [x.to_str() for x in credentials]
+        # colored lines of all credentials are printed before plain lines like the baseline
+        self.assertListEqual(plain, lines[-len(plain):])
+        self.assertTrue(all(x not in plain for x in lines[:-len(plain)]))
+        with patch("builtins.print") as print_mock:
+            cred_sweeper.export_stream(x for x in credentials)
+        # a generator is consumed once, so the lines alternate
+        streamed = [x.args[0] for x in print_mock.call_args_list]
+        self.assertListEqual(sorted(lines), sorted(streamed))
+        self.assertNotEqual(plain, streamed[-len(plain):])
+
+    def test_stream_n(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_filename = os.path.join(tmp_dir, "stream.json")
+            cred_sweeper = CredSweeper(json_filename=json_filename, stream=True)
+            self.assertEqual(0, cred_sweeper.run(FilesProvider([])))
+            self.assertListEqual([], Util.json_load(json_filename))
+            self.assertListEqual([], list(cred_sweeper.yield_post_processing([[], []])))
+
+    def test_merge_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_filename = os.path.join(tmp_dir, "expected.json")
+            cred_sweeper = CredSweeper(ml_threshold=0, json_filename=json_filename)
+            expected_count = cred_sweeper.run(FilesProvider([SAMPLES_PATH]))
+            expected = sorted(json.dumps(x, sort_keys=True) for x in Util.json_load(json_filename))
+            self.assertEqual(expected_count, len(expected))
+            shard_reports = []
+            for i in range(3):
+                shard_reports.append(os.path.join(tmp_dir, f"shard_{i}.json"))
+                cred_sweeper = CredSweeper(ml_threshold=0, json_filename=shard_reports[-1])
+                self.assertGreater(expected_count, cred_sweeper.run(FilesProvider([SAMPLES_PATH], shard=(i, 3))))
+            json_filename = os.path.join(tmp_dir, "merged.json")
+            cred_sweeper = CredSweeper(ml_threshold=0, json_filename=json_filename)
+            # duplicates from repeated report are purged
+            self.assertEqual(expected_count, cred_sweeper.merge(shard_reports + shard_reports[:1]))
+            self.assertListEqual(expected, sorted(json.dumps(x, sort_keys=True) for x in Util.json_load(json_filename)))
+
+    def test_merge_n(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_filename = os.path.join(tmp_dir, "merged.json")
+            cred_sweeper = CredSweeper(json_filename=json_filename)
+            self.assertEqual(0, cred_sweeper.merge([]))
+            self.assertListEqual([], Util.json_load(json_filename))
+            self.assertEqual(-1, cred_sweeper.merge([os.path.join(tmp_dir, "not_existed.json")]))
+
+    def test_scan_async_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_filename = os.path.join(tmp_dir, "expected.json")
+            cred_sweeper = CredSweeper(ml_threshold=0, json_filename=json_filename)
+            expected_count = cred_sweeper.run(FilesProvider([SAMPLES_PATH]))
+            expected = sorted(json.dumps(x, sort_keys=True) for x in Util.json_load(json_filename))
+            self.assertEqual(expected_count, len(expected))
+
+        async def scan_concurrently(cred_sweeper: CredSweeper) -> List[List[Any]]:
+            return await asyncio.gather(
+                *(cred_sweeper.scan_async(FilesProvider([SAMPLES_PATH]).get_scannable_files(cred_sweeper.config))
+                  for _ in range(3)))
+
+        for pool_count in (1, 2):
+            with CredSweeper(ml_threshold=0, pool_count=pool_count) as cred_sweeper:
+                for candidates in asyncio.run(scan_concurrently(cred_sweeper)):
+                    self.assertListEqual(
+                        expected, sorted(json.dumps(x.to_json(False, False), sort_keys=True) for x in candidates))
+                self.assertEqual(0, cred_sweeper.credential_manager.len_credentials())
+
+    def test_scan_async_n(self) -> None:
+
+        async def cancel_scan(cred_sweeper: CredSweeper) -> List[Any]:
+            providers = FilesProvider([SAMPLES_PATH]).get_scannable_files(cred_sweeper.config)
+            with self.assertRaises(asyncio.TimeoutError):
+                await cred_sweeper.scan_async(providers, timeout=0)
+            task = asyncio.create_task(cred_sweeper.scan_async(providers))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            # the turn is released after cancellation
+            return await cred_sweeper.scan_async([], timeout=60)
+
+        for pool_count in (1, 2):
+            with CredSweeper(ml_threshold=0, pool_count=pool_count) as cred_sweeper:
+                self.assertListEqual([], asyncio.run(cancel_scan(cred_sweeper)))
+
+    def test_scan_async_cancel_post_processing_p(self) -> None:
+        cred_sweeper = CredSweeper(ml_threshold=0)
+        first = [TextContentProvider(SAMPLES_PATH / "password.gradle")]
+        second = [TextContentProvider(SAMPLES_PATH / "aws_multi.md")]
+        expected = [x.line_data_list[0].value for x in asyncio.run(cred_sweeper.scan_async(second))]
+        self.assertTrue(expected)
+        post_processing = cred_sweeper.post_processing
+        entered, release = threading.Event(), threading.Event()
+        calls: List[int] = []
+
+        def blocking_post_processing() -> None:
+            calls.append(cred_sweeper.credential_manager.len_credentials())
+            if 1 == len(calls):
+                entered.set()
+                release.wait(60)
+            post_processing()
+
+        async def cancel_scan() -> None:
+            task = asyncio.create_task(cred_sweeper.scan_async(first))
+            await asyncio.get_running_loop().run_in_executor(None, entered.wait, 60)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        results: List[Any] = []
+        # the loop is not closed with asyncio.run() because the executor thread is blocked
+        loop = asyncio.new_event_loop()
+        try:
+            with patch.object(cred_sweeper, "post_processing", side_effect=blocking_post_processing):
+                loop.run_until_complete(cancel_scan())
+                # the scan in other event loop waits for the post-processing of the cancelled scan
+                thread = threading.Thread(target=lambda: results.append(asyncio.run(cred_sweeper.scan_async(second))))
+                thread.start()
+                thread.join(1)
+                self.assertEqual(1, len(calls))
+                release.set()
+                thread.join(60)
+        finally:
+            release.set()
+            loop.close()
+        self.assertEqual(2, len(calls))
+        self.assertEqual(len(expected), calls[1])
+        self.assertListEqual([expected], [[x.line_data_list[0].value for x in y] for y in results])
+        self.assertEqual(0, cred_sweeper.credential_manager.len_credentials())
+
+    def test_post_processing_lock_p(self) -> None:
+        cred_sweeper = CredSweeper(ml_threshold=0)
+        other = CredSweeper(ml_threshold=0)
+        providers = [TextContentProvider(SAMPLES_PATH / "password.gradle")]
+        with cred_sweeper._CredSweeper__post_processing_lock:
+            # post-processing of other instance is not blocked
+            self.assertTrue(asyncio.run(other.scan_async(providers, timeout=60)))
+        restored = pickle.loads(pickle.dumps(cred_sweeper))
+        self.assertIsNot(cred_sweeper._CredSweeper__post_processing_lock, restored._CredSweeper__post_processing_lock)
+        self.assertTrue(asyncio.run(restored.scan_async(providers, timeout=60)))
+
+    def test_start_method_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_filename = os.path.join(tmp_dir, "expected.json")
+            cred_sweeper = CredSweeper(ml_threshold=0, json_filename=json_filename)
+            expected_count = cred_sweeper.run(FilesProvider([SAMPLES_PATH]))
+            expected = sorted(json.dumps(x, sort_keys=True) for x in Util.json_load(json_filename))
+            self.assertEqual(expected_count, len(expected))
+            for start_method in multiprocessing.get_all_start_methods():
+                json_filename = os.path.join(tmp_dir, f"{start_method}.json")
+                with CredSweeper(ml_threshold=0, json_filename=json_filename, pool_count=2,
+                                 start_method=start_method) as cred_sweeper:
+                    self.assertEqual(expected_count, cred_sweeper.run(FilesProvider([SAMPLES_PATH])))
+                    # the workers are reused for next scan
+                    self.assertEqual(expected_count, cred_sweeper.run(FilesProvider([SAMPLES_PATH])))
+                self.assertListEqual(expected,
+                                     sorted(json.dumps(x, sort_keys=True) for x in Util.json_load(json_filename)))
+
+    @unittest.skipIf("fork" not in multiprocessing.get_all_start_methods(), "fork is not available")
+    def test_start_method_fork_stream_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_filename = os.path.join(tmp_dir, "expected.json")
+            expected_count = CredSweeper(ml_threshold=0, json_filename=json_filename).run(FilesProvider([SAMPLES_PATH]))
+            expected = sorted(json.dumps(x, sort_keys=True) for x in Util.json_load(json_filename))
+            json_filename = os.path.join(tmp_dir, "fork.json")
+            with CredSweeper(ml_threshold=0,
+                             json_filename=json_filename,
+                             pool_count=2,
+                             start_method="fork",
+                             stream=True) as cred_sweeper:
+                start_pool = cred_sweeper.start_pool
+                threads_before = set(threading.enumerate())
+                threads_at_fork: List[Any] = []
+                files_provider = FilesProvider([SAMPLES_PATH])
+                yield_scannable_files = files_provider.yield_scannable_files
+                pool_at_search: List[bool] = []
+
+                def checked_start_pool() -> Any:
+                    if cred_sweeper._CredSweeper__pool is None:
+                        threads_at_fork.append(set(threading.enumerate()) - threads_before)
+                    return start_pool()
+
+                def checked_yield_scannable_files(*args, **kwargs) -> Any:
+                    pool_at_search.append(cred_sweeper._CredSweeper__pool is not None)
+                    return yield_scannable_files(*args, **kwargs)
+
+                with patch.object(cred_sweeper, "start_pool", side_effect=checked_start_pool), \
+                        patch.object(files_provider, "yield_scannable_files", side_effect=checked_yield_scannable_files):
+                    self.assertEqual(expected_count, cred_sweeper.run(files_provider))
+            # the workers were forked before search of files and no other thread was running at the moment
+            self.assertListEqual([True], pool_at_search)
+            self.assertListEqual([set()], threads_at_fork)
+            self.assertListEqual(expected, sorted(json.dumps(x, sort_keys=True) for x in Util.json_load(json_filename)))
+
+    def test_start_method_n(self) -> None:
+        with self.assertRaises(RuntimeError):
+            CredSweeper(start_method="dummy")
+
+    def test_get_batches_p(self) -> None:
+        cred_sweeper = CredSweeper(pool_count=2)
+        providers = FilesProvider([SAMPLES_PATH]).get_scannable_files(cred_sweeper.config)
+        batches = cred_sweeper.get_batches(providers)
+        # every provider is scheduled once
+        self.assertListEqual(sorted(x.file_path for x in providers), sorted(x.file_path for y in batches for x in y))
+        # largest-first order
+        sizes = [x.size for y in batches for x in y]
+        self.assertListEqual(sorted(sizes, reverse=True), sizes)
+        self.assertLessEqual(2 * CredSweeper.BATCHES_PER_JOB, len(batches))
+        self.assertGreater(len(providers), len(batches))
+        self.assertLess(0, sizes[-1])
+
+    def test_get_batches_n(self) -> None:
+        cred_sweeper = CredSweeper(pool_count=2)
+        self.assertListEqual([], cred_sweeper.get_batches([]))
+        # unknown sizes are split by amount
+        providers = [StringContentProvider([f"line {x}"]) for x in range(100)]
+        batches = cred_sweeper.get_batches(providers)
+        self.assertEqual(2 * CredSweeper.BATCHES_PER_JOB, len(batches))
+        self.assertListEqual(providers, [x for y in batches for x in y])
+
+    def test_get_shards_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "dump.sql")
+            with open(file_path, "wb") as f:
+                for sample in sorted(SAMPLES_PATH.glob("*.*")):
+                    if sample.suffix in (".txt", ".py", ".json", ".yaml", ".key", ".pem", ".sql", ".sh"):
+                        f.write(sample.read_bytes().replace(b"\r", b""))
+                        f.write(b"\r\n")
+            json_filename = os.path.join(tmp_dir, "expected.json")
+            cred_sweeper = CredSweeper(ml_threshold=0, json_filename=json_filename)
+            expected_count = cred_sweeper.run(FilesProvider([file_path]))
+            self.assertLess(0, expected_count)
+            expected = sorted(json.dumps(x, sort_keys=True) for x in Util.json_load(json_filename))
+            json_filename = os.path.join(tmp_dir, "shards.json")
+            with CredSweeper(ml_threshold=0, json_filename=json_filename, pool_count=2) as cred_sweeper:
+                cred_sweeper.SHARD_SIZE = 256
+                shards = cred_sweeper.get_shards(FilesProvider([file_path]).get_scannable_files(cred_sweeper.config))
+                self.assertLess(2, len(shards))
+                self.assertEqual(expected_count, cred_sweeper.run(FilesProvider([file_path])))
+            self.assertListEqual(expected, sorted(json.dumps(x, sort_keys=True) for x in Util.json_load(json_filename)))
+
+    def test_windows_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "dump.sql")
+            with open(file_path, "wb") as f:
+                for sample in sorted(SAMPLES_PATH.glob("*.*")):
+                    if sample.suffix in (".txt", ".py", ".json", ".yaml", ".key", ".pem", ".sql", ".sh"):
+                        f.write(sample.read_bytes().replace(b"\r", b""))
+                        f.write(b"\n")
+            json_filename = os.path.join(tmp_dir, "expected.json")
+            cred_sweeper = CredSweeper(ml_threshold=0, json_filename=json_filename)
+            expected_count = cred_sweeper.run(FilesProvider([file_path]))
+            self.assertLess(0, expected_count)
+            expected = sorted(json.dumps(x, sort_keys=True) for x in Util.json_load(json_filename))
+            # the large file is scanned by windows in single job
+            json_filename = os.path.join(tmp_dir, "windows.json")
+            cred_sweeper = CredSweeper(ml_threshold=0, json_filename=json_filename)
+            cred_sweeper.WINDOW_THRESHOLD = 1024
+            cred_sweeper.SHARD_SIZE = 256
+            windows = list(
+                cred_sweeper.yield_windows(FilesProvider([file_path]).get_scannable_files(cred_sweeper.config)))
+            self.assertLess(2, len(windows))
+            self.assertTrue(all(isinstance(x, ShardContentProvider) for x in windows))
+            self.assertEqual(expected_count, cred_sweeper.run(FilesProvider([file_path])))
+            self.assertListEqual(expected, sorted(json.dumps(x, sort_keys=True) for x in Util.json_load(json_filename)))
+
+    def test_windows_n(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "dump.sql")
+            text = b"\n".join((SAMPLES_PATH / x).read_bytes() for x in ("aws_multi.md", "password.gradle")).decode()
+            with open(file_path, "wb") as f:
+                f.write(text.encode("utf_16"))
+            json_filename = os.path.join(tmp_dir, "expected.json")
+            expected_count = CredSweeper(ml_threshold=0, json_filename=json_filename).run(FilesProvider([file_path]))
+            self.assertLess(0, expected_count)
+            expected = sorted(json.dumps(x, sort_keys=True) for x in Util.json_load(json_filename))
+            # UTF-16 text cannot be split into windows, so it is read by blocks instead of whole text
+            json_filename = os.path.join(tmp_dir, "windows.json")
+            cred_sweeper = CredSweeper(ml_threshold=0, json_filename=json_filename)
+            cred_sweeper.WINDOW_THRESHOLD = 1024
+            cred_sweeper.SHARD_SIZE = 256
+            with self.assertLogs(level="WARNING") as logs:
+                windows = list(
+                    cred_sweeper.yield_windows(FilesProvider([file_path]).get_scannable_files(cred_sweeper.config)))
+            self.assertTrue(any("is read by blocks" in x for x in logs.output))
+            self.assertEqual(1, len(windows))
+            self.assertIsInstance(windows[0], StreamingTextContentProvider)
+            self.assertEqual(expected_count, cred_sweeper.run(FilesProvider([file_path])))
+            self.assertListEqual(expected, sorted(json.dumps(x, sort_keys=True) for x in Util.json_load(json_filename)))
+
+    def test_read_ahead_p(self) -> None:
+        cred_sweeper = CredSweeper(ml_threshold=0)
+        providers = FilesProvider([SAMPLES_PATH]).get_scannable_files(cred_sweeper.config)
+        # files are read in the scanning thread without the pipeline
+        with patch.object(Pipeline, "yield_mapped", side_effect=AssertionError("read-ahead threads are used")):
+            expected = len(cred_sweeper.files_scan(providers))
+        self.assertLess(0, expected)
+        # files are read ahead only for the single job of streaming mode
+        with patch.object(Pipeline, "yield_mapped", wraps=Pipeline.yield_mapped) as yield_mapped:
+            self.assertEqual(expected, sum(len(x) for x in cred_sweeper.yield_scan(iter(providers))))
+        yield_mapped.assert_called_once()
+
+    def test_get_shards_n(self) -> None:
+        cred_sweeper = CredSweeper(pool_count=2)
+        cred_sweeper.SHARD_SIZE = 64
+        providers = [TextContentProvider(SAMPLES_PATH / "password.gradle")]
+        self.assertListEqual(providers, cred_sweeper.get_shards(providers))
+        providers = [TextContentProvider(SAMPLES_PATH / "aws_multi.md")]
+        self.assertLess(1, len(cred_sweeper.get_shards(providers)))
+        # deep scan requires whole data
+        cred_sweeper.config.depth = 3
+        self.assertListEqual(providers, cred_sweeper.get_shards(providers))
+
+    def test_get_archive_shards_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            zip_path = os.path.join(tmp_dir, "samples.zip")
+            with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+                for sample in sorted(SAMPLES_PATH.glob("*.*")):
+                    zf.write(sample, f"samples/{sample.name}")
+            json_filename = os.path.join(tmp_dir, "expected.json")
+            cred_sweeper = CredSweeper(ml_threshold=0, json_filename=json_filename, depth=3)
+            expected_count = cred_sweeper.run(FilesProvider([zip_path]))
+            self.assertLess(0, expected_count)
+            expected = sorted(json.dumps(x, sort_keys=True) for x in Util.json_load(json_filename))
+            json_filename = os.path.join(tmp_dir, "shards.json")
+            with CredSweeper(ml_threshold=0, json_filename=json_filename, depth=3, pool_count=2) as cred_sweeper:
+                cred_sweeper.SHARD_SIZE = 4096
+                shards = cred_sweeper.get_shards(FilesProvider([zip_path]).get_scannable_files(cred_sweeper.config))
+                self.assertLess(2, len(shards))
+                self.assertTrue(all(isinstance(x, ArchiveContentProvider) for x in shards))
+                self.assertEqual(expected_count, cred_sweeper.run(FilesProvider([zip_path])))
+            self.assertListEqual(expected, sorted(json.dumps(x, sort_keys=True) for x in Util.json_load(json_filename)))
+            # members are inflated in threads
+            json_filename = os.path.join(tmp_dir, "threads.json")
+            with patch.object(ZipScanner, "INFLATE_THREADS_SIZE", 0):
+                cred_sweeper = CredSweeper(ml_threshold=0, json_filename=json_filename, depth=3)
+                self.assertEqual(expected_count, cred_sweeper.run(FilesProvider([zip_path])))
+            self.assertListEqual(expected, sorted(json.dumps(x, sort_keys=True) for x in Util.json_load(json_filename)))
+
+    def test_get_archive_shards_n(self) -> None:
+        cred_sweeper = CredSweeper(depth=3)
+        # single member
+        providers = [TextContentProvider(SAMPLES_PATH / "pem_key.zip")]
+        self.assertListEqual(providers, cred_sweeper.deep_scanner.get_shards(providers[0], 1))
+        # compressed tar is not split
+        providers = [TextContentProvider(SAMPLES_PATH / "passwords.tar.bz2")]
+        self.assertListEqual(providers, cred_sweeper.deep_scanner.get_shards(providers[0], 1))
+        # no archive
+        providers = [TextContentProvider(SAMPLES_PATH / "password.gradle")]
+        self.assertListEqual(providers, cred_sweeper.deep_scanner.get_shards(providers[0], 1))
+
+    # # ## # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
     def test_find_by_ext_n(self) -> None:
         # test for finding files by extension
         with tempfile.TemporaryDirectory() as tmp_dir:
@@ -0,0 +1,95 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from credsweeper.utils.pipeline import Pipeline
+
+
+class TestPipeline(unittest.TestCase):
+
+    def test_yield_ahead_p(self) -> None:
+        self.assertListEqual(list(range(100)), list(Pipeline.yield_ahead(range(100), 3)))
+        self.assertListEqual([], list(Pipeline.yield_ahead([], 3)))
+
+    def test_yield_ahead_n(self) -> None:
+
+        def failed():
+            yield 1
+            raise ValueError("dummy")
+
+        with self.assertRaises(ValueError):
+            list(Pipeline.yield_ahead(failed(), 1))
+        # the producer is stopped when the consumer does not need items anymore
+        produced = []
+
+        def infinite():
+            while True:
+                produced.append(None)
+                yield len(produced)
+
+        generator = Pipeline.yield_ahead(infinite(), 2)
+        self.assertEqual(1, next(generator))
+        generator.close()
+        count = len(produced)
+        time.sleep(2 * Pipeline.POLL_TIMEOUT)
+        self.assertEqual(count, len(produced))
+        self.assertGreaterEqual(4, count)
+
+    def test_yield_mapped_p(self) -> None:
+        threads = set()
+
+        def square(x: int) -> int:
+            threads.add(threading.get_ident())
+            time.sleep(0.001 * (x % 3))
+            return x * x
+
+        self.assertListEqual([x * x for x in range(50)], list(Pipeline.yield_mapped(square, range(50), 4, 8)))
+        self.assertNotIn(threading.get_ident(), threads)
+        threads.clear()
+        self.assertListEqual([x * x for x in range(5)], list(Pipeline.yield_mapped(square, range(5), 1, 8)))
+        self.assertSetEqual({threading.get_ident()}, threads)
+
+    def test_yield_mapped_n(self) -> None:
+        self.assertListEqual([], list(Pipeline.yield_mapped(str, [], 4, 8)))
+        with self.assertRaises(ZeroDivisionError):
+            list(Pipeline.yield_mapped(lambda x: 1 // x, [1, 0, 1], 2, 2))
+        # not taken items are cancelled
+        generator = Pipeline.yield_mapped(str, range(1000), 2, 4)
+        self.assertEqual("0", next(generator))
+        generator.close()
+
+    def test_yield_grouped_p(self) -> None:
+        self.assertListEqual([[1, 2], [3], [4]], list(Pipeline.yield_grouped([1, 2, 3, 4], lambda x: x, 3, 10)))
+        self.assertListEqual([[1, 1], [1, 1], [1]], list(Pipeline.yield_grouped([1] * 5, lambda x: x, 10, 2)))
+
+    def test_yield_grouped_n(self) -> None:
+        self.assertListEqual([], list(Pipeline.yield_grouped([], lambda x: x, 1, 1)))
+        self.assertListEqual([[0, 0, 0]], list(Pipeline.yield_grouped([0] * 3, lambda x: x, 1, 10)))
+
+    def test_set_future_threadsafe_p(self) -> None:
+
+        async def wait_result():
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            threading.Thread(target=Pipeline.set_future_threadsafe, args=(loop, future, 42)).start()
+            return await future
+
+        self.assertEqual(42, asyncio.run(wait_result()))
+
+    def test_set_future_threadsafe_n(self) -> None:
+
+        async def wait_exception():
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            threading.Thread(target=Pipeline.set_future_threadsafe, args=(loop, future, ValueError("dummy"))).start()
+            return await future
+
+        with self.assertRaises(ValueError):
+            asyncio.run(wait_exception())
+        # closed loop does not break the thread
+        loop = asyncio.new_event_loop()
+        future = loop.create_future()
+        loop.close()
+        Pipeline.set_future_threadsafe(loop, future, 1)
+        self.assertFalse(future.done())